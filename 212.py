@@ -1,4 +1,10 @@
+import argparse
 import csv
+from itertools import islice
+from statisticsAccumulator import VacancyStatistic
+from chunkedReader import ChunkedReader
+from vacancyTable import VacancyTable
+from currencyConverter import CurrencyConverter
 from openpyxl import Workbook
 from openpyxl.utils import get_column_letter
 from openpyxl.styles import Font, Border, Side
@@ -6,78 +12,70 @@ import matplotlib.pyplot as plt
 import numpy as np
 
 
-class Vacancy:
-    currency_to_rub = {
-        "AZN": 35.68, "BYR": 23.91, "EUR": 59.90, "GEL": 21.74, "KGS": 0.76,
-        "KZT": 0.13, "RUR": 1, "UAH": 1.64, "USD": 60.66, "UZS": 0.0055,
-    }
-
-    def __init__(self, vacancy):
-        self.name = vacancy['name']
-        self.salary_from = int(float(vacancy['salary_from']))
-        self.salary_to = int(float(vacancy['salary_to']))
-        self.salary_currency = vacancy['salary_currency']
-        self.salary_average = self.currency_to_rub[self.salary_currency] * (self.salary_from + self.salary_to) / 2
-        self.area_name = vacancy['area_name']
-        self.year = int(vacancy['published_at'][:4])
+currency_to_rub = {
+    "AZN": 35.68, "BYR": 23.91, "EUR": 59.90, "GEL": 21.74, "KGS": 0.76,
+    "KZT": 0.13, "RUR": 1, "UAH": 1.64, "USD": 60.66, "UZS": 0.0055,
+}
+currency_converter = CurrencyConverter(currency_to_rub)
 
 
 class DataSet:
-    def __init__(self, file_name, vacancy_name):
+    batch_size = 65536
+
+    def __init__(self, file_name, vacancy_name, converter=currency_converter):
         self.file_name = file_name
         self.vacancy_name = vacancy_name
-
-    @staticmethod
-    def increment(dictionary, key, amount):
-        if key in dictionary:
-            dictionary[key] += amount
-        else:
-            dictionary[key] = amount
-
-    @staticmethod
-    def average(dictionary):
-        new_dictionary = {}
-        for key, values in dictionary.items():
-            new_dictionary[key] = int(sum(values) / len(values))
-        return new_dictionary
+        self.converter = converter
 
     def csv_reader(self):
         with open(self.file_name, mode='r', encoding='utf-8-sig') as file:
             reader = csv.reader(file)
             header = next(reader)
-            header_length = len(header)
-            for row in reader:
-                if '' not in row and len(row) == header_length:
-                    yield dict(zip(header, row))
-
-    def get_statistic(self):
-        salary = {}
-        salary_of_vacancy_name = {}
-        salary_city = {}
-        count_of_vacancies = 0
-
-        for vacancy_dictionary in self.csv_reader():
-            vacancy = Vacancy(vacancy_dictionary)
-            self.increment(salary, vacancy.year, [vacancy.salary_average])
-            if vacancy.name.find(self.vacancy_name) != -1:
-                self.increment(salary_of_vacancy_name, vacancy.year, [vacancy.salary_average])
-            self.increment(salary_city, vacancy.area_name, [vacancy.salary_average])
-            count_of_vacancies += 1
-
-        vacancies_number = dict([(key, len(value)) for key, value in salary.items()])
-        vacancies_number_by_name = dict([(key, len(value)) for key, value in salary_of_vacancy_name.items()])
-
-        if not salary_of_vacancy_name:
-            salary_of_vacancy_name = dict([(key, [0]) for key, value in salary.items()])
+            batch = list(islice(reader, self.batch_size))
+            while batch:
+                yield VacancyTable.from_rows(header, batch, lambda value: value)
+                batch = list(islice(reader, self.batch_size))
+
+    @staticmethod
+    def get_table_statistic(vacancies_table, vacancy_name, converter):
+        salary = vacancies_table.get_salary_in_rub(converter, truncate=True)
+        return vacancies_table.get_statistic(vacancy_name, salary)
+
+    @staticmethod
+    def get_chunk_statistic(file_name, start, end, header, vacancy_name, converter):
+        rows = ChunkedReader.read_chunk(file_name, start, end)
+        vacancies_table = VacancyTable.from_rows(header, rows, lambda value: value)
+        return DataSet.get_table_statistic(vacancies_table, vacancy_name, converter)
+
+    def get_statistic(self, processes=1):
+        if processes > 1:
+            reader = ChunkedReader(self.file_name, processes)
+            statistic = reader.map_reduce(DataSet.get_chunk_statistic, self.vacancy_name, self.converter)
+            return self.get_stats(statistic or VacancyStatistic(self.vacancy_name))
+
+        statistic = VacancyStatistic(self.vacancy_name)
+        for vacancies_table in self.csv_reader():
+            statistic.merge(self.get_table_statistic(vacancies_table, self.vacancy_name, self.converter))
+        return self.get_stats(statistic)
+
+    @staticmethod
+    def get_stats(statistic):
+        count_of_vacancies = statistic.get_count_vacancies()
+
+        stats = statistic.salary_year.get_averages()
+        vacancies_number = statistic.salary_year.get_counts()
+        stats2 = statistic.salary_vacancy_year.get_averages()
+        vacancies_number_by_name = statistic.salary_vacancy_year.get_counts()
+
+        if not vacancies_number_by_name:
+            stats2 = dict([(key, 0) for key, value in stats.items()])
             vacancies_number_by_name = dict([(key, 0) for key, value in vacancies_number.items()])
 
-        stats = self.average(salary)
-        stats2 = self.average(salary_of_vacancy_name)
-        stats3 = self.average(salary_city)
+        stats3 = statistic.salary_city.get_averages()
 
         stats4 = {}
-        for year, salaries in salary_city.items():
-            stats4[year] = round(len(salaries) / count_of_vacancies, 4)
+        for city, count in statistic.salary_city.get_counts().items():
+            stats4[city] = round(count / count_of_vacancies, 4)
         stats4 = list(filter(lambda a: a[-1] >= 0.01, [(key, value) for key, value in stats4.items()]))
         stats4.sort(key=lambda a: a[-1], reverse=True)
         stats5 = stats4.copy()
@@ -100,14 +98,14 @@ class DataSet:
 
 
 class InputConnect:
-    def __init__(self):
+    def __init__(self, processes=1):
         self.file_name = input('Введите название файла: ')
         self.vacancy_name = input('Введите название профессии: ')
         # self.file_name = '../data/vacancies_by_year.csv'
         # self.vacancy_name = 'Программист'
 
         dataset = DataSet(self.file_name, self.vacancy_name)
-        stats1, stats2, stats3, stats4, stats5, stats6 = dataset.get_statistic()
+        stats1, stats2, stats3, stats4, stats5, stats6 = dataset.get_statistic(processes)
         dataset.print_statistic(stats1, stats2, stats3, stats4, stats5, stats6)
 
         report = Report(self.vacancy_name, stats1, stats2, stats3, stats4, stats5, stats6)
@@ -224,5 +222,12 @@ class Report:
         self.wb.save(filename=filename)
 
 
+def get_arguments(argv=None):
+    parser = argparse.ArgumentParser(description='Статистика зарплат и количества вакансий по CSV файлу')
+    parser.add_argument('--processes', type=int, default=1,
+                        help='количество процессов; если больше одного, файл обрабатывается по частям параллельно')
+    return parser.parse_args(argv)
+
+
 if __name__ == '__main__':
-    InputConnect()
\ No newline at end of file
+    InputConnect(get_arguments().processes)
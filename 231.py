@@ -1,10 +1,20 @@
+import argparse
 import csv
-from datetime import datetime
+import os
 from openpyxl import Workbook
 from openpyxl.styles import Font, Border, Side
 import matplotlib.pyplot as plt
 from textwrap import fill
 import numpy as np
+from vacancyTable import VacancyTable
+from currencyConverter import CurrencyConverter, RateTable
+from vacancyCache import ColumnCache
+from chunkedReader import ChunkedReader
+from statisticsAccumulator import VacancyStatistic, ProfessionsStatistic
+from professionMatcher import ProfessionMatcher
+from incrementalStatistic import IncrementalStatistic
+from nameIndex import NameIndex
+import htmlCleaner
 
 
 dictionary_keys = {'name': 'Название', 'description': 'Описание', 'key_skills': 'Навыки',
@@ -35,6 +45,8 @@ currency_to_rub = {
     "UZS": 0.0055,
 }
 
+currency_converter = CurrencyConverter(currency_to_rub)
+
 dict_experience_id = {
     'noExperience': 0,
     'between1And3': 1,
@@ -109,18 +121,67 @@ class InputConect:
     печатает статистику на экран;
     создает графики с данными.
     """
-    def print_data(self):
-        """Печатает статистику на экран, создает таблицы, графики и отчет с данными."""
+    def print_data(self, processes=1, rates_file_name=None):
+        """
+        Печатает статистику на экран, создает таблицы, графики и отчет с данными.
+        :param processes: Количество процессов; если больше одного, файл обрабатывается по частям параллельно (int)
+        :param rates_file_name: Файл с курсами валют по месяцам (currencyRate.csv); если не задан,
+            запрашивается у пользователя (см. input_rates_file_name) (str)
+        """
         input_params = InputConect.input_params()
         if input_params is not None:
             file_name, vacancy_name = input_params
-            vacancies_objects = DataSet(file_name).vacancies_objects
-            InputConect.print_analytical_data(vacancies_objects, vacancy_name)
+            if rates_file_name is None:
+                rates_file_name = InputConect.input_rates_file_name()
+            converter = currency_converter if rates_file_name is None else RateTable.from_csv(rates_file_name)
+            if processes > 1:
+                InputConect.print_statistic(DataSet.get_statistic(file_name, vacancy_name, processes, converter))
+            else:
+                vacancies_table = DataSet.table_reader(file_name)
+                name_index = DataSet.index_reader(file_name, vacancies_table)
+                InputConect.print_analytical_data(vacancies_table, vacancy_name, converter, name_index)
             # report_excel = Report('Статистика по годам', 'Статистика по городам', '000000', 'thin', True)
             # report_excel.generate_excel(vacancy_name)
             Report.generate_image(vacancy_name)
 
 
+    def print_professions_data(self, processes=1, rates_file_name=None, incremental=False):
+        """
+        Печатает статистику зарплаты и количества вакансий по годам сразу для нескольких профессий,
+        собранную за один проход по CSV файлу.
+        :param processes: Количество процессов; если больше одного, файл обрабатывается по частям параллельно (int)
+        :param rates_file_name: Файл с курсами валют по месяцам (currencyRate.csv); если не задан,
+            запрашивается у пользователя (см. input_rates_file_name) (str)
+        :param incremental: Разбирать только записи, дописанные в файл после предыдущего запуска (bool)
+        """
+        file_name = input('Введите название файла: ')
+        vacancy_names = InputConect.read_vacancy_names(
+            input('Введите названия профессий через запятую или имя файла со списком профессий: '))
+        if rates_file_name is None:
+            rates_file_name = InputConect.input_rates_file_name()
+        converter = currency_converter if rates_file_name is None else RateTable.from_csv(rates_file_name)
+        statistic = DataSet.get_professions_statistic(file_name, vacancy_names, processes, converter, incremental)
+        for vacancy_name, (salary_dict, count_dict) in InputConect.get_professions_dicts(statistic).items():
+            print(f'Динамика уровня зарплат по годам для профессии {vacancy_name}: {salary_dict}')
+            print(f'Динамика количества вакансий по годам для профессии {vacancy_name}: {count_dict}')
+
+    @staticmethod
+    def read_vacancy_names(value):
+        """
+        Получает список названий профессий: из файла (по одному названию в строке) или из строки через запятую.
+        :param value: Имя файла со списком профессий или названия профессий через запятую (str)
+        :return:
+            list: Названия профессий без повторов
+        >>> InputConect.read_vacancy_names('Программист, Аналитик,,Программист')
+        ['Программист', 'Аналитик']
+        """
+        if os.path.isfile(value):
+            with open(value, encoding='utf-8-sig') as file:
+                vacancy_names = file.read().splitlines()
+        else:
+            vacancy_names = value.split(',')
+        return list(dict.fromkeys(name.strip() for name in vacancy_names if name.strip()))
+
     @staticmethod
     def input_params():
         """
@@ -134,6 +195,21 @@ class InputConect:
 
         return file_name, vacancy_name
 
+    @staticmethod
+    def input_rates_file_name():
+        """
+        Получает имя файла с курсами валют по месяцам (currencyRate.csv), введенное пользователем.
+        Пустая строка или конец ввода означают постоянные курсы currency_to_rub, поэтому прежний ввод
+        из двух строк продолжает работать.
+        :return:
+            str or None: Имя файла с курсами валют или None
+        """
+        try:
+            rates_file_name = input('Введите файл с курсами валют (пусто - постоянные курсы): ')
+        except EOFError:
+            return None
+        return rates_file_name or None
+
     @staticmethod
     def get_years_salary_dict(dictionary):
         """
@@ -150,51 +226,95 @@ class InputConect:
         return dictionary
 
     @staticmethod
-    def print_analytical_data(vacancies_objects, vacancy_name):
+    def get_analytical_dicts(statistic):
         """
-        Печатает статистику зарплаты и количества вакансий по годам и городам;
-        добавляет словари со статистикой в списки:
-        list_analytical_dict_year, list_analytical_dict_city, list_analytical_dict_city_1
-        для создания таблиц, графиков и отчета.
-        :param vacancies_objects: Список с вакансиями, на основе которого создается статистика (list)
-        :param vacancy_name: Название вакансии, по которой будет выбираться статистика (str)
+        Формирует словари со статистикой зарплаты и количества вакансий по годам и городам
+        из накопленных сумм и количеств.
+        :param statistic: Статистика по вакансиям (VacancyStatistic)
+        :return:
+            dict: Уровень зарплат по годам, количество вакансий по годам,
+            уровень зарплат по годам для выбранной профессии, количество вакансий по годам для выбранной профессии,
+            уровень зарплат по городам, доля вакансий по городам
         """
-        vacancies_dict = vacancies_objects
-        years = set()
-        for vacancy in vacancies_dict:
-            years.add(int(datetime.strptime(vacancy.published_at, '%Y-%m-%dT%H:%M:%S%z').strftime("%Y")))
+        years = list(statistic.salary_year.counts.keys())
         years = list(range(min(years), max(years) + 1))
 
-        years_salary_dictionary = {year: [] for year in years}
-        years_salary_vacancy_dict = {year: [] for year in years}
+        years_salary_dictionary = {year: 0 for year in years}
+        years_salary_vacancy_dict = {year: 0 for year in years}
         years_count_dictionary = {year: 0 for year in years}
         years_count_vacancy_dict = {year: 0 for year in years}
 
-        area_dict = {}
-
-        for vacancy in vacancies_dict:
-            year = int(datetime.strptime(vacancy.published_at, '%Y-%m-%dT%H:%M:%S%z').strftime("%Y"))
-            years_salary_dictionary[year].append(vacancy.salary.get_salary_in_rub())
-            years_count_dictionary[year] += 1
-            if vacancy_name in vacancy.name:
-                years_salary_vacancy_dict[year].append(vacancy.salary.get_salary_in_rub())
-                years_count_vacancy_dict[year] += 1
-            if vacancy.area_name in area_dict:
-                area_dict[vacancy.area_name].append(vacancy.salary.get_salary_in_rub())
-            else:
-                area_dict[vacancy.area_name] = [vacancy.salary.get_salary_in_rub()]
+        years_salary_dictionary.update(statistic.salary_year.get_averages())
+        years_count_dictionary.update(statistic.salary_year.get_counts())
+        years_salary_vacancy_dict.update(statistic.salary_vacancy_year.get_averages())
+        years_count_vacancy_dict.update(statistic.salary_vacancy_year.get_counts())
+
+        count_vacancies = statistic.get_count_vacancies()
+        area_sums = statistic.salary_city.sums
+        area_counts = statistic.salary_city.counts
+        area_list = [area for area, count in area_counts.items() if count >= count_vacancies // 100]
+        area_salary_dict = sorted(area_list, key=lambda area: area_sums[area] / area_counts[area], reverse=True)
+        area_count_dict = sorted(area_list, key=lambda area: area_counts[area] / count_vacancies, reverse=True)
+        area_salary_dict = {area: int(area_sums[area] / area_counts[area])
+                            for area in area_salary_dict[0: min(len(area_salary_dict), 10)]}
+        area_count_dict = {area: round(area_counts[area] / count_vacancies, 4)
+                           for area in area_count_dict[0: min(len(area_count_dict), 10)]}
+
+        return years_salary_dictionary, years_count_dictionary, years_salary_vacancy_dict, \
+            years_count_vacancy_dict, area_salary_dict, area_count_dict
+
+    @staticmethod
+    def get_professions_dicts(statistic):
+        """
+        Формирует словари со статистикой зарплаты и количества вакансий по годам для каждой профессии.
+        :param statistic: Статистика по профессиям (ProfessionsStatistic)
+        :return:
+            dict: Словарь: ключ - название профессии, значение - уровень зарплат по годам
+            и количество вакансий по годам
+        """
+        years = list(statistic.salary_year.counts.keys())
+        years = list(range(min(years), max(years) + 1)) if years else []
+        professions_dicts = {}
+        for vacancy_name, accumulator in statistic.salary_vacancy_year.items():
+            salary_dict = {year: 0 for year in years}
+            count_dict = {year: 0 for year in years}
+            salary_dict.update(accumulator.get_averages())
+            count_dict.update(accumulator.get_counts())
+            professions_dicts[vacancy_name] = (salary_dict, count_dict)
+        return professions_dicts
 
-        years_salary_dictionary = InputConect.get_years_salary_dict(years_salary_dictionary)
-        years_salary_vacancy_dict = InputConect.get_years_salary_dict(years_salary_vacancy_dict)
+    @staticmethod
+    def print_analytical_data(vacancies_objects, vacancy_name, converter=currency_converter, name_index=None):
+        """
+        Печатает статистику зарплаты и количества вакансий по годам и городам;
+        добавляет словари со статистикой в списки:
+        list_analytical_dict_year, list_analytical_dict_city, list_analytical_dict_city_1
+        для создания таблиц, графиков и отчета.
+        Статистика считается векторными операциями над столбцами таблицы VacancyTable.
+        :param vacancies_objects: Таблица или список с вакансиями (VacancyTable or list)
+        :param vacancy_name: Название вакансии, по которой будет выбираться статистика (str)
+        :param converter: Конвертер валют с постоянными курсами или курсами по месяцам публикации
+            (CurrencyConverter or RateTable)
+        :param name_index: Индекс названий таблицы vacancies_objects (NameIndex)
+        """
+        vacancies_table = vacancies_objects
+        if not isinstance(vacancies_table, VacancyTable):
+            vacancies_table = VacancyTable.from_vacancies(vacancies_objects)
+        salary = vacancies_table.get_salary_in_rub(converter)
+        statistic = vacancies_table.get_statistic(vacancy_name, salary, name_index)
+        InputConect.print_statistic(statistic)
 
-        area_list = area_dict.items()
-        area_list = [area for area in area_list if len(area[1]) >= len(vacancies_dict) // 100]
-        area_salary_dict = sorted(area_list, key=lambda area: sum(area[1]) / len(area[1]), reverse=True)
-        area_count_dict = sorted(area_list, key=lambda item: len(item[1]) / len(vacancies_dict), reverse=True)
-        area_salary_dict = {item[0]: int(sum(item[1]) / len(item[1]))
-                            for item in area_salary_dict[0: min(len(area_salary_dict), 10)]}
-        area_count_dict = {item[0]: round(len(item[1]) / len(vacancies_dict), 4)
-                           for item in area_count_dict[0: min(len(area_count_dict), 10)]}
+    @staticmethod
+    def print_statistic(statistic):
+        """
+        Печатает статистику зарплаты и количества вакансий по годам и городам, собранную в statistic;
+        добавляет словари со статистикой в списки:
+        list_analytical_dict_year, list_analytical_dict_city, list_analytical_dict_city_1
+        для создания таблиц, графиков и отчета.
+        :param statistic: Статистика по вакансиям (VacancyStatistic)
+        """
+        years_salary_dictionary, years_count_dictionary, years_salary_vacancy_dict, years_count_vacancy_dict, \
+            area_salary_dict, area_count_dict = InputConect.get_analytical_dicts(statistic)
 
         print(f'Динамика уровня зарплат по годам: {years_salary_dictionary}')
         print(f'Динамика количества вакансий по годам: {years_count_dictionary}')
@@ -221,6 +341,8 @@ class DataSet:
         file_name (str): Название CSV файла
         vacancies_objects (list): Лист с вакансиями
     """
+    vacancy_fields = ['name', 'salary_from', 'salary_to', 'salary_currency', 'area_name', 'published_at']
+
     def __init__(self, file_name):
         """
         Инициализирует объект DataSet, получает vacancies_objects с помощью метода чтения CSV файла - csv_reader.
@@ -234,53 +356,203 @@ class DataSet:
     @staticmethod
     def delete_tags(value):
         """
-        Отчищает строку от тегов.
+        Отчищает строку от тегов и HTML-сущностей за линейное время.
         :param value: Строка (str)
         :return:
             str: Строка, отчищенная от тегов
         """
-        temp_value = ''
-        while value.find('<') != - 1:
-            temp_value += value[:value.find('<')]
-            current_index = value.find('>') + 1
-            value = value[current_index:]
-        else:
-            return temp_value + value
+        return htmlCleaner.delete_tags(value)
 
     @staticmethod
-    def csv_reader(file_name):
+    def clean_value(value):
         """
-        Читает CSV файл и создает vacancy_dictionary (лист с вакансиями) с объектами Vacancy.
+        Отчищает строку от тегов и лишних пробельных символов.
+        :param value: Строка (str)
+        :return:
+            str: Отчищенная строка
+        """
+        return ' '.join(DataSet.delete_tags(value).split())
+
+    @staticmethod
+    def table_reader(file_name):
+        """
+        Читает CSV файл в колоночную таблицу VacancyTable без создания объектов Vacancy и Salary.
+        Повторное чтение неизмененного файла берет таблицу из бинарного кэша.
+        Колоночный файл 341.py (папка .columns) с зарплатами в рублях читается напрямую.
+        :param file_name: Имя файла CSV или папки колоночного файла, из которого будут читаться данные (str)
+        :return:
+            VacancyTable: Таблица с вакансиями
+        """
+        if os.path.isdir(file_name):
+            return VacancyTable.from_converted(file_name)
+        cache = ColumnCache(file_name, 'table')
+        columns = cache.load()
+        if columns is not None:
+            return VacancyTable.from_columns(columns)
+        vacancies_table = VacancyTable.from_csv(file_name, DataSet.clean_value)
+        cache.save(vacancies_table.get_columns())
+        return vacancies_table
+
+    @staticmethod
+    def index_reader(file_name, vacancies_table):
+        """
+        Возвращает индекс названий вакансий таблицы, прочитанной из CSV файла.
+        Индекс строится один раз и хранится в бинарном кэше, пока файл не изменится,
+        поэтому запросы по разным профессиям не просматривают все названия.
+        :param file_name: Имя файла CSV (str)
+        :param vacancies_table: Таблица с вакансиями из этого файла (VacancyTable)
+        :return:
+            NameIndex: Индекс названий
+        """
+        cache = ColumnCache(file_name, 'names')
+        columns = cache.load()
+        if columns is not None and len(columns['rows']) == len(vacancies_table):
+            return NameIndex.from_columns(columns)
+        name_index = NameIndex.from_table(vacancies_table)
+        cache.save(name_index.get_columns())
+        return name_index
+
+    @staticmethod
+    def get_chunk_statistic(file_name, start, end, header, vacancy_name, converter):
+        """
+        Собирает статистику по части CSV файла; выполняется в отдельном процессе.
+        :param file_name: Имя файла CSV (str)
+        :param start: Начало части в байтах (int)
+        :param end: Конец части в байтах (int)
+        :param header: Заголовок CSV файла (list)
+        :param vacancy_name: Название профессии (str)
+        :param converter: Конвертер валют (CurrencyConverter or RateTable)
+        :return:
+            VacancyStatistic: Частичная статистика по вакансиям
+        """
+        rows = ChunkedReader.read_chunk(file_name, start, end)
+        vacancies_table = VacancyTable.from_rows(header, rows, DataSet.clean_value)
+        return vacancies_table.get_statistic(vacancy_name, vacancies_table.get_salary_in_rub(converter))
+
+    @staticmethod
+    def get_statistic(file_name, vacancy_name, processes=None, converter=currency_converter):
+        """
+        Собирает статистику по CSV файлу, разделяя его на части по границам записей
+        и обрабатывая части в пуле процессов.
+        :param file_name: Имя файла CSV (str)
+        :param vacancy_name: Название профессии (str)
+        :param processes: Количество процессов (по умолчанию - количество ядер) (int)
+        :param converter: Конвертер валют (CurrencyConverter or RateTable)
+        :return:
+            VacancyStatistic: Статистика по вакансиям
+        """
+        reader = ChunkedReader(file_name, processes)
+        statistic = reader.map_reduce(DataSet.get_chunk_statistic, vacancy_name, converter)
+        return statistic or VacancyStatistic(vacancy_name)
+
+    @staticmethod
+    def clean_cell(value, strip_tags=True):
+        """
+        Отчищает значение поля: многострочное значение превращается в список отчищенных строк.
+        :param value: Значение поля (str)
+        :param strip_tags: Удалять ли теги (bool)
+        :return:
+            str or list: Отчищенное значение
+        """
+        if strip_tags:
+            value = DataSet.delete_tags(value)
+        if value.find("\n") != -1:
+            return [' '.join(x.split()) for x in value.split('\n')]
+        return ' '.join(value.split())
+
+    @staticmethod
+    def get_professions_chunk_statistic(file_name, start, end, header, matcher, converter):
+        """
+        Собирает статистику по нескольким профессиям по части CSV файла; выполняется в отдельном процессе.
+        :param file_name: Имя файла CSV (str)
+        :param start: Начало части в байтах (int)
+        :param end: Конец части в байтах (int)
+        :param header: Заголовок CSV файла (list)
+        :param matcher: Автомат поиска названий профессий (ProfessionMatcher)
+        :param converter: Конвертер валют (CurrencyConverter or RateTable)
+        :return:
+            ProfessionsStatistic: Частичная статистика по профессиям
+        """
+        rows = ChunkedReader.read_chunk(file_name, start, end)
+        vacancies_table = VacancyTable.from_rows(header, rows, DataSet.clean_value)
+        return vacancies_table.get_professions_statistic(matcher, vacancies_table.get_salary_in_rub(converter))
+
+    @staticmethod
+    def get_professions_statistic(file_name, vacancy_names, processes=1, converter=currency_converter,
+                                  incremental=False):
+        """
+        Собирает статистику по годам сразу для нескольких профессий за одно чтение CSV файла.
+        :param file_name: Имя файла CSV (str)
+        :param vacancy_names: Названия профессий (list)
+        :param processes: Количество процессов; если больше одного, файл обрабатывается по частям параллельно (int)
+        :param converter: Конвертер валют (CurrencyConverter or RateTable)
+        :param incremental: Хранить статистику рядом с файлом и разбирать только дописанные записи (bool)
+        :return:
+            ProfessionsStatistic: Статистика по профессиям
+        """
+        if incremental:
+            return IncrementalStatistic(file_name, vacancy_names, converter, DataSet.clean_value).update()
+        matcher = ProfessionMatcher(vacancy_names)
+        if processes > 1:
+            reader = ChunkedReader(file_name, processes)
+            statistic = reader.map_reduce(DataSet.get_professions_chunk_statistic, matcher, converter)
+            return statistic or ProfessionsStatistic(vacancy_names)
+        vacancies_table = DataSet.table_reader(file_name)
+        return vacancies_table.get_professions_statistic(matcher, vacancies_table.get_salary_in_rub(converter))
+
+    @staticmethod
+    def read_columns(file_name, fields=None, markup_only=True):
+        """
+        Читает из CSV файла только нужные поля и отчищает их значения.
+        Остальные столбцы не сохраняются и не отчищаются, поэтому длинные description и key_skills
+        не занимают память и время.
         :param file_name: Имя файла CSV, из которого будут читаться данные (str)
+        :param fields: Список нужных полей (по умолчанию - vacancy_fields) (list)
+        :param markup_only: Отчищать от тегов только столбцы, в которых есть разметка (bool)
         :return:
-            list: Лист с вакансиями
+            dict: Словарь: ключ - поле, значение - список отчищенных значений поля
         """
+        fields = fields or DataSet.vacancy_fields
         with open(file_name, newline='', encoding='utf-8-sig') as file:
             vacancies_csv = csv.reader(file)
-            vacancy_data = [row for row in vacancies_csv]
-            vacancy_keys = []
-            try:
-                vacancy_keys = vacancy_data.pop(0)
-            except:
+            vacancy_keys = next(vacancies_csv, None)
+            if vacancy_keys is None:
                 print('Пустой файл')
                 exit()
-            vacancy_dictionary = []
-            filtered_vacancy_data = [vacancy for vacancy in vacancy_data
-                                     if len(vacancy) == len(vacancy_keys) and '' not in vacancy]
-            for row in filtered_vacancy_data:
-                dic = {}
-                for i in range(len(row)):
-                    elem = DataSet.delete_tags(row[i])
-                    if elem.find("\n") != -1:
-                        elem = elem.split('\n')
-                        elem = [' '.join(x.split()) for x in elem]
-                    else:
-                        elem = ' '.join(elem.split())
-                    dic[vacancy_keys[i]] = elem
-                vacancy_dictionary.append(
-                    Vacancy(dic['name'], Salary(dic['salary_from'], dic['salary_to'],
-                            dic['salary_currency']), dic['area_name'], dic['published_at']))
-            return vacancy_dictionary
+            indexes = [vacancy_keys.index(field) for field in fields]
+            columns = {field: [] for field in fields}
+            appends = [columns[field].append for field in fields]
+            for vacancy in vacancies_csv:
+                if len(vacancy) == len(vacancy_keys) and '' not in vacancy:
+                    for append, i in zip(appends, indexes):
+                        append(vacancy[i])
+        for field, values in columns.items():
+            strip_tags = not markup_only or any(map(htmlCleaner.has_markup, values))
+            columns[field] = [ColumnCache.encode_cell(DataSet.clean_cell(value, strip_tags)) for value in values]
+        return columns
+
+    @staticmethod
+    def csv_reader(file_name):
+        """
+        Читает CSV файл и создает vacancy_dictionary (лист с вакансиями) с объектами Vacancy.
+        Отчищенные значения полей сохраняются в бинарный кэш и повторно не разбираются, пока файл не изменится.
+        :param file_name: Имя файла CSV, из которого будут читаться данные (str)
+        :return:
+            list: Лист с вакансиями
+        """
+        cache = ColumnCache(file_name, 'fields')
+        columns = cache.load()
+        if columns is None:
+            columns = DataSet.read_columns(file_name, DataSet.vacancy_fields)
+            cache.save(columns)
+        vacancy_dictionary = []
+        for name, salary_from, salary_to, salary_currency, area_name, published_at in \
+                zip(*[columns[field] for field in DataSet.vacancy_fields]):
+            vacancy_dictionary.append(
+                Vacancy(ColumnCache.decode_cell(name), Salary(ColumnCache.decode_cell(salary_from),
+                        ColumnCache.decode_cell(salary_to), ColumnCache.decode_cell(salary_currency)),
+                        ColumnCache.decode_cell(area_name), ColumnCache.decode_cell(published_at)))
+        return vacancy_dictionary
 
 
 
@@ -486,13 +758,46 @@ class Report:
 
         work_book.save('report.xlsx')
 
-def main():
+def get_arguments(argv=None):
+    """
+    Разбирает параметры командной строки.
+    :param argv: Параметры командной строки (по умолчанию - sys.argv[1:]) (list)
+    :return:
+        argparse.Namespace: Параметры: processes - количество процессов, professions - статистика
+        сразу для нескольких профессий, incremental - разбирать только дописанные записи
+    >>> get_arguments(['--processes', '4']).processes
+    4
+    >>> get_arguments(['--professions']).professions
+    True
+    >>> get_arguments(['--professions', '--incremental']).incremental
+    True
+    """
+    parser = argparse.ArgumentParser(description='Статистика зарплат и количества вакансий по CSV файлу')
+    parser.add_argument('--processes', type=int, default=1,
+                        help='количество процессов; если больше одного, файл обрабатывается по частям параллельно')
+    parser.add_argument('--professions', action='store_true',
+                        help='печатать статистику по годам сразу для нескольких профессий')
+    parser.add_argument('--incremental', action='store_true',
+                        help='вместе с --professions: разбирать только записи, дописанные в файл '
+                             'после предыдущего запуска')
+    arguments = parser.parse_args(argv)
+    if arguments.incremental and not arguments.professions:
+        parser.error('--incremental используется только вместе с --professions')
+    return arguments
+
+
+def main(argv=None):
     """
     Создает объект InputConect, печатает данные и создает графики
     по статистике средней зарплаты и количества вакансий.
+    :param argv: Параметры командной строки (см. get_arguments) (list)
     """
+    arguments = get_arguments(argv)
     a = InputConect()
-    a.print_data()
+    if arguments.professions:
+        a.print_professions_data(arguments.processes, incremental=arguments.incremental)
+    else:
+        a.print_data(arguments.processes)
 
 if __name__ == '__main__':
     main()
@@ -1,6 +1,16 @@
 import csv
+import heapq
+import json
+import sys
 from datetime import datetime
+import numpy as np
 from prettytable import PrettyTable, ALL
+from vacancyCache import ColumnCache
+from sortKeys import SortKeys
+from vacancyIndex import VacancyIndex
+from streamTable import StreamTable
+from dateParser import parse_timestamps
+import htmlCleaner
 
 dictionary_keys = {'name': 'Название', 'description': 'Описание', 'key_skills': 'Навыки',
                    'experience_id': 'Опыт работы', 'premium': 'Премиум-вакансия',
@@ -117,26 +127,35 @@ class Salary:
 
 class InputConect:
     """
-       Обрабатывает параметры, вводимые пользователями: фильтры, сортировка, диапазон вывода, требуемые столбцы;
-       печатает таблицы на экран.
+       Обрабатывает параметры, вводимые пользователями: фильтры, сортировка, диапазон вывода, требуемые столбцы,
+       формат вывода; печатает таблицы на экран или записывает в файл.
+    Attributes:
+        max_width (int): Наибольшая ширина столбца таблицы
+        output_formats (tuple): Форматы вывода: 'table' - PrettyTable, 'stream' - потоковая таблица (StreamTable),
+            'csv' и 'jsonl' - строки CSV и JSON
     """
+    max_width = 20
+    output_formats = ('table', 'stream', 'csv', 'jsonl')
+
     def print_data(self):
         """Получает параметры, вводимые пользователями, и на их основании печатает таблицу."""
         input_params = InputConect.input_params()
         if input_params is not None:
-            file_name, field, value_field, sort_param, is_reverse_sort, borders, fields = input_params
+            file_name, query, sort_param, is_reverse_sort, borders, fields, output_format, output_file = input_params
             data_set = DataSet(file_name)
-            InputConect.print_table(data_set.vacancies_objects, field, value_field, sort_param, is_reverse_sort,
-                                    borders, fields)
+            sort_keys = data_set.load_sort_keys() if sort_param != '' else None
+            vacancy_index = data_set.load_vacancy_index() if len(query) > 0 else None
+            InputConect.print_table(data_set.vacancies_objects, query, sort_param, is_reverse_sort, borders, fields,
+                                    sort_keys, vacancy_index, output_format, output_file)
 
     @staticmethod
     def input_params():
         """
         Обрабатывает параметры для печати, вводимые пользователями; не допускает печать, если параметры некорректны.
+        Параметр фильтрации - запрос из условий «поле: значение», объединенных AND и OR (см. parse_query).
         :return:
-            str: Название файла; поле, по которому происходит фильтрация;
-            значения поля, по которому происходит фильтрация; параметр сортировки; порядок сортировки;
-            диапазон вывода; поля для печати
+            str: Название файла; запрос фильтрации (list); параметр сортировки; порядок сортировки;
+            диапазон вывода; поля для печати; формат вывода; файл для вывода (пустая строка - экран)
         """
         file_name = input('Введите название файла: ')
         filter_param = input('Введите параметр фильтрации: ')
@@ -144,31 +163,119 @@ class InputConect:
         is_reverse_sort = input('Обратный порядок сортировки (Да / Нет): ')
         borders = input('Введите диапазон вывода: ')
         fields = input('Введите требуемые столбцы: ')
+        output_format = InputConect.input_optional('Введите формат вывода (table / stream / csv / jsonl): ') or 'table'
+        output_file = InputConect.input_optional('Введите файл для вывода: ') if output_format != 'table' else ''
 
-        if filter_param != '':
-            if not ': ' in filter_param:
-                print('Формат ввода некорректен')
-                return
-            filter_split = filter_param.split(': ')
-            field = filter_split[0]
-            value_field = filter_split[1]
-            if field not in dictionary_keys.values():
-                print('Параметр поиска некорректен')
-                return
-        else:
-            field = ''
-            value_field = ''
+        try:
+            query = InputConect.parse_query(filter_param)
+        except ValueError as error:
+            print(error)
+            return
 
         if sort_param != '':
-            if not sort_param in dictionary_keys.values():
+            if not all(param in dictionary_keys.values() for param in sort_param.split(', ')):
                 print('Параметр сортировки некорректен')
                 return
             if is_reverse_sort != 'Да' and is_reverse_sort != 'Нет' and is_reverse_sort != '':
                 print('Порядок сортировки задан некорректно')
                 return
-        return file_name, field, value_field, sort_param, is_reverse_sort, borders, fields
+
+        if output_format not in InputConect.output_formats:
+            print('Формат вывода задан некорректно')
+            return
+        return file_name, query, sort_param, is_reverse_sort, borders, fields, output_format, output_file
+
+    @staticmethod
+    def input_optional(prompt):
+        """
+        Получает необязательный параметр, введенный пользователем. Если ввод закончился, возвращает пустую
+        строку, поэтому прежний ввод из шести строк (например, через конвейер) печатает таблицу как раньше.
+        :param prompt: Приглашение ко вводу (str)
+        :return:
+            str: Введенное значение или пустая строка
+        """
+        try:
+            return input(prompt)
+        except EOFError:
+            return ''
+
+    @staticmethod
+    def parse_query(filter_param):
+        """
+        Разбирает запрос фильтрации: условия «поле: значение», объединенные AND и OR (AND выполняется раньше OR).
+        Для оклада и даты публикации значение может быть диапазоном «от-до», любую границу диапазона можно опустить.
+        Условия с пустым значением не ограничивают выборку.
+        :param filter_param: Запрос фильтрации (str)
+        :return:
+            list: Группы условий (поле, значение), объединенные ИЛИ; условия внутри группы объединены И
+            (пустой список - без фильтрации)
+        >>> InputConect.parse_query('Название региона: Москва AND Оклад: 50000-100000 OR Навыки: Git, SQL')
+        [[('Название региона', 'Москва'), ('Оклад', '50000-100000')], [('Навыки', 'Git, SQL')]]
+        >>> InputConect.parse_query('Москва')
+        Traceback (most recent call last):
+        ...
+        ValueError: Формат ввода некорректен
+        >>> InputConect.parse_query('Оклад: 5-x')
+        Traceback (most recent call last):
+        ...
+        ValueError: Значение фильтра некорректно: Оклад: 5-x
+        """
+        if filter_param == '':
+            return []
+        query = []
+        for group in filter_param.split(' OR '):
+            conditions = []
+            for condition in group.split(' AND '):
+                if ': ' not in condition:
+                    raise ValueError('Формат ввода некорректен')
+                field, value_field = condition.split(': ', 1)
+                if field not in dictionary_keys.values():
+                    raise ValueError('Параметр поиска некорректен')
+                if value_field != '':
+                    InputConect.check_condition(field, value_field)
+                    conditions.append((field, value_field))
+            if len(conditions) == 0:
+                return []
+            query.append(conditions)
+        return query
+
+    @staticmethod
+    def check_condition(field, value_field):
+        """
+        Проверяет значение условия фильтрации: переводит его так же, как при фильтрации (get_filter_conditions),
+        и проверяет, что даты существуют, поэтому некорректное значение отклоняется при вводе, а не при печати.
+        :param field: Поле, по которому происходит фильтрация (str)
+        :param value_field: Значение этого поля (str)
+        :raise ValueError: Значение нельзя перевести
+        >>> InputConect.check_condition('Оклад', '50000-')
+        >>> InputConect.check_condition('Дата публикации вакансии', '2022-07-01')
+        Traceback (most recent call last):
+        ...
+        ValueError: Значение фильтра некорректно: Дата публикации вакансии: 2022-07-01
+        """
+        try:
+            for _, condition_field, value in InputConect.get_filter_conditions(field, value_field):
+                if condition_field == 'published_at':
+                    for date in value if isinstance(value, tuple) else (value,):
+                        if date is not None:
+                            datetime.strptime(date, '%Y-%m-%d')
+        except (ValueError, IndexError):
+            raise ValueError(f'Значение фильтра некорректно: {field}: {value_field}') from None
 
     @staticmethod
+    def get_bounds(value_field, convert):
+        """
+        Разбирает диапазон «от-до»; пустая граница означает, что диапазон с этой стороны не ограничен.
+        :param value_field: Диапазон (str)
+        :param convert: Функция, переводящая границу в значение (callable)
+        :return:
+            tuple: Нижняя и верхняя границы (None - без границы)
+        >>> InputConect.get_bounds('50000 - 100000', int), InputConect.get_bounds('50000-', int)
+        ((50000, 100000), (50000, None))
+        """
+        low, high = (value.strip() for value in value_field.split('-', 1))
+        return convert(low) if low != '' else None, convert(high) if high != '' else None
+    @staticmethod
     def get_key(dictionary, elem):
         """
         Возвращает ключ словаря по его значению.
@@ -215,36 +322,176 @@ class InputConect:
         return all_columns
 
     @staticmethod
-    def print_table(vacancies_objects, field, value_field, sort_param, is_reverse_sort, borders, fields):
+    def get_output_columns(field_names, fields):
+        """
+        Возвращает столбцы для вывода без PrettyTable в том же порядке, в котором их печатает PrettyTable:
+        в порядке полей таблицы, без неизвестных полей.
+        :param field_names: Все поля таблицы (list)
+        :param fields: Поля, которые будут выведены (если их нет, будут выведены все поля таблицы) (str)
+        :return:
+            list: Поля, которые будут выведены
+        >>> InputConect.get_output_columns(['№', 'Название', 'Оклад', 'Компания'], 'Компания, Название, Город')
+        ['№', 'Название', 'Компания']
+        """
+        columns = set(filter(None, fields.split(', ')))
+        if len(columns) == 0:
+            return list(field_names)
+        return [field for field in field_names if field == '№' or field in columns]
+
+    @staticmethod
+    def write_output(window, first_number, field_names, fields, output_format, output_file=''):
+        """
+        Записывает выбранные вакансии построчно, не строя PrettyTable: каждая вакансия форматируется
+        и записывается сразу, поэтому вывод начинается до форматирования остальных вакансий.
+        Формат 'stream' - таблица с шириной столбцов max_width (длинные значения сокращаются, как в print_table),
+        'csv' и 'jsonl' - полные значения полей.
+        :param window: Выбранные вакансии в порядке сортировки (list)
+        :param first_number: Номер первой выбранной вакансии (начиная с 0) (int)
+        :param field_names: Все поля таблицы (list)
+        :param fields: Поля, которые будут выведены (str)
+        :param output_format: Формат вывода: 'stream', 'csv' или 'jsonl' (str)
+        :param output_file: Файл для вывода (пустая строка - экран) (str)
+        >>> InputConect.write_output([Vacancy('Программист', '', ['Git', 'SQL'], 'noExperience', 'False', 'Яндекс',
+        ...                                   Salary('10', '20', 'True', 'RUR'), 'Москва', '2022-07-05T18:19:30+0300')],
+        ...                          4, ['№', 'Название', 'Навыки', 'Компания'], 'Название, Навыки', 'jsonl')
+        {"№": 5, "Название": "Программист", "Навыки": "Git\\nSQL"}
+        """
+        columns = InputConect.get_output_columns(field_names, fields)
+        file = sys.stdout if output_file in (None, '') else \
+            open(output_file, mode='w', encoding='utf-8-sig' if output_format == 'csv' else 'utf-8', newline='')
+        try:
+            if output_format == 'stream':
+                number_width = max(len('№'), len(str(first_number + len(window))))
+                writer = StreamTable(file, columns, [number_width if column == '№' else InputConect.max_width
+                                                     for column in columns])
+                writer.write_header()
+            elif output_format == 'csv':
+                writer = csv.writer(file)
+                writer.writerow(columns)
+            for number, vacancy in enumerate(window, first_number + 1):
+                row = InputConect.formatter([vacancy])[0]
+                row['№'] = number
+                if output_format == 'jsonl':
+                    file.write(json.dumps({column: row[column] for column in columns}, ensure_ascii=False) + '\n')
+                elif output_format == 'csv':
+                    writer.writerow([row[column] for column in columns])
+                else:
+                    writer.write_row([row[column] if column == '№' or len(row[column]) <= 100
+                                      else row[column][:100] + '...' for column in columns])
+        finally:
+            if file is not sys.stdout:
+                file.close()
+
+    @staticmethod
+    def get_row_ids(vacancies_objects, vacancies_data):
+        """
+        Возвращает номера отфильтрованных вакансий в исходном списке (фильтрация сохраняет порядок вакансий).
+        :param vacancies_objects: Исходный список вакансий (list)
+        :param vacancies_data: Отфильтрованный список вакансий (list)
+        :return:
+            numpy.ndarray: Номера вакансий
+        >>> vacancies = [Vacancy(name, '', [], '', '', '', None, '', '') for name in 'abcd']
+        >>> InputConect.get_row_ids(vacancies, [vacancies[1], vacancies[3]]).tolist()
+        [1, 3]
+        """
+        row_ids = []
+        for row_id, vacancy in enumerate(vacancies_objects):
+            if len(row_ids) < len(vacancies_data) and vacancies_data[len(row_ids)] is vacancy:
+                row_ids.append(row_id)
+        return np.array(row_ids, dtype=np.int64)
+
+    @staticmethod
+    def select_window(vacancies_data, sort_param, is_reverse_sort, borders, sort_keys=None, row_ids=None):
+        """
+        Выбирает вакансии, которые попадут в диапазон вывода, не сортируя и не форматируя остальные.
+        Если заданы ключи сортировки, вакансии сортируются одной устойчивой сортировкой индексов числовых массивов;
+        иначе, если диапазон заканчивается раньше конца списка, нужные вакансии выбираются частичной сортировкой
+        (heapq.nsmallest / heapq.nlargest сохраняют порядок устойчивой сортировки).
+        :param vacancies_data: Отфильтрованный список вакансий (list)
+        :param sort_param: Параметры, по которым происходит сортировка, через запятую (str)
+        :param is_reverse_sort: Порядок сортировки (str)
+        :param borders: Границы вывода таблицы (str)
+        :param sort_keys: Ключи сортировки всех вакансий (SortKeys)
+        :param row_ids: Номера вакансий vacancies_data в sort_keys (по умолчанию - vacancies_data
+            содержит все вакансии) (numpy.ndarray)
+        :return:
+            int: Номер первой выбранной вакансии в отсортированном списке (начиная с 0)
+            list: Выбранные вакансии в порядке сортировки
+        >>> InputConect.select_window([Vacancy(name, '', [], '', '', '', None, '', '') for name in 'dbeac'],
+        ...                           'Название', 'Нет', '2 3')[1][0].name
+        'b'
+        """
+        border = InputConect.get_borders_table(vacancies_data, borders)
+        if border[0] < 0 or border[1] < 0:
+            raise ValueError(f'Диапазон вывода задан некорректно: {borders}')
+        window = range(len(vacancies_data))[border[0]:border[1]]
+        if len(window) == 0:
+            return window.start, []
+        if sort_param == '':
+            return window.start, vacancies_data[window.start:window.stop]
+        reverse = is_reverse_sort == 'Да'
+        if sort_keys is not None:
+            order = sort_keys.argsort(InputConect.get_sort_fields(sort_param), reverse, row_ids)
+            return window.start, [vacancies_data[position] for position in order[window.start:window.stop]]
+        key = InputConect.sort_dict_vacancies(sort_param)
+        if window.stop < len(vacancies_data):
+            select = heapq.nlargest if reverse else heapq.nsmallest
+            selected = select(window.stop, vacancies_data, key=key)
+        else:
+            selected = sorted(vacancies_data, key=key, reverse=reverse)
+        return window.start, selected[window.start:]
+
+    @staticmethod
+    def print_table(vacancies_objects, query, sort_param, is_reverse_sort, borders, fields, sort_keys=None,
+                    vacancy_index=None, output_format='table', output_file=''):
         """
         Создает и печатает таблицу на основании параметров, введенных пользователем.
+        Форматируются и добавляются в таблицу только вакансии из диапазона вывода.
         :param vacancies_objects: Список с вакансиями (list)
-        :param field: Поле, по которому происходит фильтрация (str)
-        :param value_field: Значение поля, по которому происходит фильтрация (str)
+        :param query: Запрос фильтрации (см. parse_query) (list)
         :param sort_param: Параметр, по которому происходит сортировка (str)
         :param is_reverse_sort: Порядок сортировки (str)
         :param borders: Границы вывода таблицы (list)
         :param fields: Поля таблицы для печати (str)
+        :param sort_keys: Ключи сортировки вакансий vacancies_objects (SortKeys)
+        :param vacancy_index: Индексы для фильтрации вакансий vacancies_objects (VacancyIndex); запрос
+            с условием по полю без индекса фильтруется без индексов
+        :param output_format: Формат вывода (см. output_formats) (str)
+        :param output_file: Файл для вывода в форматах, отличных от 'table' (пустая строка - экран) (str)
         """
         vacancy_dictionary = vacancies_objects
         if len(vacancy_dictionary) == 0:
             print('Нет данных')
             return
 
-        if field != '' and value_field != '':
-            vacancy_dictionary = InputConect.filter_dict_vacancies(field, value_field, vacancy_dictionary)
-
-        if sort_param != '':
-            vacancy_dictionary.sort(key=InputConect.sort_dict_vacancies(sort_param), reverse=(is_reverse_sort == 'Да'))
+        row_ids = None
+        if len(query) > 0:
+            index_query = [[condition for field, value_field in conditions
+                            for condition in InputConect.get_filter_conditions(field, value_field)]
+                           for conditions in query]
+            if vacancy_index is not None and all(vacancy_index.has_indexes(conditions) for conditions in index_query):
+                plans = vacancy_index.compile_query(index_query)
+                row_ids = vacancy_index.get_row_ids(vacancy_index.evaluate_query(plans))
+                vacancy_dictionary = [vacancies_objects[row_id] for row_id in row_ids]
+            else:
+                vacancy_dictionary = InputConect.filter_query(query, vacancy_dictionary)
 
         if len(vacancy_dictionary) == 0:
             print('Ничего не найдено')
             return
 
-        vacancy_dictionary = InputConect.formatter(vacancy_dictionary)
+        if sort_keys is not None and row_ids is None and vacancy_dictionary is not vacancies_objects:
+            row_ids = InputConect.get_row_ids(vacancies_objects, vacancy_dictionary)
+        first_number, window = InputConect.select_window(vacancy_dictionary, sort_param, is_reverse_sort, borders,
+                                                         sort_keys, row_ids)
+        field_names = list(InputConect.formatter(vacancy_dictionary[:1])[0].keys())
+        if output_format != 'table':
+            InputConect.write_output(window, first_number, ['№'] + field_names, fields, output_format, output_file)
+            return
+        vacancy_dictionary = InputConect.formatter(window)
 
         table_vacancies = PrettyTable()
-        number_vacancy = 0
+        number_vacancy = first_number
 
         for i in range(len(vacancy_dictionary)):
             number_vacancy += 1
@@ -253,15 +500,14 @@ class InputConect:
             word_list.insert(0, number_vacancy)
             table_vacancies.add_row(word_list)
 
-        table_vacancies.field_names = ["№"] + list(vacancy_dictionary[0].keys())
-        table_vacancies._max_width = {el: 20 for el in table_vacancies.field_names}
+        table_vacancies.field_names = ["№"] + field_names
+        table_vacancies._max_width = {el: InputConect.max_width for el in table_vacancies.field_names}
         table_vacancies.hrules = ALL
         table_vacancies.align = 'l'
 
-        border = InputConect.get_borders_table(vacancy_dictionary, borders)
         columns = InputConect.get_fields_table(table_vacancies, fields)
 
-        print(table_vacancies.get_string(start=border[0], end=border[1], fields=columns))
+        print(table_vacancies.get_string(fields=columns))
 
     # @staticmethod
     # def formatter_date(date, form_date, result_form):
@@ -325,10 +571,78 @@ class InputConect:
         return dictionary
 
 
+    @staticmethod
+    def get_filter_conditions(field, value_field):
+        """
+        Переводит фильтр, введенный пользователем, в условия для индексов вакансий (VacancyIndex);
+        значения переводятся так же, как в filter_dict_vacancies.
+        :param field: Поле, по которому происходит фильтрация (str)
+        :param value_field: Значение этого поля, по которому происходит фильтрация (str)
+        :return:
+            list: Условия (operation, field, value)
+        >>> InputConect.get_filter_conditions('Навыки', 'C#, Python')
+        [('all', 'key_skills', ['C#', 'Python'])]
+        >>> InputConect.get_filter_conditions('Оклад', '50000')
+        [('contains', 'salary', 50000)]
+        >>> InputConect.get_filter_conditions('Дата публикации вакансии', '01.07.2022-')
+        [('between', 'published_at', ('2022-07-01', None))]
+        >>> InputConect.get_filter_conditions('Идентификатор валюты оклада', 'Рубли')
+        [('eq', 'salary_currency', 'RUR')]
+        """
+        if field in dictionary_keys.values():
+            field = InputConect.get_key(dictionary_keys, field)
+
+        if field == 'key_skills':
+            return [('all', field, value_field.split(', '))]
+        if field == 'salary':
+            if '-' in value_field:
+                return [('overlaps', field, InputConect.get_bounds(value_field, int))]
+            return [('contains', field, int(value_field))]
+        if field == 'published_at':
+            if '-' in value_field:
+                return [('between', field, InputConect.get_bounds(
+                    value_field, lambda value: InputConect.formatter_date_1(value, '%Y-%m-%d')))]
+            return [('eq', field, InputConect.formatter_date_1(value_field, '%Y-%m-%d'))]
+        if field == 'experience_id':
+            return [('eq', field, InputConect.get_key(dictionary_experience_id, value_field))]
+        if field == 'salary_currency':
+            return [('eq', field, InputConect.get_key(dictionary_salary_currency, value_field))]
+        if field in ('premium', 'salary_gross'):
+            return [('eq', field, InputConect.get_key(true_false, value_field))]
+        if field in ('salary_from', 'salary_to'):
+            return [('eq', field, int(value_field))]
+        return [('eq', field, value_field)]
+
+    @staticmethod
+    def filter_query(query, vacancies_data):
+        """
+        Фильтрует список вакансий по запросу без индексов: условия группы применяются по очереди,
+        результаты групп объединяются с сохранением порядка вакансий.
+        :param query: Запрос фильтрации (см. parse_query) (list)
+        :param vacancies_data: Список вакансий, к которому применяется фильтрация (list)
+        :return:
+            list: Отфильтрованный список с вакансиями
+        >>> vacancies = [Vacancy(name, '', [], '', '', '', Salary(salary, salary, '', ''), area, '')
+        ...              for name, salary, area in [('a', '10', 'Москва'), ('b', '20', 'Пермь'), ('c', '30', 'Москва')]]
+        >>> [vacancy.name for vacancy in InputConect.filter_query(
+        ...     [[('Название региона', 'Москва'), ('Оклад', '15-')], [('Название', 'a')]], vacancies)]
+        ['a', 'c']
+        """
+        matched = set()
+        for conditions in query:
+            rows = vacancies_data
+            for field, value_field in conditions:
+                rows = InputConect.filter_dict_vacancies(field, value_field, rows)
+            matched.update(id(row) for row in rows)
+        return [row for row in vacancies_data if id(row) in matched]
+
     @staticmethod
     def filter_dict_vacancies(field, value_field, vacancies_data):
         """
-        Фильтрует список вакансий по определенному значению конкретного поля.
+        Фильтрует список вакансий по определенному значению конкретного поля
+        (для оклада и даты публикации - также по диапазону «от-до»).
+        Навыки сравниваются целиком, как в индексе DataSet.get_vacancy_index: единственный навык,
+        прочитанный строкой, считается списком из одного навыка, а не ищется как подстрока.
         :param field: Поле, по которому происходит фильтрация (str)
         :param value_field:  Значение этого поля, по которому происходит фильтрация (str)
         :param vacancies_data: Список вакансий, к которому применяется фильтрация (list)
@@ -340,6 +654,8 @@ class InputConect:
         2
         >>> len(InputConect.filter_dict_vacancies('Навыки', 'C#, Python', [Vacancy('Аналитик', 'Первый',['C#'], '', '', '', Salary('', '', '',''), '', ''), Vacancy('программист', 'Второй',['C#', 'Python'], '', '', '', Salary('', '', '',''), '', ''), Vacancy('Аналитик', 'Третий',['C', 'Python'], '', '', '', Salary('', '', '',''), '', '')]))
         1
+        >>> len(InputConect.filter_dict_vacancies('Навыки', 'Git', [Vacancy('Аналитик', 'Первый', 'GitLab', '', '', '', Salary('', '', '',''), '', ''), Vacancy('программист', 'Второй', 'Git', '', '', '', Salary('', '', '',''), '', ''), Vacancy('Аналитик', 'Третий',['Git', 'Python'], '', '', '', Salary('', '', '',''), '', '')]))
+        2
         >>> len(InputConect.filter_dict_vacancies('Оклад', '50000', [Vacancy('Аналитик', 'Первый',['C#'], '', '', '', Salary('40000', '60000', '',''), '', ''), Vacancy('программист', 'Второй',['C#', 'Python'], '', '', '', Salary('100000', '100000', '',''), '', ''), Vacancy('Аналитик', 'Третий',['C', 'Python'], '', '', '', Salary('20000', '30000', '',''), '', '')]))
         1
         >>> len(InputConect.filter_dict_vacancies('Опыт работы', 'Нет опыта', [Vacancy('Аналитик', 'Первый',['C#'], 'between3And6', '', '', Salary('40000', '60000', '',''), '', ''), Vacancy('программист', 'Второй',['C#', 'Python'], 'noExperience', '', '', Salary('100000', '100000', '',''), '', ''), Vacancy('Аналитик', 'Третий',['C', 'Python'], 'noExperience', '', '', Salary('20000', '30000', '',''), '', '')]))
@@ -356,7 +672,18 @@ class InputConect:
 
         if field == 'key_skills':
             value_field = value_field.split(', ')
-            return list(filter(lambda row: all([value in getattr(row, field) for value in value_field]), vacancies_data))
+            return list(filter(lambda row: all([value in ([row.key_skills] if isinstance(row.key_skills, str)
+                                                          else row.key_skills) for value in value_field]),
+                               vacancies_data))
+        if field == 'salary' and '-' in value_field:
+            low, high = InputConect.get_bounds(value_field, int)
+            return list(filter(lambda row: (high is None or int(float(row.salary.salary_from)) <= high) and
+                                           (low is None or int(float(row.salary.salary_to)) >= low), vacancies_data))
+        if field == 'published_at' and '-' in value_field:
+            low, high = InputConect.get_bounds(value_field,
+                                               lambda value: InputConect.formatter_date_1(value, '%Y-%m-%d'))
+            return list(filter(lambda row: (low is None or row.published_at[:10] >= low) and
+                                           (high is None or row.published_at[:10] <= high), vacancies_data))
         if field == 'salary':
             value_field = int(value_field)
             return list(filter(lambda row: int(float(getattr(row, field).salary_from)) <=
@@ -376,15 +703,31 @@ class InputConect:
         return list(filter(lambda row: getattr(row, field) == value_field, vacancies_data))
 
 
+    @staticmethod
+    def get_sort_fields(sort_param):
+        """
+        Переводит параметры сортировки, введенные пользователем через запятую, в названия полей.
+        :param sort_param: Параметры сортировки (str)
+        :return:
+            list: Поля сортировки, начиная с главного
+        >>> InputConect.get_sort_fields('Оклад, Название')
+        ['salary', 'name']
+        """
+        return [InputConect.get_key(dictionary_keys, param) if param in dictionary_keys.values() else param
+                for param in sort_param.split(', ')]
+
     @staticmethod
     def sort_dict_vacancies(sort_param):
         """
         Определяет, как будет сортироваться таблица.
-        :param sort_param: Параметр сортировки, который ввел пользователь
+        :param sort_param: Параметр сортировки, который ввел пользователь (несколько параметров - через запятую)
         :return: Способ сортировки в зависимости от параматра сортировки
         """
-        if sort_param in dictionary_keys.values():
-            sort_param = InputConect.get_key(dictionary_keys, sort_param)
+        sort_fields = InputConect.get_sort_fields(sort_param)
+        if len(sort_fields) > 1:
+            keys = [InputConect.sort_dict_vacancies(field) for field in sort_fields]
+            return lambda row: tuple(key(row) for key in keys)
+        sort_param = sort_fields[0]
 
         if sort_param == 'salary':
             return lambda row: getattr(row, sort_param).get_salary_in_rub()
@@ -392,6 +735,10 @@ class InputConect:
             return lambda row: len(getattr(row, sort_param)) if type(getattr(row, sort_param)).__name__ == 'list' else 1
         if sort_param == 'experience_id':
             return lambda row: dict_experience_id[getattr(row, sort_param)]
+        if sort_param in ('salary_from', 'salary_to'):
+            return lambda row: float(getattr(row.salary, sort_param))
+        if sort_param in ('salary_gross', 'salary_currency'):
+            return lambda row: getattr(row.salary, sort_param)
         return lambda row: getattr(row, sort_param)
 
 
@@ -402,6 +749,8 @@ class DataSet:
     Attributes:
         file_name (str): Название CSV файла
         vacancies_objects (list): Лист с вакансиями
+        sort_keys (SortKeys): Типизированные ключи сортировки вакансий (None, пока не понадобились)
+        vacancy_index (VacancyIndex): Индексы для фильтрации вакансий (None, пока не понадобились)
     """
     def __init__(self, file_name):
         """
@@ -412,11 +761,35 @@ class DataSet:
         """
         self.file_name = file_name
         self.vacancies_objects = DataSet.csv_reader(file_name)
+        self.sort_keys = None
+        self.vacancy_index = None
+
+    def load_sort_keys(self):
+        """
+        Возвращает ключи сортировки вакансий; они строятся при первом обращении, поэтому вывод без сортировки
+        не тратит на них время.
+        :return:
+            SortKeys: Ключи сортировки вакансий
+        """
+        if self.sort_keys is None:
+            self.sort_keys = DataSet.get_sort_keys(self.vacancies_objects)
+        return self.sort_keys
+
+    def load_vacancy_index(self):
+        """
+        Возвращает индексы для фильтрации вакансий; они строятся при первом обращении, поэтому вывод
+        без фильтрации не тратит на них время.
+        :return:
+            VacancyIndex: Индексы вакансий
+        """
+        if self.vacancy_index is None:
+            self.vacancy_index = DataSet.get_vacancy_index(self.vacancies_objects)
+        return self.vacancy_index
 
     @staticmethod
     def delete_tags(value):
         """
-        Отчищает строку от тегов.
+        Отчищает строку от тегов и HTML-сущностей за линейное время.
         :param value: Строка (str)
         :return:
             str: Строка, отчищенная от тегов
@@ -425,21 +798,16 @@ class DataSet:
         >>> DataSet.delete_tags('With<strong> tags')
         'With tags'
         """
-        temp_value = ''
-        while value.find('<') != - 1:
-            temp_value += value[:value.find('<')]
-            current_index = value.find('>') + 1
-            value = value[current_index:]
-        else:
-            return temp_value + value
+        return htmlCleaner.delete_tags(value)
 
     @staticmethod
-    def csv_reader(file_name):
+    def read_columns(file_name, markup_only=True):
         """
-        Читает CSV файл и создает vacancy_dictionary (лист с вакансиями) с объектами Vacancy.
+        Читает CSV файл и отчищает значения всех полей вакансий.
         :param file_name: Имя файла CSV, из которого будут читаться данные (str)
+        :param markup_only: Отчищать от тегов только столбцы, в которых есть разметка (bool)
         :return:
-            list: Лист с вакансиями
+            dict: Словарь: ключ - поле, значение - список отчищенных значений поля
         """
         with open(file_name, newline='', encoding='utf-8-sig') as file:
             vacancies_csv = csv.reader(file)
@@ -450,24 +818,140 @@ class DataSet:
             except:
                 print('Пустой файл')
                 exit()
-            vacancy_dictionary = []
+            columns = {key: [] for key in vacancy_keys}
             filtered_vacancy_data = [vacancy for vacancy in vacancy_data
                                      if len(vacancy) == len(vacancy_keys) and '' not in vacancy]
+            markup_columns = htmlCleaner.get_markup_columns(filtered_vacancy_data, len(vacancy_keys)) \
+                if markup_only else [True] * len(vacancy_keys)
             for row in filtered_vacancy_data:
-                dic = {}
                 for i in range(len(row)):
-                    elem = DataSet.delete_tags(row[i])
+                    elem = DataSet.delete_tags(row[i]) if markup_columns[i] else row[i]
                     if elem.find("\n") != -1:
                         elem = elem.split('\n')
                         elem = [' '.join(x.split()) for x in elem]
                     else:
                         elem = ' '.join(elem.split())
-                    dic[vacancy_keys[i]] = elem
-                vacancy_dictionary.append(
-                    Vacancy(dic['name'], dic['description'], dic['key_skills'], dic['experience_id'], dic['premium'],
-                            dic['employer_name'], Salary(dic['salary_from'], dic['salary_to'], dic['salary_gross'],
-                            dic['salary_currency']), dic['area_name'], dic['published_at']))
-            return vacancy_dictionary
+                    columns[vacancy_keys[i]].append(ColumnCache.encode_cell(elem))
+            return columns
+
+    @staticmethod
+    def csv_reader(file_name):
+        """
+        Читает CSV файл и создает vacancy_dictionary (лист с вакансиями) с объектами Vacancy.
+        Отчищенные значения полей сохраняются в бинарный кэш и повторно не разбираются, пока файл не изменится.
+        :param file_name: Имя файла CSV, из которого будут читаться данные (str)
+        :return:
+            list: Лист с вакансиями
+        """
+        cache = ColumnCache(file_name, 'vacancies')
+        columns = cache.load()
+        if columns is None:
+            columns = DataSet.read_columns(file_name)
+            cache.save(columns)
+        vacancy_keys = list(columns.keys())
+        vacancy_dictionary = []
+        for row in zip(*columns.values()):
+            dic = {vacancy_keys[i]: ColumnCache.decode_cell(row[i]) for i in range(len(row))}
+            vacancy_dictionary.append(
+                Vacancy(dic['name'], dic['description'], dic['key_skills'], dic['experience_id'], dic['premium'],
+                        dic['employer_name'], Salary(dic['salary_from'], dic['salary_to'], dic['salary_gross'],
+                        dic['salary_currency']), dic['area_name'], dic['published_at']))
+        return vacancy_dictionary
+
+    @staticmethod
+    def get_text_ranks(values):
+        """
+        Возвращает ранги строковых значений поля (значения из нескольких строк склеиваются через перевод строки).
+        :param values: Значения поля (list)
+        :return:
+            numpy.ndarray: Ранги значений
+        """
+        return SortKeys.get_ranks([value if isinstance(value, str) else '\n'.join(value) for value in values])
+
+    @staticmethod
+    def get_sort_keys(vacancies_objects):
+        """
+        Вычисляет типизированные ключи сортировки один раз при загрузке: зарплату в рублях (float),
+        ранг опыта работы и количество навыков (int), время публикации в секундах (int),
+        ранги строковых полей (int).
+        :param vacancies_objects: Лист с вакансиями (list)
+        :return:
+            SortKeys: Ключи сортировки
+        >>> keys = DataSet.get_sort_keys([Vacancy('b', '', ['C', 'Python'], 'moreThan6', 'False', '',
+        ...                                       Salary('100', '300', 'True', 'USD'), '',
+        ...                                       '2022-07-05T18:19:30+0300'),
+        ...                               Vacancy('a', '', 'Git', 'noExperience', 'True', '',
+        ...                                       Salary('1000', '2000', 'False', 'RUR'), '',
+        ...                                       '2022-07-05T16:19:31+0100')])
+        >>> keys.argsort(['salary']).tolist(), keys.argsort(['published_at']).tolist()
+        ([1, 0], [0, 1])
+        >>> keys.argsort(['key_skills']).tolist(), keys.argsort(['name']).tolist()
+        ([1, 0], [1, 0])
+        """
+        salaries = [vacancy.salary for vacancy in vacancies_objects]
+        salary_from = np.array([salary.salary_from for salary in salaries], dtype=np.float64)
+        salary_to = np.array([salary.salary_to for salary in salaries], dtype=np.float64)
+        rates = np.array([currency_to_rub[salary.salary_currency] for salary in salaries], dtype=np.float64)
+        published_at = [vacancy.published_at for vacancy in vacancies_objects]
+        try:
+            published_at = parse_timestamps(published_at)
+        except ValueError:
+            published_at = DataSet.get_text_ranks(published_at)
+        columns = {
+            'salary': (salary_from + salary_to) / 2 * rates,
+            'salary_from': salary_from,
+            'salary_to': salary_to,
+            'experience_id': np.array([dict_experience_id[vacancy.experience_id] for vacancy in vacancies_objects],
+                                      dtype=np.int8),
+            'key_skills': np.array([len(vacancy.key_skills) if isinstance(vacancy.key_skills, list) else 1
+                                    for vacancy in vacancies_objects], dtype=np.int32),
+            'published_at': published_at,
+            'salary_gross': DataSet.get_text_ranks([salary.salary_gross for salary in salaries]),
+            'salary_currency': DataSet.get_text_ranks([salary.salary_currency for salary in salaries])}
+        for field in ('name', 'description', 'premium', 'employer_name', 'area_name'):
+            columns[field] = DataSet.get_text_ranks([getattr(vacancy, field) for vacancy in vacancies_objects])
+        return SortKeys(columns)
+
+    @staticmethod
+    def get_vacancy_index(vacancies_objects):
+        """
+        Строит индексы для фильтрации: хеш-индексы полей, которые сравниваются на равенство,
+        индекс дат публикации для диапазонов, индекс вилок оклада (в целых числах, как в filter_dict_vacancies)
+        и номера вакансий для каждого навыка (вакансия с одним навыком хранит его строкой).
+        Описание не индексируется: длинные уникальные строки заняли бы много памяти, а фильтр по описанию
+        выполняется без индексов (filter_query).
+        :param vacancies_objects: Лист с вакансиями (list)
+        :return:
+            VacancyIndex: Индексы вакансий
+        >>> index = DataSet.get_vacancy_index([Vacancy('a', '', ['C#', 'Python'], 'noExperience', 'False', '',
+        ...                                            Salary('100', '300.5', 'True', 'USD'), 'Москва',
+        ...                                            '2022-07-05T18:19:30+0300')])
+        >>> index.get_row_ids(index.evaluate(index.compile([('contains', 'salary', 300), ('all', 'key_skills', ['C#']),
+        ...                                                  ('eq', 'published_at', '2022-07-05')]))).tolist()
+        [0]
+        >>> index = DataSet.get_vacancy_index([Vacancy('a', '', skills, '', '', '', Salary('0', '0', '', ''), '', '')
+        ...                                    for skills in ('GitLab', 'Git', ['Git', 'Python'])])
+        >>> index.get_row_ids(index.evaluate(index.compile([('all', 'key_skills', ['Git'])]))).tolist()
+        [1, 2]
+        """
+        salaries = [vacancy.salary for vacancy in vacancies_objects]
+        salary_from = np.array([salary.salary_from for salary in salaries], dtype=np.float64).astype(np.int64)
+        salary_to = np.array([salary.salary_to for salary in salaries], dtype=np.float64).astype(np.int64)
+        vacancy_index = VacancyIndex(len(vacancies_objects))
+        for field in ('name', 'experience_id', 'premium', 'employer_name', 'area_name'):
+            vacancy_index.add_hash_index(field, [getattr(vacancy, field) for vacancy in vacancies_objects])
+        for field in ('salary_gross', 'salary_currency'):
+            vacancy_index.add_hash_index(field, [getattr(salary, field) for salary in salaries])
+        vacancy_index.add_hash_index('salary_from', salary_from.tolist())
+        vacancy_index.add_hash_index('salary_to', salary_to.tolist())
+        vacancy_index.add_hash_index('published_at', [vacancy.published_at[:10] for vacancy in vacancies_objects])
+        vacancy_index.add_range_index('published_at', [vacancy.published_at[:10] for vacancy in vacancies_objects])
+        vacancy_index.add_interval_index('salary', salary_from, salary_to)
+        vacancy_index.add_set_index('key_skills', [[vacancy.key_skills] if isinstance(vacancy.key_skills, str)
+                                                   else vacancy.key_skills for vacancy in vacancies_objects])
+        return vacancy_index
+
+
 def main():
     """Создает объект InputConect, печатает данные в таблицу."""
     a = InputConect()
@@ -1,50 +1,141 @@
 import csv
-from datetime import datetime
+import re
+from pathlib import Path
+from dateParser import get_year, get_year_month
+
 
 class SplitingCSV:
     """
         Класс для разделения данных из файла CSV.
         Attributes:
             file_name (str): Название CSV файла
+            output_dir (Path): Папка, в которую записываются файлы частей
+            partition_key (str): Ключ разделения: 'year', 'year-month' или 'area'
+            max_open_files (int): Наибольшее количество одновременно открытых файлов частей
         """
+    partition_keys = {
+        'year': ('published_at', lambda value: f'{get_year(value)}'),
+        'year-month': ('published_at', lambda value: '{0}-{1:02}'.format(*get_year_month(value))),
+        'area': ('area_name', lambda value: value),
+    }
 
-    def __init__(self, file_name):
+    def __init__(self, file_name, output_dir='.', partition_key='year', max_open_files=256):
         """
         Инициализирует объект SplitingCSV.
         Args:
             file_name (str): Название CSV файла
+            output_dir (str or Path): Папка, в которую записываются файлы частей
+            partition_key (str): Ключ разделения: 'year', 'year-month' или 'area'
+            max_open_files (int): Наибольшее количество одновременно открытых файлов частей
         """
+        if partition_key not in SplitingCSV.partition_keys:
+            raise ValueError(f'Неизвестный ключ разделения: {partition_key}')
         self.file_name = file_name
+        self.output_dir = Path(output_dir)
+        self.partition_key = partition_key
+        self.max_open_files = max_open_files
+
+    @staticmethod
+    def get_partition_file_name(partition):
+        """
+        Возвращает имя файла части, заменяя символы, недопустимые в именах файлов.
+        :param partition: Значение ключа разделения (str)
+        :return:
+            str: Имя файла части
+        >>> SplitingCSV.get_partition_file_name('2022')
+        '2022.csv'
+        >>> SplitingCSV.get_partition_file_name('Москва/Зеленоград')
+        'Москва_Зеленоград.csv'
+        """
+        return re.sub(r'[\\/:*?"<>|]', '_', partition) + '.csv'
+
+    @staticmethod
+    def get_unique_file_name(partition, used_names):
+        """
+        Возвращает имя файла части, которое не совпадает с именами других частей: если после замены
+        недопустимых символов (или без учета регистра) имя уже занято, к нему добавляется номер.
+        :param partition: Значение ключа разделения (str)
+        :param used_names: Занятые имена файлов в нижнем регистре; новое имя добавляется в него (set)
+        :return:
+            str: Имя файла части
+        >>> used_names = set()
+        >>> [SplitingCSV.get_unique_file_name(partition, used_names) for partition in ['A/B', 'A_B', 'a_b', 'A_B_1']]
+        ['A_B.csv', 'A_B_1.csv', 'a_b_2.csv', 'A_B_1_1.csv']
+        """
+        name = SplitingCSV.get_partition_file_name(partition)
+        stem, index = name[:-len('.csv')], 1
+        while name.lower() in used_names:
+            name = f'{stem}_{index}.csv'
+            index += 1
+        used_names.add(name.lower())
+        return name
 
     def split_csv(self):
         """
-        Разделяет файл CSV на несколько по годам.
+        Разделяет файл CSV на несколько по ключу разделения за один проход:
+        строки читаются потоково, для каждой части держится открытым один буферизованный файл.
+        :return:
+            dict: Словарь: ключ - значение ключа разделения, значение - путь к файлу части
         """
-        years_list = []
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        partition_files = {}
+        open_files = {}
+        used_names = set()
+        last_partition = None
         with open(self.file_name, newline='', encoding='utf-8-sig') as file:
             vacancies_csv = csv.reader(file)
-            vacancy_data = [row for row in vacancies_csv]
-            vacancy_keys = []
-            try:
-                vacancy_keys = vacancy_data.pop(0)
-            except:
+            vacancy_keys = next(vacancies_csv, None)
+            if vacancy_keys is None:
                 print('Пустой файл')
                 exit()
-            index_date = vacancy_keys.index('published_at')
-            filtered_vacancy_data = [vacancy for vacancy in vacancy_data
-                                    if len(vacancy) == len(vacancy_keys) and '' not in vacancy]
-            for vacancy in filtered_vacancy_data:
-                year = datetime.strptime(vacancy[index_date], '%Y-%m-%dT%H:%M:%S%z').strftime('%Y')
-                if year not in years_list:
-                    with open(f"{year}.csv", mode="w", encoding='utf-8-sig') as w_file:
-                        file_writer = csv.writer(w_file, delimiter=',', lineterminator="\r")
-                        years_list.append(year)
-                        file_writer.writerow(vacancy_keys)
-                        file_writer.writerow(vacancy)
-                else:
-                    with open(f"{year}.csv", mode="a", encoding='utf-8-sig') as w_file:
-                        file_writer = csv.writer(w_file, delimiter=',', lineterminator="\r")
-                        file_writer.writerow(vacancy)
+            key_field, get_partition = SplitingCSV.partition_keys[self.partition_key]
+            index_key = vacancy_keys.index(key_field)
+            header_length = len(vacancy_keys)
+            try:
+                for vacancy in vacancies_csv:
+                    if len(vacancy) != header_length or '' in vacancy:
+                        continue
+                    partition = get_partition(vacancy[index_key])
+                    file_writer = open_files.get(partition)
+                    if file_writer is None:
+                        file_writer = self.open_partition(partition, partition_files, open_files, vacancy_keys,
+                                                          used_names)
+                    elif partition != last_partition:
+                        open_files[partition] = open_files.pop(partition)
+                    last_partition = partition
+                    file_writer[1].writerow(vacancy)
+            finally:
+                for w_file, _ in open_files.values():
+                    w_file.close()
+        return partition_files
+
+    def open_partition(self, partition, partition_files, open_files, vacancy_keys, used_names):
+        """
+        Открывает файл части: новый файл создается с заголовком, ранее закрытый - дописывается.
+        Если открыто слишком много файлов, закрывает файл, в который дольше всех не писали
+        (split_csv переносит используемый файл в конец open_files).
+        :param partition: Значение ключа разделения (str)
+        :param partition_files: Словарь уже созданных файлов частей (dict)
+        :param open_files: Словарь открытых файлов частей: значение - файл и csv.writer (dict)
+        :param vacancy_keys: Заголовок CSV файла (list)
+        :param used_names: Занятые имена файлов частей в нижнем регистре (set)
+        :return:
+            tuple: Открытый файл и csv.writer для него
+        """
+        if len(open_files) >= self.max_open_files:
+            least_recent = next(iter(open_files))
+            open_files.pop(least_recent)[0].close()
+        if partition in partition_files:
+            w_file = open(partition_files[partition], mode='a', encoding='utf-8-sig', buffering=1 << 20)
+            file_writer = csv.writer(w_file, delimiter=',', lineterminator="\r")
+        else:
+            partition_files[partition] = self.output_dir / SplitingCSV.get_unique_file_name(partition, used_names)
+            w_file = open(partition_files[partition], mode='w', encoding='utf-8-sig', buffering=1 << 20)
+            file_writer = csv.writer(w_file, delimiter=',', lineterminator="\r")
+            file_writer.writerow(vacancy_keys)
+        open_files[partition] = (w_file, file_writer)
+        return open_files[partition]
+
 
 def main():
     """Создает объект SplitingCSV, разделяет CSV файл."""
@@ -1,9 +1,18 @@
+import importlib
 import multiprocessing
-import statisticsReport
+from statisticsAccumulator import VacancyStatistic
+from vacancyTable import VacancyTable
+from currencyConverter import CurrencyConverter
 from pathlib import Path
 import time
 
+# Чтение CSV файлов и словари статистики берутся из 231.py; имя модуля начинается с цифры,
+# поэтому он загружается через importlib.
+statisticsReport = importlib.import_module('231')
+
 vacancy_name = input('Введите название профессии: ')
+currency_converter = CurrencyConverter(statisticsReport.currency_to_rub)
+
 class PrintingStatistic:
     """
        Обрабатывает параметры вводимые пользователями: название файла, название профессии;
@@ -17,50 +26,27 @@ class PrintingStatistic:
         self.file_name = file_name
 
     def print_data(self):
-        """Печатает статистику на экран, создает таблицы, графики и отчет с данными."""
+        """
+        Печатает статистику на экран, создает таблицы, графики и отчет с данными.
+        Колоночный файл 341.py (папка .columns) читается без разбора CSV.
+        """
+        if Path(self.file_name).suffix == '.columns':
+            vacancies_table = VacancyTable.from_converted(self.file_name)
+            return vacancies_table.get_statistic(vacancy_name, vacancies_table.get_salary_in_rub(currency_converter))
         vacancies_objects = statisticsReport.DataSet(self.file_name).vacancies_objects
         return PrintingStatistic.print_analytical_data(vacancies_objects, vacancy_name)
 
     @staticmethod
     def print_analytical_data(vacancies_objects, vacancy_name):
         """
-        Печатает статистику зарплаты и количества вакансий по годам и городам;
-        добавляет словари со статистикой в списки:
-        list_analytical_dict_year, list_analytical_dict_city, list_analytical_dict_city_1
-        для создания таблиц, графиков и отчета.
+        Собирает частичную статистику зарплаты и количества вакансий по годам, по годам для выбранной профессии
+        и по городам в виде сумм и количеств, которые можно объединять между частями данных.
         :param vacancies_objects: Список с вакансиями, на основе которого создается статистика (list)
         :param vacancy_name: Название вакансии, по которой будет выбираться статистика (str)
-        :return list словарей
+        :return VacancyStatistic: частичная статистика
         """
-        vacancies_dict = vacancies_objects
-        years = set()
-        for vacancy in vacancies_dict:
-            years.add(int(vacancy.published_at[:4]))
-        years = list(range(min(years), max(years) + 1))
-
-        years_salary_dictionary = {year: [] for year in years}
-        years_salary_vacancy_dict = {year: [] for year in years}
-        years_count_dictionary = {year: 0 for year in years}
-        years_count_vacancy_dict = {year: 0 for year in years}
-
-        area_dict = {}
-
-        for vacancy in vacancies_dict:
-            year = int(vacancy.published_at[:4])
-            years_salary_dictionary[year].append(vacancy.salary.get_salary_in_rub())
-            years_count_dictionary[year] += 1
-            if vacancy_name in vacancy.name:
-                years_salary_vacancy_dict[year].append(vacancy.salary.get_salary_in_rub())
-                years_count_vacancy_dict[year] += 1
-            if vacancy.area_name in area_dict:
-                area_dict[vacancy.area_name].append(vacancy.salary.get_salary_in_rub())
-            else:
-                area_dict[vacancy.area_name] = [vacancy.salary.get_salary_in_rub()]
-
-        years_salary_dictionary = statisticsReport.InputConect.get_years_salary_dict(years_salary_dictionary)
-        years_salary_vacancy_dict = statisticsReport.InputConect.get_years_salary_dict(years_salary_vacancy_dict)
-
-        return [years_salary_dictionary, years_count_dictionary, years_salary_vacancy_dict, years_count_vacancy_dict]
+        vacancies_table = VacancyTable.from_vacancies(vacancies_objects)
+        return vacancies_table.get_statistic(vacancy_name, vacancies_table.get_salary_in_rub(currency_converter))
 
 def main(file_name):
     """
@@ -72,25 +58,23 @@ def main(file_name):
 def get_multiproc():
     """
     Запускает многопроцессорность выполнения обработки CSV-файлов;
-    печатает статистику.
+    объединяет частичную статистику по файлам и печатает статистику по годам и городам.
     """
-    fname = [f for f in Path(input('Введите название папки: ')).glob('*.csv')]
+    folder = Path(input('Введите название папки: '))
+    fname = [f for f in folder.glob('*.csv')] + [f for f in folder.glob('*.columns') if f.is_dir()]
     with multiprocessing.Pool(processes=16) as p:
         result = p.map(main, fname)
-    years_salary_dictionary = {}
-    years_count_dictionary = {}
-    years_salary_vacancy_dict = {}
-    years_count_vacancy_dict = {}
-    list_dict = [years_salary_dictionary, years_count_dictionary, years_salary_vacancy_dict, years_count_vacancy_dict]
-    for year in result:
-        for i in range(len(year)):
-            year_items = year[i].items()
-            for dic in year_items:
-                list_dict[i][dic[0]] = dic[1]
+    statistic = VacancyStatistic(vacancy_name)
+    for partial in result:
+        statistic.merge(partial)
+    years_salary_dictionary, years_count_dictionary, years_salary_vacancy_dict, years_count_vacancy_dict, \
+        area_salary_dict, area_count_dict = statisticsReport.InputConect.get_analytical_dicts(statistic)
     print(f'Динамика уровня зарплат по годам: {years_salary_dictionary}')
     print(f'Динамика количества вакансий по годам: {years_count_dictionary}')
     print(f'Динамика уровня зарплат по годам для выбранной профессии: {years_salary_vacancy_dict}')
     print(f'Динамика количества вакансий по годам для выбранной профессии: {years_count_vacancy_dict}')
+    print(f'Уровень зарплат по городам (в порядке убывания): {area_salary_dict}')
+    print(f'Доля вакансий по городам (в порядке убывания): {area_count_dict}')
 
 if __name__ == '__main__':
     start_time = time.time()
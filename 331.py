@@ -1,44 +1,43 @@
 import multiprocessing
 from pathlib import Path
 import csv
-import statisticsReport
-import requests
-import xmltodict
-import json
+from collections import Counter
 import pandas as pd
+from cbrRates import CBRRateFetcher
 
 
-def csv_reader(file_name):
+def get_currency_stats(file):
     """
-    Читает CSV файл и создает vacancy_dictionary (лист с вакансиями) с объектами Vacancy.
-    :param file_name: Имя файла CSV, из которого будут читаться данные (str)
+    Считает частотность валют в файле с вакансиями, читая потоково только столбцы salary_currency и published_at;
+    для каждой валюты запоминает самую раннюю и самую позднюю дату публикации.
+    :param file: Файл с вакансиями для обработки
     :return:
-        list: Лист с вакансиями
+        Counter: Частотность валют: ключ - валюта, значение - количество ее встречаемости
+        dict: Словарь: ключ - валюта, значение - список из самой ранней и самой поздней даты публикации
     """
-    with open(file_name, newline='', encoding='utf-8-sig') as file:
-        vacancies_csv = csv.reader(file)
-        vacancy_data = [row for row in vacancies_csv]
-        vacancy_keys = []
-        try:
-            vacancy_keys = vacancy_data.pop(0)
-        except:
-            print('Пустой файл')
-            exit()
-        vacancy_dictionary = []
-        for row in vacancy_data:
-            dic = {}
-            for i in range(len(row)):
-                elem = statisticsReport.DataSet.delete_tags(row[i])
-                if elem.find("\n") != -1:
-                    elem = elem.split('\n')
-                    elem = [' '.join(x.split()) for x in elem]
-                else:
-                    elem = ' '.join(elem.split())
-                dic[vacancy_keys[i]] = elem
-            vacancy_dictionary.append(
-                statisticsReport.Vacancy(dic['name'], statisticsReport.Salary(dic['salary_from'], dic['salary_to'],
-                                            dic['salary_currency']), dic['area_name'], dic['published_at']))
-        return vacancy_dictionary
+    currency_counts = Counter()
+    currency_dates = {}
+    with open(file, newline='', encoding='utf-8-sig') as f:
+        vacancies_csv = csv.reader(f)
+        vacancy_keys = next(vacancies_csv, None)
+        if vacancy_keys is None:
+            return currency_counts, currency_dates
+        index_currency = vacancy_keys.index('salary_currency')
+        index_date = vacancy_keys.index('published_at')
+        for row in vacancies_csv:
+            if len(row) != len(vacancy_keys):
+                continue
+            salary_currency = row[index_currency].strip()
+            published_at = row[index_date].strip()
+            currency_counts[salary_currency] += 1
+            dates = currency_dates.get(salary_currency)
+            if dates is None:
+                currency_dates[salary_currency] = [published_at, published_at]
+            elif published_at < dates[0]:
+                dates[0] = published_at
+            elif published_at > dates[1]:
+                dates[1] = published_at
+    return currency_counts, currency_dates
 
 def get_dict_currency_year(file):
     """
@@ -46,101 +45,64 @@ def get_dict_currency_year(file):
     :param file: Файл с вакансиями для обработки
     :return: Словарь, где ключ - валюта, значение - количество ее встречаемости
     """
-    vacancy_dictionary = csv_reader(file)
-    dict_sal_currency_year = {}
-    for vacancy in vacancy_dictionary:
-        salary_currency = vacancy.salary.__dict__['salary_currency']
-        if salary_currency not in dict_sal_currency_year:
-            dict_sal_currency_year[salary_currency] = 1
-        else:
-            dict_sal_currency_year[salary_currency] += 1
-    return dict_sal_currency_year
+    return dict(get_currency_stats(file)[0])
 
 def get_multiproc():
     """
     Запускает многопроцессорность выполнения обработки CSV-файлов;
-    соединяет статистику по количеству встречаемости валют.
-    :return: полный словарь с частотностью валют
+    соединяет статистику по количеству встречаемости валют и крайним датам публикации.
+    :return:
+        Counter: Полная частотность валют
+        dict: Словарь: ключ - валюта, значение - список из самой ранней и самой поздней даты публикации
     """
     fname = [f for f in Path(input('Введите название папки: ')).glob('*.csv')]
     with multiprocessing.Pool(processes=8) as p:
-        result = p.map(get_dict_currency_year, fname)
-    dict_sal_currency = {}
-    for year in result:
-        for currency in year:
-            if currency not in dict_sal_currency:
-                dict_sal_currency[currency] = year[currency]
+        result = p.map(get_currency_stats, fname)
+    dict_sal_currency = Counter()
+    currency_dates = {}
+    for currency_counts, dates in result:
+        dict_sal_currency.update(currency_counts)
+        for currency, (date_min, date_max) in dates.items():
+            if currency not in currency_dates:
+                currency_dates[currency] = [date_min, date_max]
             else:
-                dict_sal_currency[currency] += year[currency]
-    return dict_sal_currency
+                currency_dates[currency][0] = min(currency_dates[currency][0], date_min)
+                currency_dates[currency][1] = max(currency_dates[currency][1], date_max)
+    return dict_sal_currency, currency_dates
 
-def get_currency_for_convert():
+def get_currency_for_convert(dic):
     """
     Отбирает валюты, встречаемость которых не менее 5000 раз, для конвертации.
+    :param dic: Частотность валют (Counter)
     :return: Лист с названиями валют для конвертации
     """
-    dic = get_multiproc()
     currencies_for_convert = []
     for curr in dic:
         if dic[curr] >= 5000 and curr != '':
             currencies_for_convert.append(curr)
     return currencies_for_convert
 
-def get_borders_date(currencies_for_convert):
+def get_borders_date(currencies_for_convert, currency_dates):
     """
     Дает крайние даты для выборки курса валют.
     :param currencies_for_convert: Лист валют для конвертации
-    :return: Крайние даты для выборки курса валют
+    :param currency_dates: Словарь: ключ - валюта, значение - список из самой ранней и самой поздней даты публикации
+    :return: Крайние даты (месяцы в формате 'ГГГГ-ММ') для выборки курса валют
     """
-    vacancy_dictionary_start = csv_reader(input('Файл самого раннего года: '))
-    vacancy_dictionary_final = csv_reader(input('Файл самого позднего года: '))
-    month_min = '12'
-    date_min = ''
-    for vacancy in vacancy_dictionary_start:
-        if vacancy.salary.__dict__['salary_currency'] in currencies_for_convert:
-            vacancy_date = vacancy.published_at[:7]
-            vacancy_month = vacancy.published_at[5:7]
-            if vacancy_month < month_min:
-                month_min = vacancy_month
-                date_min = vacancy_date
-            elif vacancy_month == '01':
-                date_min = vacancy_date
-    month_max = '01'
-    date_max = ''
-    for vacancy in vacancy_dictionary_final:
-        if vacancy.salary.__dict__['salary_currency'] in currencies_for_convert:
-            vacancy_date = vacancy.published_at[:7]
-            vacancy_month = vacancy.published_at[5:7]
-            if vacancy_month > month_max:
-                month_max = vacancy_month
-                date_max = vacancy_date
-            elif vacancy_month == '12':
-                date_max = vacancy_date
-    return date_min, date_max
+    date_min = min(currency_dates[currency][0] for currency in currencies_for_convert)
+    date_max = max(currency_dates[currency][1] for currency in currencies_for_convert)
+    return date_min[:7], date_max[:7]
 
 def get_val_curs():
     """
     Создает DataFrame с курсами валют (по отношению к рублю) и сохраняет его в формат .csv.
+    Курсы получает CBRRateFetcher: ответы cbr.ru хранятся на диске, недостающие месяцы скачиваются одновременно.
     """
-    currencies_for_convert = get_currency_for_convert()
-    date_min, date_max = get_borders_date(currencies_for_convert)
-    currencies_date = []
-    for i in range(int(date_min[:4]), int(date_max[:4]) + 1):
-        for j in range(int(date_min[5:7]), 13):
-            date_cur = {}
-            date_cur['date'] = f'{i}-{j:02}'
-            url = f'http://www.cbr.ru/scripts/XML_daily.asp?date_req=01/{j:02}/{i}'
-            response = requests.get(url).text
-            json_text = json.dumps(xmltodict.parse(response))
-            currencies = eval(json_text)['ValCurs']['Valute']
-            for currency in currencies:
-                if currency['CharCode'] in currencies_for_convert:
-                    date_cur[currency['CharCode']] = round(float(currency['Value'].replace(',', '.'))/
-                                                               float(currency['Nominal'].replace(',', '.')), 7)
-
-            currencies_date.append(date_cur)
-            if i == int(date_max[:4]) and j == int(date_max[5:7]):
-                break
+    currency_counts, currency_dates = get_multiproc()
+    currencies_for_convert = get_currency_for_convert(currency_counts)
+    date_min, date_max = get_borders_date(currencies_for_convert, currency_dates)
+    fetcher = CBRRateFetcher(currencies_for_convert)
+    currencies_date = fetcher.get_rates(CBRRateFetcher.get_months(date_min, date_max))
     df = pd.DataFrame(currencies_date)
     df.to_csv('currencyRate.csv', index=False)
 
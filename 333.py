@@ -1,6 +1,10 @@
-import csv
 import time
 import requests
+from hhHarvester import HHHarvester
+from batchCSVWriter import BatchCSVWriter
+
+vacancy_header = ['name', 'salary_from', 'salary_to', 'salary_currency', 'area_name', 'published_at']
+
 
 def get_page(page, time_from, time_to, date):
     """
@@ -22,34 +26,42 @@ def get_page(page, time_from, time_to, date):
     req = requests.get('https://api.hh.ru/vacancies', params).json()
     return req
 
-def add_csv_vacancy():
+def add_csv_vacancy(file_name="hhVacancies.csv", compress=False):
     """
     Добавляет нужные поля вакансии в CSV-файл, итерируясь по страницам и промежуткам времени.
+    Строки передаются в BatchCSVWriter, который открывает файл один раз и пишет его большими блоками.
+    :param file_name: Имя CSV-файла (str)
+    :param compress: Записывать ли файл в формате gzip (bool)
+    """
+    with BatchCSVWriter(file_name, vacancy_header, compress=compress) as writer:
+        for hour in range(0, 23, 2):
+            next_hour = hour + 1
+            if hour < 10:
+                hour = f'0{hour}'
+            if next_hour < 10:
+                next_hour = f'0{next_hour}'
+            for page in range(0, 20):
+                vacancies = get_page(page, f'{hour}:00:00', f'{next_hour}:59:59', '2022-12-20')
+                writer.writerows([HHHarvester.get_row(row) for row in vacancies['items']])
+
+                if (vacancies['pages'] - page) <= 1:
+                    break
+
+                time.sleep(0.25)
+
+def add_csv_vacancy_async(dates, file_name="hhVacancies.csv", compress=False, **harvester_params):
+    """
+    Добавляет нужные поля вакансий за несколько дней в CSV-файл, выгружая страницы асинхронно
+    через HHHarvester: одна сессия с пулом соединений, ограничение частоты запросов,
+    повтор запросов при ошибках и деление промежутков времени, в которых больше 2000 вакансий.
+    Страницы передаются в BatchCSVWriter, поэтому запись в файл не задерживает запросы.
+    :param dates: Даты публикации в формате 'ГГГГ-ММ-ДД' (list)
+    :param file_name: Имя CSV-файла (str)
+    :param compress: Записывать ли файл в формате gzip (bool)
+    :param harvester_params: Параметры HHHarvester: url, rate, concurrency, retries, backoff, min_window
     """
-    for hour in range(0, 23, 2):
-        next_hour = hour + 1
-        if hour < 10:
-            hour = f'0{hour}'
-        if next_hour < 10:
-            next_hour = f'0{next_hour}'
-        for page in range(0, 20):
-            vacancies = get_page(page, f'{hour}:00:00', f'{next_hour}:59:59', '2022-12-20')
-            with open(f"hhVacancies.csv", mode="a", encoding='utf-8-sig') as w_file:
-                file_writer = csv.writer(w_file, delimiter=',', lineterminator="\r")
-                for row in vacancies['items']:
-                    if row['salary'] is None:
-                        file_writer.writerow([row['name'], '', '', '', row['area']['name'], row['published_at']])
-                    else:
-                        file_writer.writerow([row['name'], row['salary']['from'], row['salary']['to'],
-                                              row['salary']['currency'], row['area']['name'], row['published_at']])
-
-            if (vacancies['pages'] - page) <= 1:
-                break
-
-            time.sleep(0.25)
+    with BatchCSVWriter(file_name, vacancy_header, compress=compress) as writer:
+        HHHarvester(**harvester_params).run(dates, writer.writerows)
 
 if __name__ == '__main__':
-    with open(f"hhVacancies.csv", mode="a", encoding='utf-8-sig') as w_file:
-        file_writer = csv.writer(w_file, delimiter=',', lineterminator="\r")
-        file_writer.writerow(['name', 'salary_from', 'salary_to', 'salary_currency', 'area_name', 'published_at'])
-    add_csv_vacancy()
+    add_csv_vacancy_async(['2022-12-20'])
@@ -1,39 +1,126 @@
+import argparse
+import multiprocessing
+import os
 import numpy as np
 import pandas as pd
 from pathlib import Path
-def formatter(file, curr_dict_date):
+from currencyConverter import RateTable
+from dateParser import parse_column
+from vacancyTable import DictionaryEncoder
+from vacancyCache import ColumnFile
+
+
+def normalize_salary(vacancies, rate_table):
+    """
+    Приводит зарплаты части вакансий к рублям векторными операциями: среднее значение вилки считается один раз,
+    курс для каждой вакансии берется одной выборкой из таблицы курсов по индексам месяца и валюты.
+    :param vacancies: Часть вакансий (pandas.DataFrame)
+    :param rate_table: Таблица курсов валют по месяцам (RateTable)
+    :return:
+        pandas.DataFrame: Вакансии со столбцами name, salary, area_name, published_at
+    """
+    salary_from = vacancies['salary_from'].fillna(0).to_numpy(dtype=np.float64)
+    salary_to = vacancies['salary_to'].fillna(0).to_numpy(dtype=np.float64)
+    salary_sum = salary_from + salary_to
+    salary_not_rur = np.where((salary_from == 0) | (salary_to == 0), salary_sum, salary_sum / 2)
+    currency_codes, currencies = pd.factorize(vacancies['salary_currency'])
+    rate_codes = np.append(rate_table.get_codes(list(currencies)), -1)
+    currency_codes = rate_codes[currency_codes]
+    years, months, _ = parse_column(vacancies['published_at'].astype(str).tolist())
+    rates = rate_table.get_rates(currency_codes, years, months)
+    salary = np.where(currency_codes == rate_table.codes['RUR'], salary_not_rur, np.round(salary_not_rur * rates))
+    new_vacancies = vacancies[['name', 'area_name', 'published_at']].fillna(0)
+    new_vacancies.insert(1, 'salary', salary)
+    return new_vacancies
+
+
+def write_columns(chunks, output_file):
+    """
+    Записывает нормализованные вакансии в колоночный бинарный файл (ColumnFile): названия и регионы -
+    кодами словаря, зарплата, годы и месяцы публикации - типизированными массивами. Строки published_at
+    не сохраняются: VacancyTable.from_converted использует только годы и месяцы.
+    Такой файл читается методом VacancyTable.from_converted без разбора текста.
+    :param chunks: Части нормализованных вакансий (iterable)
+    :param output_file: Папка колоночного файла (Path)
+    """
+    names, areas = DictionaryEncoder(), DictionaryEncoder()
+    parts = {'name_codes': [np.array([], dtype=np.int32)], 'salary': [np.array([], dtype=np.float64)],
+             'area_codes': [np.array([], dtype=np.int32)], 'years': [np.array([], dtype=np.int16)],
+             'months': [np.array([], dtype=np.int8)]}
+    for vacancies in chunks:
+        for column, encoder, key in (('name', names, 'name_codes'), ('area_name', areas, 'area_codes')):
+            codes, uniques = pd.factorize(vacancies[column].astype(str))
+            parts[key].append(np.array([encoder.encode(value) for value in uniques], dtype=np.int32)[codes])
+        years, months, _ = parse_column(vacancies['published_at'].astype(str).tolist())
+        parts['salary'].append(vacancies['salary'].to_numpy(dtype=np.float64))
+        parts['years'].append(years)
+        parts['months'].append(months)
+    columns = {key: np.concatenate(values) for key, values in parts.items()}
+    columns.update(names=names.values, areas=areas.values)
+    if not ColumnFile(output_file).save(columns):
+        raise OSError(f'Не удалось записать колоночный файл: {output_file}')
+
+
+def formatter(file, curr_dict_date, chunk_size=100000, output_format='csv'):
     """
     Форматирует зарплату вакансии: приводит ее к рублям и к среднему значению; создает датафреймы.
+    Файл читается и записывается частями по chunk_size строк, поэтому не загружается в память целиком.
     :param file: Файл, из которого берутся вакансии
     :param curr_dict_date: Файл, в котором собраны курсы валют за определенный промежуток времени
+    :param chunk_size: Количество строк в одной части
+    :param output_format: Формат результата: 'csv' - файл {имя}.csv, 'columns' - колоночный файл {имя}.columns
+    """
+    rate_table = RateTable.from_csv(curr_dict_date)
+    if output_format == 'columns':
+        chunks = (normalize_salary(vacancies, rate_table) for vacancies in pd.read_csv(file, chunksize=chunk_size))
+        write_columns(chunks, Path(f'{Path(file).stem}.columns'))
+        return
+    output_file = Path(f'{Path(file).stem}.csv')
+    temp_file = output_file.with_name(f'{output_file.name}.tmp{os.getpid()}')
+    header = True
+    try:
+        for vacancies in pd.read_csv(file, chunksize=chunk_size):
+            normalize_salary(vacancies, rate_table).to_csv(temp_file, index=False, header=header,
+                                                           mode='w' if header else 'a')
+            header = False
+        if header:
+            pd.DataFrame(columns=['name', 'salary', 'area_name', 'published_at']).to_csv(temp_file, index=False)
+        os.replace(temp_file, output_file)
+    finally:
+        if temp_file.exists():
+            temp_file.unlink()
+
+def get_news_files(processes=None, output_format='csv'):
     """
-    vacancies = pd.read_csv(file)
-    val_curs = pd.read_csv(curr_dict_date)
-    vacancies = vacancies.fillna(0)
-    val_curs = val_curs.fillna(0)
-    currencies = val_curs.columns.values[1:]
-    vacancies.loc[((vacancies['salary_from'].astype(float) == 0) | (vacancies['salary_to'].astype(float) == 0)), 'salary_not_rur'] = \
-        vacancies['salary_from'].astype(float) + vacancies['salary_to'].astype(float)
-    vacancies.loc[((vacancies['salary_from'].astype(float) != 0) & (vacancies['salary_to'].astype(float) != 0)), 'salary_not_rur'] = \
-        (vacancies['salary_from'].astype(float) + vacancies['salary_to'].astype(float)) / 2
-    vacancies['date'] = vacancies['published_at'].str[:7]
-    vacancies = pd.merge(vacancies, val_curs, how='left', on='date')
-    vacancies['salary'] = np.nan
-    vacancies.loc[vacancies['salary_currency'] == 'RUR', 'salary'] = vacancies['salary_not_rur']
-    for curr in list(currencies):
-        vacancies.loc[vacancies['salary_currency'] == curr, 'salary'] = round(vacancies[curr] * vacancies['salary_not_rur'])
-        vacancies.loc[vacancies[curr] == 0, 'salary'] = np.nan
-    vacancies['salary'] = vacancies['salary'].astype(float)
-    new_vacancies = vacancies[['name', 'salary', 'area_name', 'published_at']]
-    new_vacancies.to_csv(f'{Path(file).stem}.csv', index=False)
-
-def get_news_files():
-    """
-    Запускает форматирование вакансий из файлов, лежащих в определенной папке.
+    Запускает форматирование вакансий из файлов, лежащих в определенной папке; файлы обрабатываются параллельно.
+    :param processes: Количество процессов (по умолчанию - количество ядер)
+    :param output_format: Формат результата: 'csv' или 'columns'
     """
     curr_dict_date = input('Файл с валютами: ')
-    for f in Path(input('Введите название папки: ')).glob('*.csv'):
-        formatter(f, curr_dict_date)
+    files = [(f, curr_dict_date, 100000, output_format) for f in Path(input('Введите название папки: ')).glob('*.csv')]
+    with multiprocessing.Pool(processes=processes) as p:
+        p.starmap(formatter, files)
+
+def get_arguments(argv=None):
+    """
+    Разбирает параметры командной строки.
+    :param argv: Параметры командной строки (по умолчанию - sys.argv[1:]) (list)
+    :return:
+        argparse.Namespace: Параметры: output_format - формат результата, processes - количество процессов
+    >>> get_arguments(['--output-format', 'columns']).output_format
+    'columns'
+    >>> get_arguments([]).output_format, get_arguments([]).processes
+    ('csv', None)
+    """
+    parser = argparse.ArgumentParser(description='Перевод зарплат вакансий в рубли по курсам ЦБ РФ')
+    parser.add_argument('--output-format', choices=('csv', 'columns'), default='csv',
+                        help='формат результата: csv - файл {имя}.csv, columns - колоночный файл {имя}.columns, '
+                             'который читают 322.py и VacancyTable.from_converted')
+    parser.add_argument('--processes', type=int, default=None,
+                        help='количество процессов (по умолчанию - количество ядер)')
+    return parser.parse_args(argv)
+
 
 if __name__ == '__main__':
-    get_news_files()
+    arguments = get_arguments()
+    get_news_files(arguments.processes, arguments.output_format)
@@ -0,0 +1,100 @@
+import csv
+import gzip
+import io
+import os
+import queue
+import threading
+
+
+class BatchCSVWriter:
+    """
+    Класс для записи строк CSV в отдельном потоке: строки передаются через очередь,
+    накапливаются в памяти и записываются в файл большими блоками.
+    Файл открывается один раз; запись не задерживает получение данных из сети.
+    Используется как контекстный менеджер.
+    Attributes:
+        file_name (str): Имя CSV файла (дописывается в конец)
+        header (list): Заголовок, который записывается, если файл новый или пустой
+        batch_size (int): Количество строк, после накопления которого блок записывается в файл
+        compress (bool): Записывать ли файл в формате gzip
+        queue (queue.Queue): Очередь списков строк
+    """
+    def __init__(self, file_name, header=None, batch_size=10000, compress=False, queue_size=256):
+        """
+        Инициализирует объект BatchCSVWriter.
+        Args:
+            file_name (str): Имя CSV файла (дописывается в конец)
+            header (list): Заголовок, который записывается, если файл новый или пустой
+            batch_size (int): Количество строк, после накопления которого блок записывается в файл
+            compress (bool): Записывать ли файл в формате gzip (каждый запуск добавляет новый блок gzip)
+            queue_size (int): Наибольшее количество списков строк в очереди
+        """
+        self.file_name = file_name
+        self.header = header
+        self.batch_size = batch_size
+        self.compress = compress
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.file = None
+        self.thread = None
+        self.error = None
+
+    def __enter__(self):
+        """Открывает файл, записывает заголовок и запускает поток записи."""
+        is_new = not os.path.exists(self.file_name) or os.path.getsize(self.file_name) == 0
+        if self.compress:
+            self.file = gzip.open(self.file_name, mode='at', encoding='utf-8', newline='')
+        else:
+            self.file = open(self.file_name, mode='a', encoding='utf-8-sig', newline='', buffering=1 << 20)
+        if is_new and self.header is not None:
+            self.file.write(BatchCSVWriter.format_rows([self.header]))
+        self.thread = threading.Thread(target=self.write_loop, daemon=True)
+        self.thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """Дожидается записи всех строк из очереди и закрывает файл."""
+        self.queue.put(None)
+        self.thread.join()
+        self.file.close()
+        if self.error is not None and exc_type is None:
+            raise self.error
+
+    @staticmethod
+    def format_rows(rows):
+        """
+        Форматирует строки CSV в одну строку для записи в файл.
+        :param rows: Список строк CSV (list)
+        :return:
+            str: Отформатированные строки
+        >>> BatchCSVWriter.format_rows([['Программист', 100, ''], ['a,b', None, 'RUR']])
+        'Программист,100,\\r"a,b",,RUR\\r'
+        """
+        buffer = io.StringIO()
+        csv.writer(buffer, delimiter=',', lineterminator="\r").writerows(rows)
+        return buffer.getvalue()
+
+    def writerows(self, rows):
+        """
+        Передает строки в очередь записи. Если очередь заполнена, ожидает ее освобождения.
+        :param rows: Список строк CSV (list)
+        """
+        if self.error is not None:
+            raise self.error
+        self.queue.put(rows)
+
+    def write_loop(self):
+        """Забирает строки из очереди и записывает их в файл блоками по batch_size строк."""
+        batch = []
+        while True:
+            rows = self.queue.get()
+            if rows is not None:
+                batch.extend(rows)
+            if batch and (rows is None or len(batch) >= self.batch_size):
+                try:
+                    if self.error is None:
+                        self.file.write(BatchCSVWriter.format_rows(batch))
+                except OSError as error:
+                    self.error = error
+                batch = []
+            if rows is None:
+                return
@@ -0,0 +1,168 @@
+import io
+import os
+import threading
+import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+import requests
+
+
+class CBRRateFetcher:
+    """
+    Класс для получения курсов валют ЦБ РФ на первое число каждого месяца.
+    Ответы cbr.ru сохраняются на диск по одному файлу на дату и повторно не скачиваются;
+    недостающие месяцы скачиваются одновременно, у каждого потока своя сессия (requests.Session
+    не потокобезопасна). На диск попадают только ответы, которые разбираются как XML с курсами.
+    XML разбирается потоково, из него берутся только нужные валюты.
+    Attributes:
+        currencies (set): Коды валют (CharCode), курсы которых нужны
+        cache_dir (Path): Папка с сохраненными ответами
+        url (str): Адрес XML_daily.asp
+        concurrency (int): Количество одновременных запросов
+        retries (int): Количество повторов запроса при ошибке соединения, тайм-ауте, ошибке сервера (5xx)
+            или некорректном ответе
+    """
+    def __init__(self, currencies, cache_dir='currencyRate.cache', url='http://www.cbr.ru/scripts/XML_daily.asp',
+                 concurrency=8, retries=3):
+        """
+        Инициализирует объект CBRRateFetcher.
+        Args:
+            currencies (list): Коды валют (CharCode), курсы которых нужны
+            cache_dir (str or Path): Папка с сохраненными ответами
+            url (str): Адрес XML_daily.asp (для проверки можно указать локальный сервер)
+            concurrency (int): Количество одновременных запросов
+            retries (int): Количество повторов запроса при ошибке соединения, тайм-ауте, ошибке сервера (5xx)
+                или некорректном ответе
+        """
+        self.currencies = set(currencies)
+        self.cache_dir = Path(cache_dir)
+        self.url = url
+        self.concurrency = concurrency
+        self.retries = retries
+
+    @staticmethod
+    def get_months(date_min, date_max):
+        """
+        Возвращает все месяцы от date_min до date_max включительно.
+        :param date_min: Первый месяц в формате 'ГГГГ-ММ' (str)
+        :param date_max: Последний месяц в формате 'ГГГГ-ММ' (str)
+        :return:
+            list: Месяцы в формате 'ГГГГ-ММ'
+        >>> CBRRateFetcher.get_months('2003-11', '2004-02')
+        ['2003-11', '2003-12', '2004-01', '2004-02']
+        """
+        first = int(date_min[:4]) * 12 + int(date_min[5:7]) - 1
+        last = int(date_max[:4]) * 12 + int(date_max[5:7]) - 1
+        return [f'{month // 12}-{month % 12 + 1:02}' for month in range(first, last + 1)]
+
+    @staticmethod
+    def parse_rates(xml_data, currencies):
+        """
+        Потоково разбирает ответ XML_daily.asp и вычисляет курсы нужных валют к рублю за одну единицу.
+        :param xml_data: Ответ cbr.ru (bytes)
+        :param currencies: Коды валют (set)
+        :return:
+            dict: Словарь: ключ - код валюты, значение - курс (в порядке следования в ответе)
+        >>> CBRRateFetcher.parse_rates(b'<ValCurs><Valute><CharCode>KZT</CharCode><Nominal>100</Nominal>'
+        ...                            b'<Value>13,1234</Value></Valute><Valute><CharCode>USD</CharCode>'
+        ...                            b'<Nominal>1</Nominal><Value>60,6600</Value></Valute></ValCurs>', {'KZT', 'USD'})
+        {'KZT': 0.131234, 'USD': 60.66}
+        """
+        rates = {}
+        for _, element in ET.iterparse(io.BytesIO(xml_data)):
+            if element.tag == 'Valute':
+                char_code = element.findtext('CharCode')
+                if char_code in currencies:
+                    rates[char_code] = round(float(element.findtext('Value').replace(',', '.')) /
+                                             float(element.findtext('Nominal').replace(',', '.')), 7)
+                element.clear()
+        return rates
+
+    @staticmethod
+    def is_valid_response(xml_data):
+        """
+        Проверяет, что ответ cbr.ru - разбираемый XML с курсами валют (корневой элемент ValCurs).
+        Страница с ошибкой или оборванный ответ с кодом 200 не должны попасть в сохраненные ответы.
+        :param xml_data: Ответ cbr.ru (bytes)
+        :return:
+            bool: Ответ корректен
+        >>> CBRRateFetcher.is_valid_response(b'<ValCurs Date="01.02.2004"><Valute></Valute></ValCurs>')
+        True
+        >>> CBRRateFetcher.is_valid_response(b'<ValCurs Date="01.02.2004"><Valute>')
+        False
+        >>> CBRRateFetcher.is_valid_response(b'<html><body>Service Unavailable</body></html>')
+        False
+        """
+        try:
+            return ET.fromstring(xml_data).tag == 'ValCurs'
+        except ET.ParseError:
+            return False
+
+    def get_cache_file(self, month):
+        """
+        Возвращает путь к сохраненному ответу за месяц.
+        :param month: Месяц в формате 'ГГГГ-ММ' (str)
+        :return:
+            Path: Путь к файлу
+        """
+        return self.cache_dir / f'{month}.xml'
+
+    def download(self, session, month):
+        """
+        Скачивает ответ cbr.ru на первое число месяца и сохраняет его на диск.
+        Ошибки соединения, тайм-ауты, ошибки сервера (5xx) и некорректные ответы повторяются
+        до retries раз; ошибки клиента (4xx) не повторяются.
+        :param session: Сессия HTTP текущего потока (requests.Session)
+        :param month: Месяц в формате 'ГГГГ-ММ' (str)
+        :return:
+            bytes: Ответ cbr.ru
+        """
+        for attempt in range(self.retries + 1):
+            try:
+                response = session.get(self.url, params={'date_req': f'01/{month[5:7]}/{month[:4]}'}, timeout=30)
+            except (requests.ConnectionError, requests.Timeout):
+                if attempt == self.retries:
+                    raise
+                continue
+            if response.status_code < 500:
+                response.raise_for_status()
+                if CBRRateFetcher.is_valid_response(response.content):
+                    break
+        else:
+            response.raise_for_status()
+            raise ValueError(f'Ответ cbr.ru за {month} не является XML с курсами валют')
+        cache_file = self.get_cache_file(month)
+        temp_file = cache_file.with_name(f'{cache_file.name}.tmp{os.getpid()}')
+        temp_file.write_bytes(response.content)
+        os.replace(temp_file, cache_file)
+        return response.content
+
+    def get_rates(self, months):
+        """
+        Возвращает курсы нужных валют на первое число каждого месяца.
+        :param months: Месяцы в формате 'ГГГГ-ММ' (list)
+        :return:
+            list: Список словарей: date - месяц, остальные ключи - коды валют, значения - курсы
+        """
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        responses = {month: self.get_cache_file(month).read_bytes() for month in months
+                     if self.get_cache_file(month).exists()}
+        missing = [month for month in months if month not in responses]
+        if missing:
+            local = threading.local()
+            sessions = []
+
+            def download(month):
+                if not hasattr(local, 'session'):
+                    local.session = requests.Session()
+                    sessions.append(local.session)
+                return self.download(local.session, month)
+
+            try:
+                with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+                    responses.update(zip(missing, executor.map(download, missing)))
+            finally:
+                for session in sessions:
+                    session.close()
+        return [dict({'date': month}, **CBRRateFetcher.parse_rates(responses[month], self.currencies))
+                for month in months]
@@ -0,0 +1,165 @@
+import csv
+import io
+import multiprocessing
+import os
+
+
+class ChunkedReader:
+    """
+    Класс для параллельной обработки одного большого CSV файла по частям.
+    Файл делится на диапазоны байтов, границы которых совпадают с концами записей
+    (переводы строк внутри полей в кавычках, например в key_skills и description, не считаются концом записи).
+    Конец записи определяется по заголовку: '\\n' или '\\r\\n', либо '\\r' (так пишет части 321.py).
+    Каждая часть обрабатывается в отдельном процессе, частичные результаты объединяются методом merge.
+    Attributes:
+        file_name (str): Название CSV файла
+        processes (int): Количество процессов
+        header (list): Заголовок CSV файла
+        terminator (bytes): Последний байт конца записи: b'\\n' или b'\\r'
+        borders (list): Список пар (начало, конец) диапазонов байтов частей
+    """
+    block_size = 1 << 20
+
+    def __init__(self, file_name, processes=None, chunk_size=64 << 20):
+        """
+        Инициализирует объект ChunkedReader и вычисляет границы частей.
+        Args:
+            file_name (str): Название CSV файла
+            processes (int): Количество процессов (по умолчанию - количество ядер)
+            chunk_size (int): Наибольший размер части в байтах
+        """
+        self.file_name = file_name
+        self.processes = processes or os.cpu_count()
+        self.terminator = ChunkedReader.detect_terminator(file_name)
+        self.header, header_end = ChunkedReader.read_header(file_name, self.terminator)
+        size = os.path.getsize(file_name)
+        chunks = max(self.processes, -(-(size - header_end) // chunk_size), 1)
+        targets = [header_end + (size - header_end) * i // chunks for i in range(1, chunks)]
+        offsets = [header_end] + ChunkedReader.find_record_borders(file_name, targets, self.terminator) + [size]
+        offsets = sorted(set(offsets))
+        self.borders = list(zip(offsets[:-1], offsets[1:]))
+
+    @staticmethod
+    def detect_terminator(file_name):
+        """
+        Определяет конец записи по первому переводу строки вне кавычек в начале файла.
+        :param file_name: Название CSV файла (str)
+        :return:
+            bytes: b'\\r', если записи заканчиваются одним '\\r'; иначе b'\\n' (в том числе для '\\r\\n')
+        >>> import tempfile
+        >>> with tempfile.NamedTemporaryFile(suffix='.csv', delete=False) as file:
+        ...     _ = file.write(b'name,area\\ra,"x\\ny"\\r')
+        >>> ChunkedReader.detect_terminator(file.name)
+        b'\\r'
+        >>> os.remove(file.name)
+        """
+        with open(file_name, mode='rb') as file:
+            block = file.read(ChunkedReader.block_size)
+        in_quotes = False
+        for i, byte in enumerate(block):
+            if byte == ord('"'):
+                in_quotes = not in_quotes
+            elif not in_quotes and byte in b'\r\n':
+                return b'\r' if byte == ord('\r') and block[i + 1:i + 2] != b'\n' else b'\n'
+        return b'\n'
+
+    @staticmethod
+    def read_header(file_name, terminator=b'\n'):
+        """
+        Читает заголовок CSV файла.
+        :param file_name: Название CSV файла (str)
+        :param terminator: Последний байт конца записи (bytes)
+        :return:
+            tuple: Заголовок (list) и смещение в байтах начала первой записи после заголовка (int)
+        """
+        header_end = ChunkedReader.find_record_borders(file_name, [0], terminator)
+        header_end = header_end[0] if header_end else os.path.getsize(file_name)
+        with open(file_name, mode='rb') as file:
+            text = file.read(header_end).decode('utf-8-sig')
+        header = next(csv.reader(io.StringIO(text, newline='')), None)
+        if header is None:
+            print('Пустой файл')
+            exit()
+        return header, header_end
+
+    @staticmethod
+    def find_record_borders(file_name, targets, terminator=b'\n'):
+        """
+        Находит для каждого смещения первый конец записи не раньше этого смещения.
+        Конец записи - байт terminator, перед которым в файле четное количество кавычек.
+        :param file_name: Название CSV файла (str)
+        :param targets: Возрастающий список смещений в байтах (list)
+        :param terminator: Последний байт конца записи: b'\\n' (для '\\n' и '\\r\\n') или b'\\r' (bytes)
+        :return:
+            list: Смещения начала записей, следующих за найденными концами записей
+        >>> import tempfile
+        >>> with tempfile.NamedTemporaryFile(suffix='.csv', delete=False) as file:
+        ...     _ = file.write(b'name,area\\ra,"x\\ry"\\rb,z\\r')
+        >>> ChunkedReader.find_record_borders(file.name, [0, 12], b'\\r')
+        [10, 18]
+        >>> os.remove(file.name)
+        """
+        borders = []
+        targets = list(targets)
+        position = 0
+        in_quotes = False
+        with open(file_name, mode='rb') as file:
+            while targets:
+                block = file.read(ChunkedReader.block_size)
+                if not block:
+                    break
+                block_end = position + len(block)
+                counted = 0
+                while targets and targets[0] < block_end:
+                    index = block.find(terminator, max(targets[0] - position, counted))
+                    while index != -1:
+                        in_quotes ^= block.count(b'"', counted, index) % 2 == 1
+                        counted = index
+                        if not in_quotes:
+                            break
+                        index = block.find(terminator, index + 1)
+                    if index == -1:
+                        break
+                    borders.append(position + index + 1)
+                    while targets and targets[0] <= position + index:
+                        targets.pop(0)
+                in_quotes ^= block.count(b'"', counted) % 2 == 1
+                position = block_end
+        return borders
+
+    @staticmethod
+    def read_chunk(file_name, start, end):
+        """
+        Читает записи CSV файла из диапазона байтов [start, end).
+        :param file_name: Название CSV файла (str)
+        :param start: Начало диапазона (int)
+        :param end: Конец диапазона (int)
+        :return:
+            iterator: Итератор по строкам CSV файла
+        """
+        with open(file_name, mode='rb') as file:
+            file.seek(start)
+            text = file.read(end - start).decode('utf-8')
+        return csv.reader(io.StringIO(text, newline=''))
+
+    def map_reduce(self, function, *args):
+        """
+        Применяет функцию к каждой части файла в пуле процессов и объединяет частичные результаты.
+        :param function: Функция верхнего уровня модуля, вызываемая как
+            function(file_name, start, end, header, *args) и возвращающая объект с методом merge
+        :param args: Дополнительные аргументы функции
+        :return:
+            Объединенный результат (в порядке частей файла) или None, если в файле нет записей
+        """
+        tasks = [(self.file_name, start, end, self.header) + args for start, end in self.borders]
+        if len(tasks) <= 1 or self.processes == 1:
+            partials = [function(*task) for task in tasks]
+        else:
+            with multiprocessing.Pool(processes=self.processes) as p:
+                partials = p.starmap(function, tasks)
+        if not partials:
+            return None
+        result = partials[0]
+        for partial in partials[1:]:
+            result.merge(partial)
+        return result
@@ -0,0 +1,191 @@
+import csv
+import hashlib
+import numpy as np
+
+
+class CurrencyConverter:
+    """
+    Класс для пакетного перевода зарплат в рубли.
+    Идентификаторы валют один раз переводятся в индексы таблицы курсов,
+    после чего целые столбцы зарплат переводятся одной векторной операцией.
+    Attributes:
+        currencies (list): Идентификаторы валют в порядке индексов
+        codes (dict): Словарь: ключ - идентификатор валюты, значение - индекс в таблице курсов
+        rates (numpy.ndarray): Курсы валют к рублю по индексам
+    """
+    def __init__(self, currency_to_rub):
+        """
+        Инициализирует объект CurrencyConverter.
+        Args:
+            currency_to_rub (dict): Словарь: ключ - идентификатор валюты, значение - курс к рублю
+        """
+        self.currencies = list(currency_to_rub.keys())
+        self.codes = {currency: code for code, currency in enumerate(self.currencies)}
+        self.rates = np.array([currency_to_rub[currency] for currency in self.currencies], dtype=np.float64)
+
+    def get_codes(self, currencies):
+        """
+        Переводит идентификаторы валют в индексы таблицы курсов.
+        :param currencies: Идентификаторы валют (list)
+        :return:
+            numpy.ndarray: Индексы валют в таблице курсов
+        >>> CurrencyConverter({'RUR': 1, 'USD': 60.66}).get_codes(['USD', 'RUR', 'USD'])
+        array([1, 0, 1])
+        """
+        return np.array([self.codes[currency] for currency in currencies], dtype=np.intp)
+
+    def convert(self, currency_codes, salary_from, salary_to, years=None, months=None):
+        """
+        Вычисляет средние зарплаты из вилок и переводит их в рубли по постоянному курсу.
+        :param currency_codes: Индексы валют в таблице курсов (numpy.ndarray)
+        :param salary_from: Нижние границы вилки оклада (numpy.ndarray)
+        :param salary_to: Верхние границы вилки оклада (numpy.ndarray)
+        :param years: Годы публикации вакансий; не используются, так как курс не зависит от даты (numpy.ndarray)
+        :param months: Месяцы публикации вакансий; не используются (numpy.ndarray)
+        :return:
+            numpy.ndarray: Средние зарплаты в рублях
+        >>> converter = CurrencyConverter({'RUR': 1, 'USD': 60.66})
+        >>> converter.convert(converter.get_codes(['USD', 'RUR']), np.array([100., 1000.]), np.array([300., 2000.]))
+        array([12132.,  1500.])
+        """
+        return (np.asarray(salary_from, dtype=np.float64) + np.asarray(salary_to, dtype=np.float64)) / 2 \
+            * self.rates[currency_codes]
+
+    def get_fingerprint(self):
+        """
+        Возвращает отпечаток курсов: хеш списка валют и таблицы курсов. По нему сохраненная статистика
+        проверяет, что зарплаты были переведены по тем же курсам.
+        :return:
+            str: Отпечаток курсов
+        >>> fingerprint = CurrencyConverter({'RUR': 1, 'USD': 60.66}).get_fingerprint()
+        >>> fingerprint == CurrencyConverter({'RUR': 1, 'USD': 60.66}).get_fingerprint()
+        True
+        >>> fingerprint == CurrencyConverter({'RUR': 1, 'USD': 61.0}).get_fingerprint()
+        False
+        """
+        digest = hashlib.sha1(repr((type(self).__name__, self.currencies, self.rates.shape)).encode('utf-8'))
+        digest.update(np.ascontiguousarray(self.rates, dtype=np.float64).tobytes())
+        return digest.hexdigest()
+
+
+class RateTable(CurrencyConverter):
+    """
+    Класс для перевода зарплат в рубли по курсу месяца публикации вакансии.
+    Курсы хранятся в плотном массиве: строка - месяц (год * 12 + номер месяца - 1), столбец - индекс валюты,
+    поэтому курс для каждой вакансии находится за O(1) одной выборкой по двум индексам.
+    Неизвестные курсы хранятся как NaN.
+    Attributes:
+        currencies (list): Идентификаторы валют в порядке индексов
+        codes (dict): Словарь: ключ - идентификатор валюты, значение - индекс в таблице курсов
+        first_month (int): Номер первого месяца таблицы
+        rates (numpy.ndarray): Двумерный массив курсов валют к рублю
+    """
+    def __init__(self, first_month, currencies, rates):
+        """
+        Инициализирует объект RateTable.
+        Args:
+            first_month (int): Номер первого месяца таблицы (год * 12 + номер месяца - 1)
+            currencies (list): Идентификаторы валют в порядке столбцов массива rates
+            rates (numpy.ndarray): Двумерный массив курсов: строка - месяц, столбец - валюта
+        """
+        self.currencies = list(currencies)
+        self.codes = {currency: code for code, currency in enumerate(self.currencies)}
+        self.first_month = first_month
+        self.rates = rates
+
+    @staticmethod
+    def get_month_number(date):
+        """
+        Возвращает номер месяца по строке даты, начинающейся с 'ГГГГ-ММ'.
+        :param date: Дата (str)
+        :return:
+            int: Номер месяца (год * 12 + номер месяца - 1)
+        >>> RateTable.get_month_number('2022-12')
+        24275
+        """
+        return int(date[:4]) * 12 + int(date[5:7]) - 1
+
+    @staticmethod
+    def from_csv(file_name):
+        """
+        Читает таблицу курсов, созданную функцией get_val_curs (331.py): столбец date ('ГГГГ-ММ')
+        и по столбцу на каждую валюту. Рубль всегда переводится с курсом 1.
+        :param file_name: Имя CSV файла с курсами валют (str)
+        :return:
+            RateTable: Таблица курсов
+        """
+        with open(file_name, newline='', encoding='utf-8-sig') as file:
+            reader = csv.reader(file)
+            header = next(reader)
+            rows = [row for row in reader if len(row) == len(header)]
+        index_date = header.index('date')
+        indexes = [i for i, currency in enumerate(header) if currency not in ('date', 'RUR')]
+        month_numbers = [RateTable.get_month_number(row[index_date]) for row in rows]
+        first_month = min(month_numbers)
+        rates = np.full((max(month_numbers) - first_month + 1, len(indexes) + 1), np.nan)
+        rates[:, len(indexes)] = 1
+        for month_number, row in zip(month_numbers, rows):
+            for code, i in enumerate(indexes):
+                if row[i] != '' and float(row[i]) != 0:
+                    rates[month_number - first_month, code] = float(row[i])
+        currencies = [header[i] for i in indexes] + ['RUR']
+        return RateTable(first_month, currencies, rates)
+
+    def get_codes(self, currencies):
+        """
+        Переводит идентификаторы валют в индексы таблицы курсов;
+        валютам, которых нет в таблице, соответствует индекс -1 (курс неизвестен).
+        :param currencies: Идентификаторы валют (list)
+        :return:
+            numpy.ndarray: Индексы валют в таблице курсов
+        """
+        return np.array([self.codes.get(currency, -1) for currency in currencies], dtype=np.intp)
+
+    def get_rates(self, currency_codes, years, months):
+        """
+        Находит курсы для каждой вакансии одной выборкой по индексам месяца и валюты.
+        Если курс неизвестен, возвращается NaN; курс рубля всегда равен 1.
+        :param currency_codes: Индексы валют в таблице курсов (numpy.ndarray)
+        :param years: Годы публикации вакансий (numpy.ndarray)
+        :param months: Месяцы публикации вакансий (numpy.ndarray)
+        :return:
+            numpy.ndarray: Курсы валют к рублю
+        >>> table = RateTable(RateTable.get_month_number('2022-01'), ['USD', 'RUR'], np.array([[70., 1.], [np.nan, 1.]]))
+        >>> table.get_rates(table.get_codes(['USD', 'USD', 'RUR', 'EUR']), [2022, 2022, 2030, 2022], [1, 2, 1, 1])
+        array([70., nan,  1., nan])
+        """
+        month_indexes = np.asarray(years, dtype=np.intp) * 12 + np.asarray(months, dtype=np.intp) - 1 \
+            - self.first_month
+        currency_codes = np.asarray(currency_codes, dtype=np.intp)
+        known = (month_indexes >= 0) & (month_indexes < len(self.rates)) & (currency_codes >= 0)
+        rates = np.full(len(currency_codes), np.nan)
+        rates[known] = self.rates[month_indexes[known], currency_codes[known]]
+        rates[currency_codes == self.codes['RUR']] = 1
+        return rates
+
+    def convert(self, currency_codes, salary_from, salary_to, years=None, months=None):
+        """
+        Вычисляет средние зарплаты из вилок и переводит их в рубли по курсу месяца публикации.
+        Если курс неизвестен, зарплата равна NaN.
+        :param currency_codes: Индексы валют в таблице курсов (numpy.ndarray)
+        :param salary_from: Нижние границы вилки оклада (numpy.ndarray)
+        :param salary_to: Верхние границы вилки оклада (numpy.ndarray)
+        :param years: Годы публикации вакансий (numpy.ndarray)
+        :param months: Месяцы публикации вакансий (numpy.ndarray)
+        :return:
+            numpy.ndarray: Средние зарплаты в рублях
+        """
+        rates = self.get_rates(currency_codes, years, months)
+        return (np.asarray(salary_from, dtype=np.float64) + np.asarray(salary_to, dtype=np.float64)) / 2 * rates
+
+    def get_fingerprint(self):
+        """
+        Возвращает отпечаток курсов с учетом первого месяца таблицы (см. CurrencyConverter.get_fingerprint).
+        :return:
+            str: Отпечаток курсов
+        >>> rates = np.array([[60.0, 1.0], [61.0, 1.0]])
+        >>> first, second = RateTable(24000, ['USD', 'RUR'], rates), RateTable(24001, ['USD', 'RUR'], rates)
+        >>> first.get_fingerprint() == second.get_fingerprint()
+        False
+        """
+        return hashlib.sha1(f'{self.first_month}:{super().get_fingerprint()}'.encode('utf-8')).hexdigest()
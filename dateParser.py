@@ -0,0 +1,114 @@
+import numpy as np
+
+
+def parse_date(published_at):
+    """
+    Извлекает год, месяц и день из даты публикации формата '%Y-%m-%dT%H:%M:%S%z'
+    без datetime.strptime: значения берутся срезами фиксированных позиций.
+    :param published_at: Дата публикации вакансии (str)
+    :return:
+        tuple: Год, месяц и день (int)
+    >>> parse_date('2022-07-05T18:19:30+0300')
+    (2022, 7, 5)
+    >>> parse_date('05.07.2022')
+    Traceback (most recent call last):
+    ...
+    ValueError: Некорректная дата публикации: '05.07.2022'
+    """
+    if len(published_at) < 10 or published_at[4] != '-' or published_at[7] != '-' \
+            or not (published_at[:4] + published_at[5:7] + published_at[8:10]).isdigit():
+        raise ValueError(f'Некорректная дата публикации: {published_at!r}')
+    month = int(published_at[5:7])
+    day = int(published_at[8:10])
+    if not 1 <= month <= 12 or not 1 <= day <= 31:
+        raise ValueError(f'Некорректная дата публикации: {published_at!r}')
+    return int(published_at[:4]), month, day
+
+
+def get_year(published_at):
+    """
+    Возвращает год публикации вакансии.
+    :param published_at: Дата публикации вакансии (str)
+    :return:
+        int: Год
+    >>> get_year('2022-07-05T18:19:30+0300')
+    2022
+    """
+    return parse_date(published_at)[0]
+
+
+def get_year_month(published_at):
+    """
+    Возвращает год и месяц публикации вакансии.
+    :param published_at: Дата публикации вакансии (str)
+    :return:
+        tuple: Год и месяц (int)
+    >>> get_year_month('2022-07-05T18:19:30+0300')
+    (2022, 7)
+    """
+    return parse_date(published_at)[:2]
+
+
+def parse_column(dates):
+    """
+    Извлекает годы, месяцы и дни из целого столбца дат публикации одной векторной операцией:
+    первые 10 символов каждой даты переводятся в байты, из которых вычитается код символа '0'.
+    :param dates: Даты публикации вакансий (list or numpy.ndarray)
+    :return:
+        tuple: Массивы годов, месяцев и дней (numpy.ndarray)
+    >>> years, months, days = parse_column(['2022-07-05T18:19:30+0300', '2007-12-31T00:00:00+0300'])
+    >>> years.tolist(), months.tolist(), days.tolist()
+    ([2022, 2007], [7, 12], [5, 31])
+    """
+    if len(dates) == 0:
+        empty = np.array([], dtype=np.int16)
+        return empty, empty.astype(np.int8), empty.astype(np.int8)
+    try:
+        chars = np.array(dates, dtype='S10').view(np.uint8).reshape(len(dates), 10)
+    except UnicodeEncodeError:
+        raise ValueError('Некорректная дата публикации: недопустимые символы')
+    digits = chars[:, [0, 1, 2, 3, 5, 6, 8, 9]].astype(np.int16) - ord('0')
+    years = digits[:, 0] * 1000 + digits[:, 1] * 100 + digits[:, 2] * 10 + digits[:, 3]
+    months = digits[:, 4] * 10 + digits[:, 5]
+    days = digits[:, 6] * 10 + digits[:, 7]
+    invalid = ((digits < 0) | (digits > 9)).any(axis=1) | (chars[:, [4, 7]] != ord('-')).any(axis=1) \
+        | (months < 1) | (months > 12) | (days < 1) | (days > 31)
+    if invalid.any():
+        raise ValueError(f'Некорректная дата публикации: {dates[int(np.flatnonzero(invalid)[0])]!r}')
+    return years, months.astype(np.int8), days.astype(np.int8)
+
+
+def parse_timestamps(dates):
+    """
+    Переводит целый столбец дат публикации формата '%Y-%m-%dT%H:%M:%S%z' в секунды от начала эпохи (UTC)
+    векторными операциями: дата разбирается функцией parse_column, время и смещение часового пояса -
+    так же, из байтов фиксированных позиций.
+    :param dates: Даты публикации вакансий (list or numpy.ndarray)
+    :return:
+        numpy.ndarray: Метки времени (int64)
+    >>> parse_timestamps(['2022-07-05T18:19:30+0300', '1970-01-01T00:00:00-0130']).tolist()
+    [1657034370, 5400]
+    >>> parse_timestamps(['2022-07-05'])
+    Traceback (most recent call last):
+    ...
+    ValueError: Некорректная дата публикации: '2022-07-05'
+    """
+    years, months, days = parse_column(dates)
+    if len(dates) == 0:
+        return np.array([], dtype=np.int64)
+    try:
+        chars = np.array(dates, dtype='S24').view(np.uint8).reshape(len(dates), 24)
+    except UnicodeEncodeError:
+        raise ValueError('Некорректная дата публикации: недопустимые символы')
+    digits = chars[:, [11, 12, 14, 15, 17, 18, 20, 21, 22, 23]].astype(np.int64) - ord('0')
+    invalid = ((digits < 0) | (digits > 9)).any(axis=1) | (chars[:, 10] != ord('T')) \
+        | (chars[:, [13, 16]] != ord(':')).any(axis=1) | ((chars[:, 19] != ord('+')) & (chars[:, 19] != ord('-')))
+    if invalid.any():
+        raise ValueError(f'Некорректная дата публикации: {dates[int(np.flatnonzero(invalid)[0])]!r}')
+    day_numbers = ((years.astype(np.int64) - 1970) * 12 + months - 1).astype('datetime64[M]') \
+        .astype('datetime64[D]').astype(np.int64) + days - 1
+    seconds = (digits[:, 0] * 10 + digits[:, 1]) * 3600 + (digits[:, 2] * 10 + digits[:, 3]) * 60 \
+        + digits[:, 4] * 10 + digits[:, 5]
+    offsets = ((digits[:, 6] * 10 + digits[:, 7]) * 3600 + (digits[:, 8] * 10 + digits[:, 9]) * 60) \
+        * np.where(chars[:, 19] == ord('-'), -1, 1)
+    return day_numbers * 86400 + seconds - offsets
@@ -0,0 +1,191 @@
+import asyncio
+import random
+import time
+from datetime import datetime, timedelta
+import aiohttp
+
+
+class TokenBucket:
+    """
+    Класс для ограничения частоты запросов алгоритмом маркерной корзины.
+    Attributes:
+        rate (float): Количество запросов в секунду
+        capacity (float): Наибольшее количество запросов, которые можно выполнить подряд без ожидания
+        tokens (float): Текущее количество маркеров
+        updated_at (float): Время последнего пополнения корзины
+    """
+    def __init__(self, rate, capacity=1):
+        """
+        Инициализирует объект TokenBucket.
+        Args:
+            rate (float): Количество запросов в секунду
+            capacity (float): Наибольшее количество запросов, которые можно выполнить подряд без ожидания
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated_at = time.monotonic()
+        self.lock = asyncio.Lock()
+
+    async def acquire(self):
+        """Ожидает, пока в корзине появится маркер, и забирает его."""
+        async with self.lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+                self.updated_at = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class HHHarvester:
+    """
+    Класс для асинхронной выгрузки вакансий с api.hh.ru.
+    Все запросы идут через одну сессию с пулом соединений; частота запросов ограничивается TokenBucket,
+    количество одновременных запросов - семафором. Ошибки 429 и 5xx, а также сетевые ошибки повторяются
+    с экспоненциальной задержкой. API отдает не больше 2000 вакансий на запрос, поэтому промежуток
+    времени, в котором найдено больше, делится пополам, пока не станет меньше min_window.
+    Attributes:
+        url (str): Адрес API вакансий
+        params (dict): Постоянные параметры запроса
+        rate (float): Количество запросов в секунду
+        concurrency (int): Наибольшее количество одновременных запросов
+        retries (int): Количество повторов запроса при ошибке
+        backoff (float): Начальная задержка перед повтором в секундах
+        min_window (timedelta): Наименьший промежуток времени, который еще делится пополам
+    """
+    per_page = 100
+    max_results = 2000
+    retry_statuses = {429, 500, 502, 503, 504}
+
+    def __init__(self, url='https://api.hh.ru/vacancies', params=None, rate=4, concurrency=8, retries=5,
+                 backoff=0.5, min_window=timedelta(minutes=1)):
+        """
+        Инициализирует объект HHHarvester.
+        Args:
+            url (str): Адрес API вакансий (для проверки можно указать локальный сервер)
+            params (dict): Постоянные параметры запроса (по умолчанию - IT-вакансии: specialization=1)
+            rate (float): Количество запросов в секунду
+            concurrency (int): Наибольшее количество одновременных запросов
+            retries (int): Количество повторов запроса при ошибке
+            backoff (float): Начальная задержка перед повтором в секундах
+            min_window (timedelta): Наименьший промежуток времени, который еще делится пополам
+        """
+        self.url = url
+        self.params = {'specialization': 1} if params is None else dict(params)
+        self.rate = rate
+        self.concurrency = concurrency
+        self.retries = retries
+        self.backoff = backoff
+        self.min_window = min_window
+
+    @staticmethod
+    def format_time(moment):
+        """
+        Приводит время к формату параметров date_from и date_to (московское время).
+        :param moment: Время (datetime)
+        :return:
+            str: Время в формате '%Y-%m-%dT%H:%M:%S+0300'
+        >>> HHHarvester.format_time(datetime(2022, 12, 20, 9, 30))
+        '2022-12-20T09:30:00+0300'
+        """
+        return moment.strftime('%Y-%m-%dT%H:%M:%S+0300')
+
+    @staticmethod
+    def get_row(vacancy):
+        """
+        Возвращает поля вакансии для записи в CSV файл.
+        :param vacancy: Вакансия из ответа API (dict)
+        :return:
+            list: Название, вилка оклада, валюта, регион и дата публикации
+        >>> HHHarvester.get_row({'name': 'Программист', 'salary': None, 'area': {'name': 'Москва'},
+        ...                      'published_at': '2022-12-20T09:30:00+0300'})
+        ['Программист', '', '', '', 'Москва', '2022-12-20T09:30:00+0300']
+        """
+        salary = vacancy['salary']
+        if salary is None:
+            return [vacancy['name'], '', '', '', vacancy['area']['name'], vacancy['published_at']]
+        return [vacancy['name'], salary['from'], salary['to'], salary['currency'], vacancy['area']['name'],
+                vacancy['published_at']]
+
+    async def get_page(self, session, limiter, semaphore, page, date_from, date_to):
+        """
+        Получает одну страницу вакансий, повторяя запрос при временных ошибках.
+        :param session: Сессия HTTP (aiohttp.ClientSession)
+        :param limiter: Ограничитель частоты запросов (TokenBucket)
+        :param semaphore: Ограничитель количества одновременных запросов (asyncio.Semaphore)
+        :param page: Номер страницы (int)
+        :param date_from: Начало промежутка времени (datetime)
+        :param date_to: Конец промежутка времени включительно (datetime)
+        :return:
+            dict: Ответ API в формате .json
+        """
+        params = dict(self.params, page=page, per_page=HHHarvester.per_page,
+                      date_from=HHHarvester.format_time(date_from), date_to=HHHarvester.format_time(date_to))
+        for attempt in range(self.retries + 1):
+            delay = self.backoff * 2 ** attempt * (1 + random.random())
+            await limiter.acquire()
+            try:
+                async with semaphore, session.get(self.url, params=params) as response:
+                    if response.status not in HHHarvester.retry_statuses:
+                        response.raise_for_status()
+                        return await response.json()
+                    if 'Retry-After' in response.headers and response.headers['Retry-After'].isdigit():
+                        delay = max(delay, int(response.headers['Retry-After']))
+                    if attempt == self.retries:
+                        response.raise_for_status()
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+                if attempt == self.retries:
+                    raise
+            await asyncio.sleep(delay)
+
+    async def harvest_window(self, session, limiter, semaphore, date_from, date_to, add_rows):
+        """
+        Выгружает все вакансии промежутка времени; если их больше, чем отдает API, делит промежуток пополам.
+        :param session: Сессия HTTP (aiohttp.ClientSession)
+        :param limiter: Ограничитель частоты запросов (TokenBucket)
+        :param semaphore: Ограничитель количества одновременных запросов (asyncio.Semaphore)
+        :param date_from: Начало промежутка времени (datetime)
+        :param date_to: Конец промежутка времени включительно (datetime)
+        :param add_rows: Функция, принимающая список строк CSV одной страницы (callable)
+        """
+        first_page = await self.get_page(session, limiter, semaphore, 0, date_from, date_to)
+        if first_page['found'] > HHHarvester.max_results and date_to - date_from >= self.min_window:
+            middle = date_from + (date_to - date_from) // 2
+            middle = middle.replace(microsecond=0)
+            await asyncio.gather(
+                self.harvest_window(session, limiter, semaphore, date_from, middle, add_rows),
+                self.harvest_window(session, limiter, semaphore, middle + timedelta(seconds=1), date_to, add_rows))
+            return
+        add_rows([HHHarvester.get_row(vacancy) for vacancy in first_page['items']])
+        pages = min(first_page['pages'], HHHarvester.max_results // HHHarvester.per_page)
+        for page in asyncio.as_completed([self.get_page(session, limiter, semaphore, page, date_from, date_to)
+                                          for page in range(1, pages)]):
+            add_rows([HHHarvester.get_row(vacancy) for vacancy in (await page)['items']])
+
+    async def harvest(self, dates, add_rows):
+        """
+        Выгружает вакансии за несколько дней; дни и их промежутки обрабатываются одновременно.
+        :param dates: Даты в формате 'ГГГГ-ММ-ДД' (list)
+        :param add_rows: Функция, принимающая список строк CSV одной страницы (callable)
+        """
+        limiter = TokenBucket(self.rate)
+        semaphore = asyncio.Semaphore(self.concurrency)
+        connector = aiohttp.TCPConnector(limit=self.concurrency)
+        async with aiohttp.ClientSession(connector=connector, timeout=aiohttp.ClientTimeout(total=30)) as session:
+            windows = []
+            for date in dates:
+                day = datetime.strptime(date, '%Y-%m-%d')
+                windows.append(self.harvest_window(session, limiter, semaphore, day,
+                                                   day + timedelta(days=1, seconds=-1), add_rows))
+            await asyncio.gather(*windows)
+
+    def run(self, dates, add_rows):
+        """
+        Запускает выгрузку вакансий за несколько дней.
+        :param dates: Даты в формате 'ГГГГ-ММ-ДД' (list)
+        :param add_rows: Функция, принимающая список строк CSV одной страницы (callable)
+        """
+        asyncio.run(self.harvest(dates, add_rows))
@@ -0,0 +1,51 @@
+import html
+import re
+
+tag_pattern = re.compile(r'<[^>]*>')
+
+
+def delete_tags(value):
+    """
+    Отчищает строку от тегов и заменяет HTML-сущности символами за один проход по строке.
+    Незакрытая угловая скобка '<' остается в строке как обычный символ.
+    :param value: Строка (str)
+    :return:
+        str: Строка, отчищенная от тегов
+    >>> delete_tags('No tags')
+    'No tags'
+    >>> delete_tags('<p>Опыт работы &gt; 3 лет</p> <b>C&amp;C</b>')
+    'Опыт работы > 3 лет C&C'
+    >>> delete_tags('a < b')
+    'a < b'
+    """
+    if '<' in value:
+        value = tag_pattern.sub('', value)
+    if '&' in value:
+        value = html.unescape(value)
+    return value
+
+
+def has_markup(value):
+    """
+    Проверяет, может ли строка содержать теги или HTML-сущности.
+    :param value: Строка (str)
+    :return:
+        bool: True, если в строке есть '<' или '&'
+    >>> has_markup('<b>Python</b>'), has_markup('Python')
+    (True, False)
+    """
+    return '<' in value or '&' in value
+
+
+def get_markup_columns(rows, length):
+    """
+    Находит столбцы, в которых хотя бы одно значение содержит разметку.
+    Остальные столбцы можно не передавать в delete_tags: результат от этого не изменится.
+    :param rows: Строки CSV файла (list)
+    :param length: Количество столбцов (int)
+    :return:
+        list: Список флагов по столбцам: True - в столбце есть разметка
+    >>> get_markup_columns([['Python', '<p>Текст</p>'], ['Java', 'Текст']], 2)
+    [False, True]
+    """
+    return [any(has_markup(row[i]) for row in rows) for i in range(length)]
@@ -0,0 +1,161 @@
+import csv
+import hashlib
+import io
+import json
+import os
+from pathlib import Path
+from vacancyTable import VacancyTable
+from professionMatcher import ProfessionMatcher
+from statisticsAccumulator import ProfessionsStatistic
+
+
+class IncrementalStatistic:
+    """
+    Класс для инкрементального сбора статистики по CSV файлу, в конец которого дописываются вакансии
+    (например, hhVacancies.csv, пополняемый 333.py).
+    Накопители по годам, городам и профессиям хранятся рядом с файлом вместе с отметкой -
+    смещением в байтах конца последней учтенной записи - и отпечатком курсов валют. При повторном запуске
+    разбираются только записи после отметки. Они читаются частями по batch_size байт, и отметка сохраняется
+    после каждой части, поэтому в памяти находится одна часть файла, а не весь неучтенный остаток.
+    Если файл был перезаписан или укорочен или курсы валют изменились, статистика собирается заново.
+    Attributes:
+        file_name (Path): Путь к CSV файлу
+        vacancy_names (list): Названия профессий
+        converter (CurrencyConverter or RateTable): Конвертер валют
+        cleaner (callable): Функция очистки строковых значений
+        store_file_name (Path): Путь к файлу с сохраненной статистикой
+    """
+    version = 2
+    check_size = 4096
+    batch_size = 1 << 24
+
+    def __init__(self, file_name, vacancy_names, converter, cleaner=None, store_file_name=None):
+        """
+        Инициализирует объект IncrementalStatistic.
+        Args:
+            file_name (str or Path): Путь к CSV файлу
+            vacancy_names (list): Названия профессий
+            converter (CurrencyConverter or RateTable): Конвертер валют
+            cleaner (callable): Функция очистки строковых значений
+            store_file_name (str or Path): Путь к файлу статистики (по умолчанию - {имя файла}.statistic.json)
+        """
+        self.file_name = Path(file_name)
+        self.vacancy_names = list(vacancy_names)
+        self.converter = converter
+        self.cleaner = cleaner
+        self.store_file_name = Path(store_file_name) if store_file_name is not None \
+            else self.file_name.with_name(f'{self.file_name.name}.statistic.json')
+
+    @staticmethod
+    def get_checksum(file, offset):
+        """
+        Вычисляет контрольную сумму последних байтов файла перед отметкой,
+        по которой проверяется, что учтенная часть файла не изменилась.
+        :param file: Файл, открытый в двоичном режиме
+        :param offset: Отметка (int)
+        :return:
+            str: Контрольная сумма
+        """
+        start = max(offset - IncrementalStatistic.check_size, 0)
+        file.seek(start)
+        return hashlib.sha1(file.read(offset - start)).hexdigest()
+
+    @staticmethod
+    def find_records_end(data):
+        """
+        Находит конец последней полной записи: перевод строки ('\\r' или '\\n') вне кавычек.
+        :param data: Байты CSV файла, начинающиеся с начала записи (bytes)
+        :return:
+            int: Длина части data, состоящей из полных записей
+        >>> IncrementalStatistic.find_records_end(b'a,1\\rb,"x\\ry"\\rc,')
+        12
+        >>> IncrementalStatistic.find_records_end(b'a,"1\\r')
+        0
+        """
+        end = max(data.rfind(b'\r'), data.rfind(b'\n'))
+        quotes = data.count(b'"', 0, max(end, 0))
+        while end != -1 and quotes % 2 == 1:
+            previous_end = max(data.rfind(b'\r', 0, end), data.rfind(b'\n', 0, end))
+            quotes -= data.count(b'"', max(previous_end, 0), end)
+            end = previous_end
+        return end + 1
+
+    def load(self):
+        """
+        Загружает сохраненную статистику, если она собрана по тем же профессиям и курсам валют
+        и учтенная часть CSV файла не изменилась.
+        :return:
+            tuple or None: Заголовок CSV файла, отметка и статистика (ProfessionsStatistic);
+            None, если сохраненной статистики нет или она устарела
+        """
+        try:
+            with open(self.store_file_name, encoding='utf-8') as file:
+                state = json.load(file)
+            if state['version'] != IncrementalStatistic.version or state['vacancy_names'] != self.vacancy_names \
+                    or state['converter'] != self.converter.get_fingerprint():
+                return None
+            offset = state['offset']
+            if offset > os.path.getsize(self.file_name):
+                return None
+            with open(self.file_name, mode='rb') as file:
+                if IncrementalStatistic.get_checksum(file, offset) != state['checksum']:
+                    return None
+            return state['header'], offset, ProfessionsStatistic.from_state(state['statistic'])
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def save(self, header, offset, checksum, statistic):
+        """
+        Записывает статистику и отметку; файл заменяется целиком, поэтому прерванная запись
+        не приводит к чтению неполной статистики.
+        :param header: Заголовок CSV файла (list)
+        :param offset: Отметка (int)
+        :param checksum: Контрольная сумма байтов перед отметкой (str)
+        :param statistic: Статистика по профессиям (ProfessionsStatistic)
+        """
+        state = {'version': IncrementalStatistic.version, 'vacancy_names': self.vacancy_names,
+                 'converter': self.converter.get_fingerprint(), 'header': header, 'offset': offset,
+                 'checksum': checksum, 'statistic': statistic.get_state()}
+        temp_file_name = self.store_file_name.with_name(f'{self.store_file_name.name}.tmp{os.getpid()}')
+        try:
+            with open(temp_file_name, mode='w', encoding='utf-8') as file:
+                json.dump(state, file, ensure_ascii=False)
+            os.replace(temp_file_name, self.store_file_name)
+        except OSError:
+            if temp_file_name.exists():
+                temp_file_name.unlink()
+
+    def update(self):
+        """
+        Добавляет в сохраненную статистику записи, дописанные в CSV файл после отметки.
+        Записи читаются частями по batch_size байт (запись длиннее части дочитывается целиком);
+        после каждой части отметка сдвигается и статистика сохраняется.
+        Незаконченная последняя запись не учитывается до следующего запуска.
+        :return:
+            ProfessionsStatistic: Статистика по всему файлу
+        """
+        stored = self.load()
+        header, offset, statistic = stored if stored is not None \
+            else (None, 0, ProfessionsStatistic(self.vacancy_names))
+        matcher = ProfessionMatcher(self.vacancy_names)
+        with open(self.file_name, mode='rb') as file:
+            file.seek(offset)
+            data = b''
+            for block in iter(lambda: file.read(IncrementalStatistic.batch_size), b''):
+                data += block
+                records_end = IncrementalStatistic.find_records_end(data)
+                if records_end == 0:
+                    continue
+                rows = csv.reader(io.StringIO(data[:records_end].decode('utf-8-sig' if offset == 0 else 'utf-8'),
+                                              newline=''))
+                if header is None:
+                    header = next(rows)
+                vacancies_table = VacancyTable.from_rows(header, (row for row in rows if row != header),
+                                                         self.cleaner)
+                statistic.merge(vacancies_table.get_professions_statistic(
+                    matcher, vacancies_table.get_salary_in_rub(self.converter)))
+                data = data[records_end:]
+                offset += records_end
+                self.save(header, offset, IncrementalStatistic.get_checksum(file, offset), statistic)
+                file.seek(offset + len(data))
+        return statistic
@@ -0,0 +1,130 @@
+import numpy as np
+
+
+class NameIndex:
+    """
+    Класс для инвертированного индекса триграмм по названиям вакансий.
+    Для каждой триграммы хранится список кодов уникальных названий, в которых она встречается,
+    для каждого названия - список номеров строк таблицы с этим названием.
+    Поиск подстроки пересекает списки триграмм запроса и проверяет только оставшихся кандидатов.
+    Списки хранятся в плоских массивах со смещениями, поэтому индекс записывается в ColumnCache.
+    Attributes:
+        names (list): Уникальные названия вакансий (совпадают с VacancyTable.names)
+        grams (list): Триграммы в порядке первого появления
+        gram_codes (dict): Словарь: ключ - триграмма, значение - ее индекс в grams
+        gram_offsets (numpy.ndarray): Границы списков названий для каждой триграммы в gram_names
+        gram_names (numpy.ndarray): Коды названий, подряд для всех триграмм
+        row_offsets (numpy.ndarray): Границы списков строк для каждого названия в rows
+        rows (numpy.ndarray): Номера строк таблицы, сгруппированные по кодам названий
+    """
+    gram_size = 3
+
+    def __init__(self, names, grams, gram_offsets, gram_names, row_offsets, rows):
+        """
+        Инициализирует объект NameIndex.
+        Args:
+            names (list): Уникальные названия вакансий
+            grams (list): Триграммы
+            gram_offsets (numpy.ndarray): Границы списков названий для каждой триграммы
+            gram_names (numpy.ndarray): Коды названий, подряд для всех триграмм
+            row_offsets (numpy.ndarray): Границы списков строк для каждого названия
+            rows (numpy.ndarray): Номера строк таблицы, сгруппированные по кодам названий
+        """
+        self.names = names
+        self.grams = grams
+        self.gram_codes = {gram: code for code, gram in enumerate(grams)}
+        self.gram_offsets = gram_offsets
+        self.gram_names = gram_names
+        self.row_offsets = row_offsets
+        self.rows = rows
+
+    @staticmethod
+    def get_grams(value):
+        """
+        Возвращает множество триграмм строки.
+        :param value: Строка (str)
+        :return:
+            set: Множество подстрок длины gram_size
+        >>> sorted(NameIndex.get_grams('Java'))
+        ['Jav', 'ava']
+        >>> NameIndex.get_grams('Go')
+        set()
+        """
+        return {value[i:i + NameIndex.gram_size] for i in range(len(value) - NameIndex.gram_size + 1)}
+
+    @staticmethod
+    def from_table(vacancies_table):
+        """
+        Строит индекс по столбцу названий таблицы вакансий.
+        :param vacancies_table: Таблица с вакансиями (VacancyTable)
+        :return:
+            NameIndex: Индекс названий
+        """
+        names = list(vacancies_table.names)
+        postings = {}
+        for code, name in enumerate(names):
+            for gram in NameIndex.get_grams(name):
+                postings.setdefault(gram, []).append(code)
+        grams = list(postings)
+        gram_offsets = np.zeros(len(grams) + 1, dtype=np.int64)
+        gram_offsets[1:] = np.cumsum([len(postings[gram]) for gram in grams])
+        gram_names = np.array([code for gram in grams for code in postings[gram]], dtype=np.int32)
+        name_codes = np.asarray(vacancies_table.name_codes)
+        row_offsets = np.zeros(len(names) + 1, dtype=np.int64)
+        row_offsets[1:] = np.cumsum(np.bincount(name_codes, minlength=len(names)))
+        rows = np.argsort(name_codes, kind='stable').astype(np.int32)
+        return NameIndex(names, grams, gram_offsets, gram_names, row_offsets, rows)
+
+    def get_columns(self):
+        """
+        Возвращает массивы индекса для записи в бинарный кэш.
+        :return:
+            dict: Словарь: ключ - название аргумента конструктора, значение - массив NumPy или список строк
+        """
+        return {'names': self.names, 'grams': self.grams, 'gram_offsets': self.gram_offsets,
+                'gram_names': self.gram_names, 'row_offsets': self.row_offsets, 'rows': self.rows}
+
+    @staticmethod
+    def from_columns(columns):
+        """
+        Создает индекс из массивов, полученных методом get_columns.
+        :param columns: Словарь с массивами индекса (dict)
+        :return:
+            NameIndex: Индекс названий
+        """
+        return NameIndex(**columns)
+
+    def find_names(self, substring):
+        """
+        Находит коды названий, содержащих подстроку.
+        Запрос короче триграммы проверяется по всем уникальным названиям.
+        :param substring: Подстрока (str)
+        :return:
+            numpy.ndarray: Возрастающий массив кодов названий
+        """
+        grams = NameIndex.get_grams(substring)
+        if not grams:
+            return np.array([code for code, name in enumerate(self.names) if substring in name], dtype=np.intp)
+        postings = []
+        for gram in grams:
+            code = self.gram_codes.get(gram)
+            if code is None:
+                return np.array([], dtype=np.intp)
+            postings.append(self.gram_names[self.gram_offsets[code]:self.gram_offsets[code + 1]])
+        postings.sort(key=len)
+        candidates = postings[0]
+        for posting in postings[1:]:
+            candidates = np.intersect1d(candidates, posting, assume_unique=True)
+        return np.array([code for code in candidates.tolist() if substring in self.names[code]], dtype=np.intp)
+
+    def find_rows(self, substring):
+        """
+        Находит номера строк таблицы, в названии которых встречается подстрока.
+        :param substring: Подстрока (str)
+        :return:
+            numpy.ndarray: Возрастающий массив номеров строк
+        """
+        parts = [self.rows[self.row_offsets[code]:self.row_offsets[code + 1]] for code in self.find_names(substring)]
+        if not parts:
+            return np.array([], dtype=np.intp)
+        return np.sort(np.concatenate(parts)).astype(np.intp)
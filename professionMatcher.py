@@ -0,0 +1,87 @@
+from collections import deque
+import numpy as np
+
+
+class ProfessionMatcher:
+    """
+    Класс для одновременного поиска нескольких названий профессий в строке (автомат Ахо - Корасик).
+    Каждая строка просматривается один раз, независимо от количества профессий.
+    Attributes:
+        vacancy_names (list): Названия профессий
+        transitions (list): Переходы автомата: для каждого состояния словарь: ключ - символ, значение - состояние
+        fail (list): Суффиксные ссылки состояний
+        outputs (list): Битовые маски профессий, найденных при переходе в состояние
+    """
+    def __init__(self, vacancy_names):
+        """
+        Инициализирует объект ProfessionMatcher и строит автомат.
+        Args:
+            vacancy_names (list): Названия профессий
+        """
+        self.vacancy_names = list(vacancy_names)
+        self.transitions = [{}]
+        self.fail = [0]
+        self.outputs = [0]
+        for i, vacancy_name in enumerate(self.vacancy_names):
+            state = 0
+            for char in vacancy_name:
+                next_state = self.transitions[state].get(char)
+                if next_state is None:
+                    next_state = len(self.transitions)
+                    self.transitions[state][char] = next_state
+                    self.transitions.append({})
+                    self.fail.append(0)
+                    self.outputs.append(0)
+                state = next_state
+            self.outputs[state] |= 1 << i
+        queue = deque(self.transitions[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self.transitions[state].items():
+                queue.append(next_state)
+                fail_state = self.fail[state]
+                while fail_state and char not in self.transitions[fail_state]:
+                    fail_state = self.fail[fail_state]
+                if state:
+                    self.fail[next_state] = self.transitions[fail_state].get(char, 0)
+                self.outputs[next_state] |= self.outputs[self.fail[next_state]]
+
+    def match(self, value):
+        """
+        Находит все профессии, названия которых встречаются в строке.
+        :param value: Строка (str)
+        :return:
+            int: Битовая маска: бит i установлен, если в строке есть vacancy_names[i]
+        >>> matcher = ProfessionMatcher(['Python', 'Программист', 'Java'])
+        >>> bin(matcher.match('Программист Python'))
+        '0b11'
+        >>> matcher.match('Аналитик')
+        0
+        """
+        transitions, fail, outputs = self.transitions, self.fail, self.outputs
+        state = 0
+        found = outputs[0]
+        for char in value:
+            while state and char not in transitions[state]:
+                state = fail[state]
+            state = transitions[state].get(char, 0)
+            found |= outputs[state]
+        return found
+
+    def match_names(self, names):
+        """
+        Сопоставляет список названий вакансий со всеми профессиями.
+        :param names: Названия вакансий (list)
+        :return:
+            numpy.ndarray: Булев массив: строка - название вакансии, столбец - профессия
+        >>> ProfessionMatcher(['ava', 'Java', 'Py']).match_names(['Java', 'Python']).tolist()
+        [[True, True, False], [False, False, True]]
+        """
+        matches = np.zeros((len(names), len(self.vacancy_names)), dtype=bool)
+        for row, name in enumerate(names):
+            found = self.match(name)
+            while found:
+                bit = found & -found
+                matches[row, bit.bit_length() - 1] = True
+                found ^= bit
+        return matches
@@ -0,0 +1,69 @@
+import numpy as np
+
+
+class SortKeys:
+    """
+    Класс для хранения типизированных ключей сортировки вакансий: для каждого поля один числовой массив,
+    который вычисляется один раз при загрузке. Строки заменяются рангами в порядке сравнения строк,
+    поэтому сортировка по любому полю - это одна устойчивая сортировка индексов числового массива.
+    Attributes:
+        columns (dict): Словарь: ключ - поле, значение - ключи сортировки вакансий (numpy.ndarray)
+    """
+    def __init__(self, columns):
+        """
+        Инициализирует объект SortKeys.
+        Args:
+            columns (dict): Словарь: ключ - поле, значение - ключи сортировки вакансий (list or numpy.ndarray)
+        """
+        self.columns = {field: np.asarray(values) for field, values in columns.items()}
+
+    def __len__(self):
+        """
+        Возвращает количество вакансий.
+        :return:
+            int: Количество вакансий
+        """
+        return len(next(iter(self.columns.values()), ()))
+
+    @staticmethod
+    def get_ranks(values):
+        """
+        Заменяет строки их рангами: порядок рангов совпадает с порядком сравнения строк, равные строки
+        получают равные ранги.
+        :param values: Строки (list)
+        :return:
+            numpy.ndarray: Ранги (int32)
+        >>> SortKeys.get_ranks(['b', 'a', 'c', 'a']).tolist()
+        [1, 0, 2, 0]
+        """
+        ranks = {value: rank for rank, value in enumerate(sorted(set(values)))}
+        return np.array([ranks[value] for value in values], dtype=np.int32)
+
+    def argsort(self, fields, reverse=False, row_ids=None):
+        """
+        Возвращает порядок вакансий, отсортированных по нескольким полям. Сортировка устойчива и совпадает
+        с sorted(..., key=lambda row: (ключ первого поля, ключ второго поля, ...), reverse=reverse):
+        при обратном порядке ключи меняют знак, поэтому равные вакансии остаются в исходном порядке.
+        :param fields: Поля сортировки, начиная с главного (list)
+        :param reverse: Обратный порядок сортировки (bool)
+        :param row_ids: Номера сортируемых вакансий (по умолчанию - все вакансии) (list or numpy.ndarray)
+        :return:
+            numpy.ndarray: Позиции вакансий в row_ids (или номера вакансий, если row_ids не задан)
+            в порядке сортировки
+        >>> keys = SortKeys({'salary': [30.0, 10.0, 30.0, 20.0], 'name': SortKeys.get_ranks(['b', 'a', 'a', 'c'])})
+        >>> keys.argsort(['salary']).tolist()
+        [1, 3, 0, 2]
+        >>> keys.argsort(['salary'], reverse=True).tolist()
+        [0, 2, 3, 1]
+        >>> keys.argsort(['salary', 'name']).tolist()
+        [1, 3, 2, 0]
+        >>> keys.argsort(['name'], row_ids=[3, 2, 0]).tolist()
+        [1, 2, 0]
+        """
+        keys = [self.columns[field] if row_ids is None else self.columns[field][np.asarray(row_ids, dtype=np.int64)]
+                for field in fields]
+        if reverse:
+            keys = [-key for key in keys]
+        if len(keys) == 1:
+            return np.argsort(keys[0], kind='stable')
+        return np.lexsort(keys[::-1])
@@ -0,0 +1,218 @@
+class Accumulator:
+    """
+    Класс для потокового накопления суммы и количества значений по ключам.
+    Память пропорциональна количеству ключей, а не количеству значений.
+    Attributes:
+        sums (dict): Словарь: ключ - группа, значение - сумма значений
+        counts (dict): Словарь: ключ - группа, значение - количество значений
+    """
+    def __init__(self):
+        """Инициализирует пустой объект Accumulator."""
+        self.sums = {}
+        self.counts = {}
+
+    def add(self, key, value):
+        """
+        Добавляет значение в группу key.
+        :param key: Ключ группы (int or str)
+        :param value: Добавляемое значение (int or float)
+        """
+        if key in self.counts:
+            self.sums[key] += value
+            self.counts[key] += 1
+        else:
+            self.sums[key] = value
+            self.counts[key] = 1
+
+    def add_group(self, key, total, count):
+        """
+        Добавляет в группу key уже посчитанные сумму и количество значений.
+        :param key: Ключ группы (int or str)
+        :param total: Сумма значений (int or float)
+        :param count: Количество значений (int)
+        """
+        if key in self.counts:
+            self.sums[key] += total
+            self.counts[key] += count
+        else:
+            self.sums[key] = total
+            self.counts[key] = count
+
+    def merge(self, other):
+        """
+        Объединяет накопитель с другим накопителем (операция ассоциативна).
+        :param other: Накопитель, значения которого добавляются к текущему (Accumulator)
+        :return:
+            Accumulator: Текущий накопитель
+        >>> first, second = Accumulator(), Accumulator()
+        >>> first.add(2022, 100); second.add(2022, 300); second.add(2021, 50)
+        >>> first.merge(second).get_averages()
+        {2022: 200, 2021: 50}
+        """
+        for key, count in other.counts.items():
+            self.add_group(key, other.sums[key], count)
+        return self
+
+    def get_averages(self):
+        """
+        Возвращает средние значения по группам.
+        :return:
+            dict: Словарь: ключ - группа, значение - целая часть среднего значения
+        """
+        return {key: int(self.sums[key] / count) for key, count in self.counts.items()}
+
+    def get_counts(self):
+        """
+        Возвращает количество значений по группам.
+        :return:
+            dict: Словарь: ключ - группа, значение - количество значений
+        """
+        return dict(self.counts)
+
+    def get_total(self):
+        """
+        Возвращает общее количество добавленных значений.
+        :return:
+            int: Количество значений во всех группах
+        """
+        return sum(self.counts.values())
+
+    def get_state(self):
+        """
+        Возвращает состояние накопителя в виде, пригодном для записи в JSON (типы ключей сохраняются).
+        :return:
+            dict: Ключи, суммы и количества значений в порядке добавления ключей
+        """
+        keys = list(self.counts.keys())
+        return {'keys': keys, 'sums': [self.sums[key] for key in keys], 'counts': [self.counts[key] for key in keys]}
+
+    @staticmethod
+    def from_state(state):
+        """
+        Восстанавливает накопитель из состояния, полученного методом get_state.
+        :param state: Состояние накопителя (dict)
+        :return:
+            Accumulator: Накопитель
+        >>> accumulator = Accumulator()
+        >>> accumulator.add(2022, 100); accumulator.add('Москва', 50)
+        >>> Accumulator.from_state(accumulator.get_state()).get_averages()
+        {2022: 100, 'Москва': 50}
+        """
+        accumulator = Accumulator()
+        for key, total, count in zip(state['keys'], state['sums'], state['counts']):
+            accumulator.add_group(key, total, count)
+        return accumulator
+
+
+class VacancyStatistic:
+    """
+    Класс для однопроходного сбора статистики по вакансиям:
+    зарплаты по годам, зарплаты по годам для выбранной профессии и зарплаты по городам.
+    Attributes:
+        vacancy_name (str): Название профессии
+        salary_year (Accumulator): Зарплаты по годам
+        salary_vacancy_year (Accumulator): Зарплаты по годам для выбранной профессии
+        salary_city (Accumulator): Зарплаты по городам
+    """
+    def __init__(self, vacancy_name):
+        """
+        Инициализирует объект VacancyStatistic.
+        Args:
+            vacancy_name (str): Название профессии
+        """
+        self.vacancy_name = vacancy_name
+        self.salary_year = Accumulator()
+        self.salary_vacancy_year = Accumulator()
+        self.salary_city = Accumulator()
+
+    def add(self, name, year, area_name, salary):
+        """
+        Учитывает одну вакансию в статистике.
+        :param name: Название вакансии (str)
+        :param year: Год публикации вакансии (int)
+        :param area_name: Название региона (str)
+        :param salary: Средняя зарплата в рублях (int or float)
+        """
+        self.salary_year.add(year, salary)
+        if self.vacancy_name in name:
+            self.salary_vacancy_year.add(year, salary)
+        self.salary_city.add(area_name, salary)
+
+    def merge(self, other):
+        """
+        Объединяет статистику с частичной статистикой, собранной по другой части данных.
+        :param other: Частичная статистика по той же профессии (VacancyStatistic)
+        :return:
+            VacancyStatistic: Текущая статистика
+        """
+        self.salary_year.merge(other.salary_year)
+        self.salary_vacancy_year.merge(other.salary_vacancy_year)
+        self.salary_city.merge(other.salary_city)
+        return self
+
+    def get_count_vacancies(self):
+        """
+        Возвращает общее количество учтенных вакансий.
+        :return:
+            int: Количество вакансий
+        """
+        return self.salary_year.get_total()
+
+
+class ProfessionsStatistic:
+    """
+    Класс для статистики по годам сразу для нескольких профессий, собранной за один проход по данным.
+    Attributes:
+        vacancy_names (list): Названия профессий
+        salary_year (Accumulator): Зарплаты по годам для всех вакансий
+        salary_vacancy_year (dict): Словарь: ключ - название профессии, значение - зарплаты по годам (Accumulator)
+        salary_city (Accumulator): Зарплаты по городам для всех вакансий
+    """
+    def __init__(self, vacancy_names):
+        """
+        Инициализирует объект ProfessionsStatistic.
+        Args:
+            vacancy_names (list): Названия профессий
+        """
+        self.vacancy_names = list(vacancy_names)
+        self.salary_year = Accumulator()
+        self.salary_vacancy_year = {vacancy_name: Accumulator() for vacancy_name in self.vacancy_names}
+        self.salary_city = Accumulator()
+
+    def merge(self, other):
+        """
+        Объединяет статистику с частичной статистикой, собранной по другой части данных.
+        :param other: Частичная статистика по тем же профессиям (ProfessionsStatistic)
+        :return:
+            ProfessionsStatistic: Текущая статистика
+        """
+        self.salary_year.merge(other.salary_year)
+        for vacancy_name, accumulator in other.salary_vacancy_year.items():
+            self.salary_vacancy_year[vacancy_name].merge(accumulator)
+        self.salary_city.merge(other.salary_city)
+        return self
+
+    def get_state(self):
+        """
+        Возвращает состояние статистики в виде, пригодном для записи в JSON.
+        :return:
+            dict: Названия профессий и состояния накопителей
+        """
+        return {'vacancy_names': self.vacancy_names, 'salary_year': self.salary_year.get_state(),
+                'salary_vacancy_year': [self.salary_vacancy_year[name].get_state() for name in self.vacancy_names],
+                'salary_city': self.salary_city.get_state()}
+
+    @staticmethod
+    def from_state(state):
+        """
+        Восстанавливает статистику из состояния, полученного методом get_state.
+        :param state: Состояние статистики (dict)
+        :return:
+            ProfessionsStatistic: Статистика по профессиям
+        """
+        statistic = ProfessionsStatistic(state['vacancy_names'])
+        statistic.salary_year = Accumulator.from_state(state['salary_year'])
+        statistic.salary_vacancy_year = {name: Accumulator.from_state(accumulator_state) for name, accumulator_state
+                                         in zip(statistic.vacancy_names, state['salary_vacancy_year'])}
+        statistic.salary_city = Accumulator.from_state(state['salary_city'])
+        return statistic
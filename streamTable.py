@@ -0,0 +1,82 @@
+import textwrap
+
+
+class StreamTable:
+    """
+    Класс для потоковой печати таблицы в виде PrettyTable (выравнивание по левому краю, линии между строками).
+    Ширина столбцов задается заранее, а не вычисляется по всем строкам, поэтому каждая строка записывается
+    сразу после форматирования и таблица целиком в памяти не хранится; длинные значения переносятся по словам.
+    Attributes:
+        file: Файл или поток, в который пишется таблица
+        field_names (list): Названия столбцов
+        widths (list): Ширина каждого столбца
+    """
+    def __init__(self, file, field_names, widths):
+        """
+        Инициализирует объект StreamTable.
+        Args:
+            file: Файл или поток, в который пишется таблица (например, sys.stdout)
+            field_names (list): Названия столбцов
+            widths (list): Ширина каждого столбца
+        """
+        self.file = file
+        self.field_names = list(field_names)
+        self.widths = list(widths)
+
+    @staticmethod
+    def wrap(value, width):
+        """
+        Разбивает значение ячейки на строки не длиннее width (переводы строк в значении сохраняются).
+        :param value: Значение ячейки
+        :param width: Ширина столбца (int)
+        :return:
+            list: Строки ячейки
+        >>> StreamTable.wrap('Программист Python\\nGit', 12)
+        ['Программист', 'Python', 'Git']
+        """
+        lines = []
+        for line in str(value).split('\n'):
+            lines.extend(textwrap.wrap(line, width) or [''])
+        return lines
+
+    def get_rule(self):
+        """
+        Возвращает горизонтальную линию таблицы.
+        :return:
+            str: Линия
+        """
+        return '+' + '+'.join('-' * (width + 2) for width in self.widths) + '+\n'
+
+    def get_lines(self, values):
+        """
+        Форматирует одну строку таблицы, которая может занимать несколько строк текста.
+        :param values: Значения ячеек (list)
+        :return:
+            str: Строки текста
+        """
+        cells = [StreamTable.wrap(value, width) for value, width in zip(values, self.widths)]
+        height = max(len(cell) for cell in cells)
+        return ''.join('| ' + ' | '.join((cell[i] if i < len(cell) else '').ljust(width)
+                                         for cell, width in zip(cells, self.widths)) + ' |\n'
+                       for i in range(height))
+
+    def write_header(self):
+        """Записывает заголовок таблицы."""
+        self.file.write(self.get_rule() + self.get_lines(self.field_names) + self.get_rule())
+
+    def write_row(self, values):
+        """
+        Записывает строку таблицы и линию под ней.
+        :param values: Значения ячеек в порядке field_names (list)
+        >>> import sys
+        >>> table = StreamTable(sys.stdout, ['№', 'Название'], [2, 12])
+        >>> table.write_header()
+        +----+--------------+
+        | №  | Название     |
+        +----+--------------+
+        >>> table.write_row([1, 'Программист Python'])
+        | 1  | Программист  |
+        |    | Python       |
+        +----+--------------+
+        """
+        self.file.write(self.get_lines(values) + self.get_rule())
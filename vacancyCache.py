@@ -0,0 +1,210 @@
+import json
+import os
+import shutil
+from pathlib import Path
+import numpy as np
+
+
+class ColumnFile:
+    """
+    Класс для колоночного бинарного файла: папки, в которой каждый столбец записан в отдельный файл .npy
+    (числовые столбцы читаются через отображение в память), строковые столбцы - одним блоком UTF-8,
+    а названия и типы столбцов - в файл meta.json.
+    Attributes:
+        path (Path): Папка с файлами столбцов
+    """
+    separator = '\x00'
+
+    def __init__(self, path):
+        """
+        Инициализирует объект ColumnFile.
+        Args:
+            path (str or Path): Папка с файлами столбцов
+        """
+        self.path = Path(path)
+
+    def get_meta(self):
+        """
+        Возвращает дополнительные сведения, которые записываются в meta.json.
+        :return:
+            dict: Дополнительные сведения
+        """
+        return {}
+
+    def check_meta(self, meta):
+        """
+        Проверяет, можно ли читать столбцы, описанные в meta.json.
+        :param meta: Содержимое meta.json (dict)
+        :return:
+            bool: True, если столбцы можно читать
+        """
+        return True
+
+    def load(self):
+        """
+        Загружает столбцы.
+        :return:
+            dict or None: Словарь: ключ - название столбца, значение - массив NumPy или список строк;
+            None, если файла нет или он не прошел проверку check_meta
+        """
+        try:
+            with open(self.path / 'meta.json', encoding='utf-8') as file:
+                meta = json.load(file)
+            if not self.check_meta(meta):
+                return None
+            columns = {}
+            for name, kind in meta['columns'].items():
+                if kind == 'strings':
+                    data = np.load(self.path / f'{name}.npy')
+                    columns[name] = ColumnFile.decode_strings(data, meta['lengths'][name])
+                else:
+                    columns[name] = np.load(self.path / f'{name}.npy', mmap_mode='r')
+            return columns
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def save(self, columns):
+        """
+        Записывает столбцы. Файл с описанием записывается последним, а папка заменяется целиком,
+        поэтому прерванная запись не приводит к чтению неполных данных.
+        :param columns: Словарь: ключ - название столбца, значение - массив NumPy или список строк (dict)
+        :return:
+            bool: True, если столбцы записаны
+        """
+        meta = dict(self.get_meta(), columns={}, lengths={})
+        temp_dir = self.path.with_name(f'{self.path.name}.tmp{os.getpid()}')
+        shutil.rmtree(temp_dir, ignore_errors=True)
+        temp_dir.mkdir()
+        try:
+            for name, values in columns.items():
+                if isinstance(values, np.ndarray):
+                    np.save(temp_dir / f'{name}.npy', values)
+                    meta['columns'][name] = 'array'
+                else:
+                    data = ColumnFile.encode_strings(values)
+                    if data is None:
+                        return False
+                    np.save(temp_dir / f'{name}.npy', data)
+                    meta['columns'][name] = 'strings'
+                    meta['lengths'][name] = len(values)
+            with open(temp_dir / 'meta.json', mode='w', encoding='utf-8') as file:
+                json.dump(meta, file, ensure_ascii=False)
+            shutil.rmtree(self.path, ignore_errors=True)
+            os.replace(temp_dir, self.path)
+            return True
+        except OSError:
+            return False
+        finally:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+    @staticmethod
+    def encode_strings(values):
+        """
+        Кодирует список строк в один блок байтов UTF-8 с разделителем.
+        :param values: Список строк (list)
+        :return:
+            numpy.ndarray or None: Массив байтов; None, если строка содержит символ-разделитель
+        >>> ColumnFile.encode_strings(['a', 'бв']).tobytes()
+        b'a\\x00\\xd0\\xb1\\xd0\\xb2'
+        """
+        text = ColumnFile.separator.join(values)
+        if text.count(ColumnFile.separator) != max(len(values) - 1, 0):
+            return None
+        return np.frombuffer(text.encode('utf-8'), dtype=np.uint8)
+
+    @staticmethod
+    def decode_strings(data, length):
+        """
+        Декодирует блок байтов UTF-8 обратно в список строк.
+        :param data: Массив байтов (numpy.ndarray)
+        :param length: Количество строк (int)
+        :return:
+            list: Список строк
+        >>> ColumnFile.decode_strings(ColumnFile.encode_strings(['a', 'бв', '']), 3)
+        ['a', 'бв', '']
+        >>> ColumnFile.decode_strings(ColumnFile.encode_strings([]), 0)
+        []
+        """
+        if length == 0:
+            return []
+        return data.tobytes().decode('utf-8').split(ColumnFile.separator)
+
+
+class ColumnCache(ColumnFile):
+    """
+    Класс для бинарного кэша разобранных данных CSV файла.
+    Кэш хранится рядом с CSV файлом в папке {имя файла}.{вид}.cache в формате ColumnFile.
+    Кэш действителен, пока не изменились путь, размер и время изменения исходного файла.
+    Attributes:
+        file_name (Path): Путь к исходному CSV файлу
+        cache_dir (Path): Папка с файлами кэша
+    """
+    version = 3
+
+    def __init__(self, file_name, kind):
+        """
+        Инициализирует объект ColumnCache.
+        Args:
+            file_name (str or Path): Путь к исходному CSV файлу
+            kind (str): Вид кэшируемых данных, чтобы разные читатели не перезаписывали кэш друг друга
+        """
+        self.file_name = Path(file_name)
+        self.cache_dir = self.file_name.with_name(f'{self.file_name.name}.{kind}.cache')
+        super().__init__(self.cache_dir)
+
+    def get_signature(self):
+        """
+        Возвращает признаки исходного файла, по которым проверяется актуальность кэша.
+        :return:
+            dict: Версия формата, абсолютный путь, размер и время изменения файла
+        """
+        stat = os.stat(self.file_name)
+        return {'version': ColumnCache.version, 'path': str(self.file_name.resolve()),
+                'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+
+    def get_meta(self):
+        """
+        Возвращает признаки исходного файла для записи в meta.json.
+        :return:
+            dict: Словарь с признаками исходного файла
+        """
+        return {'signature': self.get_signature()}
+
+    def check_meta(self, meta):
+        """
+        Проверяет, что кэш соответствует текущему состоянию исходного файла.
+        :param meta: Содержимое meta.json (dict)
+        :return:
+            bool: True, если кэш актуален
+        """
+        return meta['signature'] == self.get_signature()
+
+    @staticmethod
+    def encode_cell(value):
+        """
+        Приводит значение ячейки (строку или список строк) к строке для записи в кэш.
+        :param value: Значение ячейки (str or list)
+        :return:
+            str: Строка, в которой элементы списка разделены переводом строки
+        >>> ColumnCache.encode_cell(['Python', 'SQL'])
+        'Python\\nSQL'
+        """
+        if isinstance(value, list):
+            return '\n'.join(value)
+        return value
+
+    @staticmethod
+    def decode_cell(value):
+        """
+        Восстанавливает значение ячейки, записанное методом encode_cell.
+        :param value: Строка из кэша (str)
+        :return:
+            str or list: Строка или список строк
+        >>> ColumnCache.decode_cell('Python\\nSQL')
+        ['Python', 'SQL']
+        >>> ColumnCache.decode_cell('Python')
+        'Python'
+        """
+        if value.find('\n') != -1:
+            return value.split('\n')
+        return value
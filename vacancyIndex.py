@@ -0,0 +1,353 @@
+import numpy as np
+
+
+class VacancyIndex:
+    """
+    Класс для фильтрации вакансий по индексам, построенным один раз при загрузке:
+    хеш-индексы для полей, которые сравниваются на равенство (значение - номера вакансий),
+    отсортированные по нижней границе интервалы для поиска интервалов, содержащих число,
+    отсортированные значения для поиска диапазонов и отсортированные номера вакансий для полей-множеств
+    (элемент - номера вакансий). Номера вакансий хранятся массивами int32, поэтому память индекса
+    множеств пропорциональна количеству пар (вакансия, элемент), а не количеству элементов на количество вакансий.
+    Результат каждого условия - битовая карта (int): бит i установлен, если вакансия i подходит;
+    условия объединяются побитовыми И и ИЛИ.
+    Индексы заодно хранят статистику полей (количество вакансий на значение, отсортированные границы),
+    по которой до вычисления оценивается, сколько вакансий подходит под условие.
+    Attributes:
+        size (int): Количество вакансий
+        hash_indexes (dict): Словарь: ключ - поле, значение - словарь: значение поля - номера вакансий
+        interval_indexes (dict): Словарь: ключ - поле, значение - нижние и верхние границы интервалов,
+            отсортированные по нижней границе, номера вакансий в том же порядке и отсортированные верхние границы
+        range_indexes (dict): Словарь: ключ - поле, значение - отсортированные значения и номера вакансий
+            в том же порядке
+        set_indexes (dict): Словарь: ключ - поле, значение - словарь: элемент - номера вакансий по возрастанию
+    """
+    def __init__(self, size):
+        """
+        Инициализирует объект VacancyIndex без индексов.
+        Args:
+            size (int): Количество вакансий
+        """
+        self.size = size
+        self.hash_indexes = {}
+        self.interval_indexes = {}
+        self.range_indexes = {}
+        self.set_indexes = {}
+
+    @staticmethod
+    def get_bitmap(row_ids):
+        """
+        Переводит номера вакансий в битовую карту.
+        :param row_ids: Номера вакансий (list or numpy.ndarray)
+        :return:
+            int: Битовая карта
+        >>> bin(VacancyIndex.get_bitmap([0, 3, 9]))
+        '0b1000001001'
+        """
+        if len(row_ids) == 0:
+            return 0
+        row_ids = np.asarray(row_ids, dtype=np.int64)
+        mask = np.zeros(int(row_ids.max()) + 1, dtype=bool)
+        mask[row_ids] = True
+        return int.from_bytes(np.packbits(mask, bitorder='little').tobytes(), 'little')
+
+    def get_row_ids(self, bitmap):
+        """
+        Переводит битовую карту в номера вакансий.
+        :param bitmap: Битовая карта (int)
+        :return:
+            numpy.ndarray: Номера вакансий по возрастанию
+        >>> VacancyIndex(12).get_row_ids(0b1000001001).tolist()
+        [0, 3, 9]
+        """
+        bits = np.frombuffer(bitmap.to_bytes((self.size + 7) // 8, 'little'), dtype=np.uint8)
+        return np.flatnonzero(np.unpackbits(bits, bitorder='little')[:self.size])
+
+    @staticmethod
+    def get_groups(values):
+        """
+        Группирует номера вакансий по значениям (списки заменяются кортежами).
+        :param values: Значения поля (list)
+        :return:
+            dict: Словарь: ключ - значение, значение - номера вакансий (list)
+        """
+        groups = {}
+        for row_id, value in enumerate(values):
+            groups.setdefault(tuple(value) if isinstance(value, list) else value, []).append(row_id)
+        return groups
+
+    def add_hash_index(self, field, values):
+        """
+        Строит хеш-индекс поля для условий на равенство.
+        :param field: Поле (str)
+        :param values: Значения поля всех вакансий (list)
+        """
+        self.hash_indexes[field] = {value: np.array(row_ids, dtype=np.int32)
+                                    for value, row_ids in VacancyIndex.get_groups(values).items()}
+
+    def add_interval_index(self, field, starts, ends):
+        """
+        Строит индекс интервалов поля для условий «интервал содержит число» и «интервал пересекает диапазон».
+        :param field: Поле (str)
+        :param starts: Нижние границы интервалов всех вакансий (list or numpy.ndarray)
+        :param ends: Верхние границы интервалов всех вакансий (list or numpy.ndarray)
+        """
+        starts, ends = np.asarray(starts), np.asarray(ends)
+        order = np.argsort(starts, kind='stable')
+        self.interval_indexes[field] = (starts[order], ends[order], order, np.sort(ends, kind='stable'))
+
+    def add_range_index(self, field, values):
+        """
+        Строит индекс поля для условий «значение в диапазоне».
+        :param field: Поле (str)
+        :param values: Значения поля всех вакансий (list or numpy.ndarray)
+        """
+        values = np.asarray(values)
+        order = np.argsort(values, kind='stable')
+        self.range_indexes[field] = (values[order], order)
+
+    def add_set_index(self, field, value_sets):
+        """
+        Строит индекс поля-множества для условий «содержит все элементы»: для каждого элемента -
+        номера вакансий по возрастанию.
+        :param field: Поле (str)
+        :param value_sets: Множества элементов всех вакансий (list)
+        """
+        groups = {}
+        for row_id, elements in enumerate(value_sets):
+            for element in set(elements):
+                groups.setdefault(element, []).append(row_id)
+        self.set_indexes[field] = {element: np.array(row_ids, dtype=np.int32) for element, row_ids in groups.items()}
+
+    def find_equal(self, field, value):
+        """
+        Находит вакансии, у которых значение поля равно value.
+        :param field: Поле с хеш-индексом (str)
+        :param value: Значение (str or int or float)
+        :return:
+            int: Битовая карта
+        """
+        return VacancyIndex.get_bitmap(self.hash_indexes[field].get(value, ()))
+
+    def find_containing(self, field, point):
+        """
+        Находит вакансии, интервал которых содержит число.
+        :param field: Поле с индексом интервалов (str)
+        :param point: Число (int or float)
+        :return:
+            int: Битовая карта
+        >>> index = VacancyIndex(4)
+        >>> index.add_interval_index('salary', [40, 100, 20, 50], [60, 100, 30, 50])
+        >>> index.get_row_ids(index.find_containing('salary', 50)).tolist()
+        [0, 3]
+        """
+        return self.find_overlapping(field, (point, point))
+
+    def find_overlapping(self, field, bounds):
+        """
+        Находит вакансии, интервал которых пересекает диапазон: среди интервалов с нижней границей
+        не больше верхней границы диапазона (их находит двоичный поиск) выбираются интервалы
+        с верхней границей не меньше нижней границы диапазона.
+        :param field: Поле с индексом интервалов (str)
+        :param bounds: Нижняя и верхняя границы диапазона включительно; None - без границы (tuple)
+        :return:
+            int: Битовая карта
+        >>> index = VacancyIndex(4)
+        >>> index.add_interval_index('salary', [40, 100, 20, 50], [60, 100, 30, 50])
+        >>> index.get_row_ids(index.find_overlapping('salary', (55, None))).tolist()
+        [0, 1]
+        """
+        starts, ends, order, _ = self.interval_indexes[field]
+        low, high = bounds
+        count = len(starts) if high is None else np.searchsorted(starts, high, side='right')
+        return VacancyIndex.get_bitmap(order[:count] if low is None else order[:count][ends[:count] >= low])
+
+    def find_between(self, field, bounds):
+        """
+        Находит вакансии, значение поля которых лежит в диапазоне (двоичным поиском по отсортированным значениям).
+        :param field: Поле с индексом диапазонов (str)
+        :param bounds: Нижняя и верхняя границы диапазона включительно; None - без границы (tuple)
+        :return:
+            int: Битовая карта
+        >>> index = VacancyIndex(4)
+        >>> index.add_range_index('published_at', ['2022-07-05', '2022-07-01', '2022-07-03', '2022-07-04'])
+        >>> index.get_row_ids(index.find_between('published_at', ('2022-07-02', '2022-07-04'))).tolist()
+        [2, 3]
+        """
+        values, order = self.range_indexes[field]
+        start, stop = VacancyIndex.get_range(values, bounds)
+        return VacancyIndex.get_bitmap(order[start:stop])
+
+    @staticmethod
+    def get_range(values, bounds):
+        """
+        Находит двоичным поиском часть отсортированного массива, значения которой лежат в диапазоне.
+        :param values: Отсортированные значения (numpy.ndarray)
+        :param bounds: Нижняя и верхняя границы диапазона включительно; None - без границы (tuple)
+        :return:
+            tuple: Начало и конец части массива
+        >>> VacancyIndex.get_range(np.array([1, 3, 3, 5]), (3, None))
+        (1, 4)
+        """
+        low, high = bounds
+        start = 0 if low is None else int(np.searchsorted(values, low, side='left'))
+        stop = len(values) if high is None else int(np.searchsorted(values, high, side='right'))
+        return start, max(start, stop)
+
+    def find_all(self, field, elements):
+        """
+        Находит вакансии, множество которых содержит все элементы: номера вакансий элементов пересекаются,
+        начиная с самого редкого элемента, и только результат переводится в битовую карту.
+        :param field: Поле с индексом множеств (str)
+        :param elements: Элементы (list)
+        :return:
+            int: Битовая карта
+        >>> index = VacancyIndex(3)
+        >>> index.add_set_index('key_skills', [['C#'], ['C#', 'Python'], ['C', 'Python']])
+        >>> index.get_row_ids(index.find_all('key_skills', ['Python', 'C#'])).tolist()
+        [1]
+        """
+        if len(elements) == 0:
+            return (1 << self.size) - 1
+        set_index = self.set_indexes[field]
+        arrays = sorted((set_index.get(element, np.array([], dtype=np.int32)) for element in elements), key=len)
+        row_ids = arrays[0]
+        for array in arrays[1:]:
+            if len(row_ids) == 0:
+                break
+            row_ids = np.intersect1d(row_ids, array, assume_unique=True)
+        return VacancyIndex.get_bitmap(row_ids)
+
+    def estimate(self, operation, field, value):
+        """
+        Оценивает по статистике индексов, сколько вакансий подходит под условие, не вычисляя его.
+        Для равенства, диапазона и пересечения интервалов оценка точная, для множеств - верхняя граница
+        (количество вакансий с самым редким элементом).
+        :param operation: Операция условия (str)
+        :param field: Поле (str)
+        :param value: Значение условия
+        :return:
+            int: Оценка количества вакансий
+        >>> index = VacancyIndex(4)
+        >>> index.add_interval_index('salary', [40, 100, 20, 50], [60, 100, 30, 50])
+        >>> index.estimate('overlaps', 'salary', (55, None)), index.estimate('contains', 'salary', 25)
+        (2, 1)
+        """
+        if operation == 'eq':
+            return len(self.hash_indexes[field].get(value, ()))
+        if operation == 'all':
+            return min((len(self.set_indexes[field].get(element, ())) for element in value), default=self.size)
+        if operation == 'between':
+            start, stop = VacancyIndex.get_range(self.range_indexes[field][0], value)
+            return stop - start
+        starts, _, _, sorted_ends = self.interval_indexes[field]
+        low, high = (value, value) if operation == 'contains' else value
+        count = len(starts) if high is None else int(np.searchsorted(starts, high, side='right'))
+        return count if low is None else max(count - int(np.searchsorted(sorted_ends, low, side='left')), 0)
+
+    def get_operations(self):
+        """
+        Возвращает индексы и функции поиска для каждой операции условия.
+        :return:
+            dict: Словарь: ключ - операция, значение - индексы операции (dict) и функция поиска
+        """
+        return {'eq': (self.hash_indexes, self.find_equal),
+                'contains': (self.interval_indexes, self.find_containing),
+                'overlaps': (self.interval_indexes, self.find_overlapping),
+                'between': (self.range_indexes, self.find_between),
+                'all': (self.set_indexes, self.find_all)}
+
+    def has_indexes(self, conditions):
+        """
+        Проверяет, что для всех условий построены индексы (иначе условия фильтруются без индексов).
+        :param conditions: Условия (operation, field, value) (list)
+        :return:
+            bool: Все условия можно вычислить по индексам
+        >>> index = VacancyIndex(2)
+        >>> index.add_hash_index('area_name', ['Москва', 'Пермь'])
+        >>> index.has_indexes([('eq', 'area_name', 'Москва')]), index.has_indexes([('eq', 'description', '')])
+        (True, False)
+        """
+        operations = self.get_operations()
+        return all(operation in operations and field in operations[operation][0]
+                   for operation, field, _ in conditions)
+
+    def compile(self, conditions):
+        """
+        Компилирует условия фильтрации один раз: для каждого условия выбирается индекс, проверяется,
+        что он построен, и оценивается количество подходящих вакансий. Условия упорядочиваются
+        от самого избирательного, поэтому объединение побитовым И быстрее всего становится пустым.
+        :param conditions: Условия (operation, field, value): operation - 'eq' (равенство),
+            'contains' (интервал содержит число), 'overlaps' (интервал пересекает диапазон),
+            'between' (значение в диапазоне) или 'all' (множество содержит все элементы) (list)
+        :return:
+            list: Пары (оценка количества вакансий, функция без аргументов, возвращающая битовую карту условия)
+            по возрастанию оценки
+        """
+        indexes = self.get_operations()
+        plan = []
+        for operation, field, value in conditions:
+            if operation not in indexes:
+                raise ValueError(f'Неизвестная операция фильтрации: {operation}')
+            field_indexes, find = indexes[operation]
+            if field not in field_indexes:
+                raise KeyError(f'Для поля {field} нет индекса {operation}')
+            plan.append((self.estimate(operation, field, value),
+                         lambda find=find, field=field, value=value: find(field, value)))
+        plan.sort(key=lambda step: step[0])
+        return plan
+
+    def evaluate(self, plan):
+        """
+        Вычисляет скомпилированные условия и объединяет их побитовым И; если ни одна вакансия уже не подходит,
+        остальные условия не вычисляются.
+        :param plan: Скомпилированные условия (list)
+        :return:
+            int: Битовая карта подходящих вакансий
+        >>> index = VacancyIndex(3)
+        >>> index.add_hash_index('area_name', ['Москва', 'Пермь', 'Москва'])
+        >>> index.add_interval_index('salary', [40, 100, 20], [60, 100, 30])
+        >>> index.get_row_ids(index.evaluate(index.compile([('eq', 'area_name', 'Москва')]))).tolist()
+        [0, 2]
+        >>> index.get_row_ids(index.evaluate(index.compile([('eq', 'area_name', 'Москва'),
+        ...                                                  ('contains', 'salary', 50)]))).tolist()
+        [0]
+        """
+        bitmap = (1 << self.size) - 1
+        for _, find in plan:
+            if not bitmap:
+                break
+            bitmap &= find()
+        return bitmap
+
+    def compile_query(self, query):
+        """
+        Компилирует запрос - условия, объединенные И внутри групп и ИЛИ между группами.
+        Группы, в которых хотя бы одно условие по статистике не выбирает ни одной вакансии, отбрасываются.
+        :param query: Группы условий (list)
+        :return:
+            list: Скомпилированные группы (см. compile)
+        """
+        plans = [self.compile(conditions) for conditions in query]
+        return [plan for plan in plans if not plan or plan[0][0] > 0]
+
+    def evaluate_query(self, plans):
+        """
+        Вычисляет скомпилированный запрос: группы объединяются побитовым ИЛИ.
+        :param plans: Скомпилированные группы (list)
+        :return:
+            int: Битовая карта подходящих вакансий
+        >>> index = VacancyIndex(4)
+        >>> index.add_hash_index('area_name', ['Москва', 'Пермь', 'Москва', 'Пермь'])
+        >>> index.add_range_index('published_at', ['2022-07-05', '2022-07-01', '2022-07-03', '2022-07-04'])
+        >>> plans = index.compile_query([[('eq', 'area_name', 'Москва'),
+        ...                               ('between', 'published_at', ('2022-07-04', None))],
+        ...                              [('eq', 'area_name', 'Пермь'), ('eq', 'area_name', 'Казань')],
+        ...                              [('between', 'published_at', (None, '2022-07-02'))]])
+        >>> len(plans), index.get_row_ids(index.evaluate_query(plans)).tolist()
+        (2, [0, 1])
+        """
+        bitmap = 0
+        for plan in plans:
+            bitmap |= self.evaluate(plan)
+        return bitmap
@@ -0,0 +1,294 @@
+import csv
+from array import array
+import numpy as np
+from statisticsAccumulator import VacancyStatistic, ProfessionsStatistic
+from dateParser import parse_column
+from vacancyCache import ColumnFile
+
+
+class DictionaryEncoder:
+    """
+    Класс для словарного кодирования строковых значений целыми числами.
+    Attributes:
+        values (list): Уникальные значения в порядке первого появления
+        codes (dict): Словарь: ключ - значение, значение - его код
+    """
+    def __init__(self):
+        """Инициализирует пустой объект DictionaryEncoder."""
+        self.values = []
+        self.codes = {}
+
+    def encode(self, value):
+        """
+        Возвращает код значения, добавляя значение в словарь при первом появлении.
+        :param value: Кодируемое значение (str)
+        :return:
+            int: Код значения
+        >>> encoder = DictionaryEncoder()
+        >>> [encoder.encode(value) for value in ['RUR', 'USD', 'RUR']]
+        [0, 1, 0]
+        """
+        code = self.codes.get(value)
+        if code is None:
+            code = len(self.values)
+            self.codes[value] = code
+            self.values.append(value)
+        return code
+
+
+class VacancyTable:
+    """
+    Класс для колоночного хранения вакансий в типизированных массивах NumPy.
+    Строковые столбцы (название, валюта, регион) хранятся в виде кодов словаря.
+    Attributes:
+        names (list): Уникальные названия вакансий
+        name_codes (numpy.ndarray): Коды названий вакансий
+        salary_from (numpy.ndarray): Нижние границы вилки оклада
+        salary_to (numpy.ndarray): Верхние границы вилки оклада
+        currencies (list): Уникальные идентификаторы валют
+        currency_codes (numpy.ndarray): Коды валют оклада
+        areas (list): Уникальные названия регионов
+        area_codes (numpy.ndarray): Коды регионов
+        years (numpy.ndarray): Годы публикации вакансий
+        months (numpy.ndarray): Месяцы публикации вакансий
+    """
+    fields = ['name', 'salary_from', 'salary_to', 'salary_currency', 'area_name', 'published_at']
+
+    def __init__(self, names, name_codes, salary_from, salary_to, currencies, currency_codes, areas, area_codes,
+                 years, months):
+        """
+        Инициализирует объект VacancyTable.
+        Args:
+            names (list): Уникальные названия вакансий
+            name_codes (numpy.ndarray): Коды названий вакансий
+            salary_from (numpy.ndarray): Нижние границы вилки оклада
+            salary_to (numpy.ndarray): Верхние границы вилки оклада
+            currencies (list): Уникальные идентификаторы валют
+            currency_codes (numpy.ndarray): Коды валют оклада
+            areas (list): Уникальные названия регионов
+            area_codes (numpy.ndarray): Коды регионов
+            years (numpy.ndarray): Годы публикации вакансий
+            months (numpy.ndarray): Месяцы публикации вакансий
+        """
+        self.names = names
+        self.name_codes = name_codes
+        self.salary_from = salary_from
+        self.salary_to = salary_to
+        self.currencies = currencies
+        self.currency_codes = currency_codes
+        self.areas = areas
+        self.area_codes = area_codes
+        self.years = years
+        self.months = months
+
+    def __len__(self):
+        """Возвращает количество вакансий в таблице."""
+        return len(self.salary_from)
+
+    @staticmethod
+    def clean_value(value):
+        """
+        Нормализует пробельные символы в строке.
+        :param value: Строка (str)
+        :return:
+            str: Строка, в которой пробельные символы заменены одним пробелом
+        >>> VacancyTable.clean_value('  Программист\\n Python ')
+        'Программист Python'
+        """
+        return ' '.join(value.split())
+
+    @staticmethod
+    def from_rows(header, rows, cleaner=None):
+        """
+        Создает таблицу из строк CSV файла, пропуская неполные строки.
+        :param header: Заголовок CSV файла (list)
+        :param rows: Итерируемый объект со строками CSV файла (iterable)
+        :param cleaner: Функция очистки строковых значений (callable)
+        :return:
+            VacancyTable: Таблица с вакансиями
+        """
+        cleaner = cleaner or VacancyTable.clean_value
+        index_name, index_from, index_to, index_currency, index_area, index_date = \
+            [header.index(field) for field in VacancyTable.fields]
+        header_length = len(header)
+        names, currencies, areas = DictionaryEncoder(), DictionaryEncoder(), DictionaryEncoder()
+        name_codes, currency_codes, area_codes = array('i'), array('b'), array('i')
+        salary_from, salary_to = array('d'), array('d')
+        dates = []
+        for row in rows:
+            if len(row) != header_length or '' in row:
+                continue
+            name_codes.append(names.encode(cleaner(row[index_name])))
+            salary_from.append(float(row[index_from]))
+            salary_to.append(float(row[index_to]))
+            currency_codes.append(currencies.encode(row[index_currency].strip()))
+            area_codes.append(areas.encode(cleaner(row[index_area])))
+            dates.append(row[index_date].strip())
+        years, months, _ = parse_column(dates)
+        return VacancyTable(names.values, np.array(name_codes, dtype=np.int32),
+                            np.array(salary_from, dtype=np.float64), np.array(salary_to, dtype=np.float64),
+                            currencies.values, np.array(currency_codes, dtype=np.int8),
+                            areas.values, np.array(area_codes, dtype=np.int32),
+                            years, months)
+
+    @staticmethod
+    def from_csv(file_name, cleaner=None):
+        """
+        Читает CSV файл построчно и создает таблицу без создания объектов Vacancy и Salary.
+        :param file_name: Имя CSV файла (str)
+        :param cleaner: Функция очистки строковых значений (callable)
+        :return:
+            VacancyTable: Таблица с вакансиями
+        """
+        with open(file_name, newline='', encoding='utf-8-sig') as file:
+            reader = csv.reader(file)
+            header = next(reader, None)
+            if header is None:
+                print('Пустой файл')
+                exit()
+            return VacancyTable.from_rows(header, reader, cleaner)
+
+    @staticmethod
+    def from_vacancies(vacancies_objects):
+        """
+        Создает таблицу из списка объектов Vacancy с вложенным объектом Salary.
+        :param vacancies_objects: Список с вакансиями (list)
+        :return:
+            VacancyTable: Таблица с вакансиями
+        """
+        rows = ([vacancy.name, vacancy.salary.salary_from, vacancy.salary.salary_to, vacancy.salary.salary_currency,
+                 vacancy.area_name, vacancy.published_at] for vacancy in vacancies_objects)
+        return VacancyTable.from_rows(VacancyTable.fields, rows, lambda value: value)
+
+    @staticmethod
+    def from_converted(path):
+        """
+        Читает вакансии с зарплатами, уже переведенными в рубли (колоночный вывод 341.py):
+        названия и регионы хранятся кодами словаря, зарплата, годы и месяцы - типизированными массивами.
+        :param path: Папка колоночного файла (str or Path)
+        :return:
+            VacancyTable: Таблица с вакансиями, у которых обе границы вилки равны зарплате в рублях
+        """
+        columns = ColumnFile(path).load()
+        if columns is None:
+            raise ValueError(f'Не удалось прочитать колоночный файл: {path}')
+        salary = np.asarray(columns['salary'], dtype=np.float64)
+        return VacancyTable(columns['names'], columns['name_codes'], salary, salary, ['RUR'],
+                            np.zeros(len(salary), dtype=np.int8), columns['areas'], columns['area_codes'],
+                            columns['years'], columns['months'])
+
+    def get_columns(self):
+        """
+        Возвращает столбцы таблицы для записи в бинарный кэш.
+        :return:
+            dict: Словарь: ключ - название аргумента конструктора, значение - массив NumPy или список строк
+        """
+        return dict(self.__dict__)
+
+    @staticmethod
+    def from_columns(columns):
+        """
+        Создает таблицу из столбцов, полученных методом get_columns.
+        :param columns: Словарь со столбцами таблицы (dict)
+        :return:
+            VacancyTable: Таблица с вакансиями
+        """
+        return VacancyTable(**columns)
+
+    def get_name_mask(self, vacancy_name):
+        """
+        Возвращает маску вакансий, в названии которых встречается vacancy_name.
+        Поиск подстроки выполняется только по уникальным названиям.
+        :param vacancy_name: Название профессии (str)
+        :return:
+            numpy.ndarray: Булев массив длины таблицы
+        """
+        matches = np.array([vacancy_name in name for name in self.names], dtype=bool)
+        return matches[self.name_codes]
+
+    def get_salary_in_rub(self, converter, truncate=False):
+        """
+        Вычисляет средние зарплаты всех вакансий в рублях одной векторной операцией.
+        Коды валют таблицы переводятся в индексы таблицы курсов один раз для каждой уникальной валюты.
+        :param converter: Конвертер валют с постоянными курсами или курсами по месяцам (CurrencyConverter or RateTable)
+        :param truncate: Отбрасывать ли дробную часть границ вилки оклада перед вычислением (bool)
+        :return:
+            numpy.ndarray: Средние зарплаты в рублях (NaN, если курс неизвестен)
+        """
+        currency_codes = converter.get_codes(self.currencies)[self.currency_codes]
+        if truncate:
+            return converter.convert(currency_codes, np.trunc(self.salary_from), np.trunc(self.salary_to),
+                                     self.years, self.months)
+        return converter.convert(currency_codes, self.salary_from, self.salary_to, self.years, self.months)
+
+    @staticmethod
+    def fill_accumulator(accumulator, keys, codes, values):
+        """
+        Добавляет в накопитель суммы и количества значений, сгруппированных по кодам.
+        Ключи добавляются в порядке первого появления кода.
+        :param accumulator: Накопитель (Accumulator)
+        :param keys: Значения ключей по кодам (list or numpy.ndarray)
+        :param codes: Коды ключей для каждого значения (numpy.ndarray)
+        :param values: Значения (numpy.ndarray)
+        """
+        sums = np.bincount(codes, weights=values, minlength=len(keys))
+        counts = np.bincount(codes, minlength=len(keys))
+        present, first_index = np.unique(codes, return_index=True)
+        for code in present[np.argsort(first_index)]:
+            accumulator.add_group(keys[code], float(sums[code]), int(counts[code]))
+
+    def get_statistic(self, vacancy_name, salary, name_index=None):
+        """
+        Собирает статистику по годам и городам векторными операциями над столбцами.
+        Вакансии, зарплату которых не удалось перевести в рубли (NaN), не учитываются.
+        Если передан индекс названий, вакансии профессии берутся из него без просмотра всех названий.
+        :param vacancy_name: Название профессии (str)
+        :param salary: Средние зарплаты вакансий в рублях (numpy.ndarray)
+        :param name_index: Индекс названий этой таблицы (NameIndex)
+        :return:
+            VacancyStatistic: Статистика по вакансиям
+        """
+        statistic = VacancyStatistic(vacancy_name)
+        known = ~np.isnan(salary)
+        if not known.any():
+            return statistic
+        first_year = int(self.years[known].min())
+        year_keys = list(range(first_year, int(self.years[known].max()) + 1))
+        if name_index is None:
+            rows = np.flatnonzero(self.get_name_mask(vacancy_name) & known)
+        else:
+            rows = name_index.find_rows(vacancy_name)
+            rows = rows[known[rows]]
+        vacancy_year_codes, vacancy_salary = self.years[rows].astype(np.intp) - first_year, salary[rows]
+        years, area_codes, salary = self.years[known], self.area_codes[known], salary[known]
+        year_codes = years.astype(np.intp) - first_year
+        VacancyTable.fill_accumulator(statistic.salary_year, year_keys, year_codes, salary)
+        VacancyTable.fill_accumulator(statistic.salary_vacancy_year, year_keys, vacancy_year_codes, vacancy_salary)
+        VacancyTable.fill_accumulator(statistic.salary_city, self.areas, area_codes, salary)
+        return statistic
+
+    def get_professions_statistic(self, matcher, salary):
+        """
+        Собирает статистику по годам сразу для всех профессий автомата matcher и статистику по городам.
+        Каждое уникальное название вакансии сопоставляется со всеми профессиями за один просмотр.
+        Вакансии, зарплату которых не удалось перевести в рубли (NaN), не учитываются.
+        :param matcher: Автомат поиска названий профессий (ProfessionMatcher)
+        :param salary: Средние зарплаты вакансий в рублях (numpy.ndarray)
+        :return:
+            ProfessionsStatistic: Статистика по профессиям
+        """
+        statistic = ProfessionsStatistic(matcher.vacancy_names)
+        known = ~np.isnan(salary)
+        if not known.any():
+            return statistic
+        first_year = int(self.years[known].min())
+        year_keys = list(range(first_year, int(self.years[known].max()) + 1))
+        year_codes = self.years.astype(np.intp) - first_year
+        VacancyTable.fill_accumulator(statistic.salary_year, year_keys, year_codes[known], salary[known])
+        VacancyTable.fill_accumulator(statistic.salary_city, self.areas, self.area_codes[known], salary[known])
+        name_matches = matcher.match_names(self.names)
+        for i, vacancy_name in enumerate(matcher.vacancy_names):
+            mask = name_matches[:, i][self.name_codes] & known
+            VacancyTable.fill_accumulator(statistic.salary_vacancy_year[vacancy_name], year_keys,
+                                          year_codes[mask], salary[mask])
+        return statistic